@@ -1,5 +1,12 @@
 from flask import render_template, session, redirect, url_for, request
-from models import get_account_by_id, get_transactions_by_account, get_cards_by_account
+from models import (
+    InvalidCursor,
+    get_account_by_id,
+    get_cards_by_account,
+    get_transactions_page_by_account,
+)
+
+PAGE_SIZE = 20
 
 
 def handle_account_detail():
@@ -21,12 +28,21 @@ def handle_account_detail():
     if not account:
         return redirect(url_for("dashboard"))
 
-    # Get transactions for this account
-    transactions = get_transactions_by_account(account_id, limit=20)
+    # Get one page of transactions for this account (older pages via ?cursor=)
+    try:
+        transactions, next_cursor = get_transactions_page_by_account(
+            account_id, PAGE_SIZE, request.args.get("cursor")
+        )
+    except InvalidCursor:
+        return redirect(url_for("account", id=account_id))
 
     # Get cards for this account
     cards = get_cards_by_account(account_id)
 
     return render_template(
-        "account_detail.html", account=account, transactions=transactions, cards=cards
+        "account_detail.html",
+        account=account,
+        transactions=transactions,
+        cards=cards,
+        next_cursor=next_cursor,
     )
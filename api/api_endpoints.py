@@ -1,5 +1,26 @@
-from flask import jsonify, session
-from models import get_accounts_by_user, get_all_transactions_by_user, get_account_by_id
+import csv
+import io
+import json
+
+from flask import Response, jsonify, request, session, stream_with_context
+from dao.transaction_dao import EXPORT_COLUMNS
+from models import (
+    InvalidCursor,
+    export_transactions_by_user,
+    get_accounts_by_user,
+    get_account_by_id,
+    get_transactions_page_by_user,
+)
+from money import json_money, to_major
+
+TRANSACTIONS_PAGE_SIZE = 50
+TRANSACTIONS_MAX_PAGE_SIZE = 200
+# Rows fetched from the database (and written to the client) per chunk.
+EXPORT_CHUNK_ROWS = 1000
+
+_AMOUNT = EXPORT_COLUMNS.index("amount")
+_CURRENCY = EXPORT_COLUMNS.index("currency")
+_CREATED_AT = EXPORT_COLUMNS.index("created_at")
 
 
 def handle_api_accounts():
@@ -10,18 +31,39 @@ def handle_api_accounts():
     user_id = session["user_id"]
     accounts = get_accounts_by_user(user_id)
 
-    return jsonify({"accounts": accounts})
+    return jsonify({"accounts": [json_money(a) for a in accounts]})
 
 
 def handle_api_transactions():
-    """API endpoint for transactions"""
+    """API endpoint for transactions, one keyset page at a time.
+
+    Pass the previous response's ``next_cursor`` as ``?cursor=`` for older
+    transactions; ``next_cursor`` is null on the last page.
+    """
     if "user_id" not in session:
         return jsonify({"error": "Not authenticated"}), 401
 
+    try:
+        limit = int(request.args.get("limit", TRANSACTIONS_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if not 1 <= limit <= TRANSACTIONS_MAX_PAGE_SIZE:
+        return jsonify({"error": "Invalid limit"}), 400
+
     user_id = session["user_id"]
-    transactions = get_all_transactions_by_user(user_id, limit=50)
+    try:
+        transactions, next_cursor = get_transactions_page_by_user(
+            user_id, limit, request.args.get("cursor")
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
 
-    return jsonify({"transactions": transactions})
+    return jsonify(
+        {
+            "transactions": [json_money(t) for t in transactions],
+            "next_cursor": next_cursor,
+        }
+    )
 
 
 def handle_api_account_detail(account_id):
@@ -34,4 +76,69 @@ def handle_api_account_detail(account_id):
     if not account:
         return jsonify({"error": "Account not found"}), 404
 
-    return jsonify({"account": account})
+    return jsonify({"account": json_money(account)})
+
+
+def _export_record(row) -> list:
+    record = list(row)
+    record[_AMOUNT] = to_major(row[_AMOUNT], row[_CURRENCY])
+    if not isinstance(row[_CREATED_AT], str):
+        record[_CREATED_AT] = row[_CREATED_AT].isoformat()
+    return record
+
+
+def _csv_chunks(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        writer.writerows(_export_record(row) for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(chunks):
+    for chunk in chunks:
+        lines = []
+        for row in chunk:
+            record = dict(zip(EXPORT_COLUMNS, _export_record(row)))
+            record["amount"] = float(record["amount"])
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        yield "".join(lines)
+
+
+_EXPORT_FORMATS = {
+    "csv": ("text/csv", _csv_chunks),
+    "ndjson": ("application/x-ndjson", _ndjson_chunks),
+}
+
+
+def handle_api_transactions_export():
+    """Stream the user's whole transaction history as CSV or NDJSON.
+
+    Rows go out in chunks as they are read, so memory stays flat for any
+    history length. Amounts are in major units, like the rest of the API.
+    """
+    if "user_id" not in session:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    export_format = request.args.get("format", "csv")
+    if export_format not in _EXPORT_FORMATS:
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    mimetype, encode = _EXPORT_FORMATS[export_format]
+    chunks = export_transactions_by_user(session["user_id"], EXPORT_CHUNK_ROWS)
+    # The request context (and its pinned backend) lives until the last chunk.
+    return Response(
+        stream_with_context(encode(chunks)),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=transactions.{export_format}"
+            ),
+            "Cache-Control": "no-store",
+        },
+    )
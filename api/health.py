@@ -0,0 +1,8 @@
+from flask import jsonify
+from split_config import split_status
+
+
+def handle_health():
+    """Liveness plus readiness detail: the app serves before flags are ready
+    (on default treatments), so this stays 200 while ``flags.ready`` is false."""
+    return jsonify({"status": "ok", "flags": split_status()})
@@ -1,7 +1,11 @@
 from flask import render_template, request, session
 from split_config import get_split_client
+from treatment_cache import get_treatment
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 def is_demo_mode(user_key=None, entry_path=None):
     """Check if demo mode is enabled (instant switching with iframes)
@@ -15,8 +19,9 @@ def is_demo_mode(user_key=None, entry_path=None):
     """
     # Priority 1: Check if entry path contains 'demo'
     if entry_path and "demo" in entry_path.lower():
-        print(
-            f"[Demo Mode] 🎯 Entry path contains 'demo' ({entry_path}) -> Demo mode FORCED ON"
+        logger.debug(
+            "demo_mode forced on by entry path",
+            extra={"entry_path": entry_path, "demo_mode": True, "source": "path"},
         )
         return True
 
@@ -31,47 +36,42 @@ def is_demo_mode(user_key=None, entry_path=None):
                     "url-entry": entry_path
                 }  # Match Split.io targeting rule attribute name
 
-            if attributes:
-                treatment = split_client.get_treatment(
-                    user_key, "demo_mode", attributes=attributes
-                )
-            else:
-                treatment = split_client.get_treatment(user_key, "demo_mode")
-            print(
-                f"[Demo Mode] Split.io flag 'demo_mode' = {treatment} (user: {user_key}, url-entry: {entry_path})"
-            )
+            treatment = get_treatment(split_client, user_key, "demo_mode", attributes)
 
             # Explicit treatments
             if treatment in ("on", "true", "1", "yes"):
-                print("[Demo Mode] ✅ Split.io flag = ON -> Demo mode ENABLED")
+                _log_demo_mode(True, "split", user_key, entry_path, treatment)
                 return True
             elif treatment in ("off", "false", "0", "no"):
-                print("[Demo Mode] ❌ Split.io flag = OFF -> Demo mode DISABLED")
+                _log_demo_mode(False, "split", user_key, entry_path, treatment)
                 return False
             # If treatment is 'control' or unknown, Split.io isn't configured or SDK not ready
             # Fall through to env var as safe default
-            elif treatment == "control":
-                print(
-                    "[Demo Mode] Split.io returned 'control' - flag may not be configured, using env var"
-                )
-            else:
-                print(
-                    f"[Demo Mode] Split.io returned unknown treatment '{treatment}' - using env var"
-                )
         except Exception as e:
-            print(f"[Demo Mode] Error getting Split.io treatment: {e} - using env var")
+            logger.warning("Error getting Split.io treatment for demo_mode: %s", e)
 
     # Priority 3: Fallback to environment variable
     # If entry_path contains 'demo', default to 'on', otherwise 'off' (safer for AI testing)
     default_mode = "on" if (entry_path and "demo" in entry_path.lower()) else "off"
     demo_mode = os.environ.get("DEMO_MODE", default_mode).lower()
     result = demo_mode in ("true", "1", "yes", "on")
-    print(
-        f"[Demo Mode] Using env var DEMO_MODE = {demo_mode} (default: '{default_mode}') -> {result}"
-    )
+    _log_demo_mode(result, "env", user_key, entry_path, demo_mode)
     return result
 
 
+def _log_demo_mode(enabled, source, user_key, entry_path, treatment):
+    logger.debug(
+        "demo_mode resolved",
+        extra={
+            "demo_mode": enabled,
+            "source": source,
+            "treatment": treatment,
+            "user_key": user_key,
+            "entry_path": entry_path,
+        },
+    )
+
+
 def handle_home():
     """Handle home page - renders wrapper or single variant based on demo mode"""
 
@@ -80,20 +80,21 @@ def handle_home():
     try:
         entry_path = session.get("entry_path", request.path)
     except Exception as e:
-        print(f"[Home] Warning: Could not access session: {e}, using request.path")
+        logger.warning("Could not access session (%s); using request.path", e)
         entry_path = request.path
+    attributes = {"url-entry": entry_path} if entry_path else None
+    split_client = get_split_client()
+    # Flags are evaluated only when the render needs them (home_page_variant
+    # not at all in demo mode); the per-request memo dedupes repeat lookups.
     demo_mode_enabled = is_demo_mode(user_key, entry_path)
-    print(f"[Home] DEMO_MODE check -> {demo_mode_enabled}")
 
     if demo_mode_enabled:
         # Demo mode: Pre-load all variants as iframes for instant switching
-        print("[Home] Rendering wrapper template (DEMO MODE ON)")
+        logger.debug("rendering wrapper", extra={"demo_mode": True})
         return render_template("home_wrapper.html", demo_mode=True)
     else:
         # Traditional mode: Server-side rendering of single variant
         # Better for AI testing tools that need isolated variants
-        print("[Home] Rendering single template (DEMO MODE OFF - no badge)")
-        split_client = get_split_client()
         template_by_treatment = {
             "old_home": "old_home.html",
             "dev_home": "home_v3.html",
@@ -101,18 +102,17 @@ def handle_home():
         template = "home.html"  # Default
 
         if split_client:
-            user_key = request.remote_addr or "anonymous"
-            treatment = split_client.get_treatment(user_key, "home_page_variant")
+            treatment = get_treatment(
+                split_client, user_key, "home_page_variant", attributes
+            )
 
             template = template_by_treatment.get(treatment, "home.html")
-
-            print(
-                f"[Home] Traditional mode - User {user_key} received treatment: {treatment} -> {template}"
-            )
         else:
-            print(
-                "[Home] Traditional mode - Split.io unavailable, using default template"
-            )
+            treatment = None  # Split.io unavailable: default template
+        logger.debug(
+            "rendering variant",
+            extra={"treatment": treatment, "template": template, "user_key": user_key},
+        )
 
         # Explicitly pass demo_mode=False to ensure badge doesn't show
         return render_template(template, demo_mode=False)
@@ -1,5 +1,9 @@
 from flask import request, jsonify
 from split_config import get_split_client
+from treatment_cache import get_treatment
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def handle_home_content():
@@ -16,7 +20,7 @@ def handle_home_content():
         user_key = request.remote_addr or "anonymous"
 
         # Get treatment for home_page_variant feature flag
-        treatment = split_client.get_treatment(user_key, "home_page_variant")
+        treatment = get_treatment(split_client, user_key, "home_page_variant")
 
         # Select template based on treatment
         if treatment == "old_home":
@@ -27,9 +31,12 @@ def handle_home_content():
             # Default treatment (control)
             template = "home.html"
 
-        print(f"[API] User {user_key} received treatment: {treatment} -> {template}")
+        logger.debug(
+            "home content variant",
+            extra={"treatment": treatment, "template": template, "user_key": user_key},
+        )
     else:
-        print("[API] Split.io client not available, using default template")
+        logger.debug("Split.io client not available, using default template")
 
     # Return JSON with template name and rendered content
     return jsonify(
@@ -1,13 +1,22 @@
-from flask import render_template, session, redirect, url_for
-from models import get_all_transactions_by_user
+from flask import render_template, session, redirect, url_for, request
+from models import InvalidCursor, get_transactions_page_by_user
+
+PAGE_SIZE = 100
 
 
 def handle_transactions():
-    """Handle transactions page"""
+    """Handle transactions page (keyset-paginated via ``?cursor=``)"""
     if "user_id" not in session:
         return redirect(url_for("login"))
 
     user_id = session["user_id"]
-    transactions = get_all_transactions_by_user(user_id, limit=100)
+    try:
+        transactions, next_cursor = get_transactions_page_by_user(
+            user_id, PAGE_SIZE, request.args.get("cursor")
+        )
+    except InvalidCursor:
+        return redirect(url_for("transactions"))
 
-    return render_template("transactions.html", transactions=transactions)
+    return render_template(
+        "transactions.html", transactions=transactions, next_cursor=next_cursor
+    )
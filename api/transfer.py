@@ -1,6 +1,13 @@
 from flask import render_template, session, redirect, url_for, request, jsonify
-from models import get_accounts_by_user, transfer_money
-import math
+from models import get_accounts_by_user, transfer_many, transfer_money
+from money import parse_major
+
+# Largest batch /api/transfers/batch accepts in one request (one transaction).
+TRANSFER_BATCH_MAX = 5000
+
+# Amounts are typed in major units of the source account's currency. They are
+# parsed as Decimals here and converted to minor units by the DAO, which reads
+# the currency with the account row it locks anyway.
 
 
 def handle_transfer():
@@ -38,22 +45,7 @@ def handle_transfer():
             )
 
         try:
-            amount_str = str(amount).strip().lower()
-            if amount_str in {
-                "nan",
-                "+nan",
-                "-nan",
-                "inf",
-                "+inf",
-                "-inf",
-                "infinity",
-                "+infinity",
-                "-infinity",
-            }:
-                raise ValueError()
-            amount = float(amount_str)
-            if amount <= 0 or not math.isfinite(amount):
-                raise ValueError()
+            amount = parse_major(amount)
         except ValueError:
             return render_template(
                 "transfer.html",
@@ -111,22 +103,7 @@ def handle_api_transfer():
         return jsonify({"success": False, "message": "Missing required fields"}), 400
 
     try:
-        amount_str = str(amount).strip().lower()
-        if amount_str in {
-            "nan",
-            "+nan",
-            "-nan",
-            "inf",
-            "+inf",
-            "-inf",
-            "infinity",
-            "+infinity",
-            "-infinity",
-        }:
-            raise ValueError()
-        amount = float(amount_str)
-        if amount <= 0 or not math.isfinite(amount):
-            raise ValueError()
+        amount = parse_major(amount)
     except ValueError:
         return jsonify({"success": False, "message": "Invalid amount"}), 400
 
@@ -143,3 +120,73 @@ def handle_api_transfer():
     else:
         status = 403 if message == "Forbidden" else 400
         return jsonify({"success": False, "message": message}), status
+
+
+def handle_api_transfer_batch():
+    """Handle batch transfer API endpoint (all items in one transaction)"""
+    if "user_id" not in session:
+        return jsonify({"success": False, "message": "Not authenticated"}), 401
+
+    data = request.get_json(silent=True) or {}
+    items = data.get("transfers")
+    if not isinstance(items, list) or not items:
+        return jsonify({"success": False, "message": "transfers must be a list"}), 400
+    if len(items) > TRANSFER_BATCH_MAX:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"At most {TRANSFER_BATCH_MAX} transfers per batch",
+                }
+            ),
+            400,
+        )
+
+    # Shape errors are answered here; the rest go to the DB as one batch.
+    results: list[tuple[bool, str] | None] = [None] * len(items)
+    batch, positions = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = (False, "Missing required fields")
+            continue
+        from_account_id = item.get("from_account_id")
+        to_account_id = item.get("to_account_id")
+        amount = item.get("amount")
+        if not from_account_id or not to_account_id or not amount:
+            results[index] = (False, "Missing required fields")
+            continue
+        try:
+            from_account_id, to_account_id = int(from_account_id), int(to_account_id)
+        except (TypeError, ValueError):
+            results[index] = (False, "Account not found")
+            continue
+        try:
+            amount = parse_major(amount)
+        except ValueError:
+            results[index] = (False, "Invalid amount")
+            continue
+        batch.append(
+            {
+                "from_account_id": from_account_id,
+                "to_account_id": to_account_id,
+                "amount": amount,
+                "description": item.get("description", "Transfer"),
+            }
+        )
+        positions.append(index)
+
+    for index, result in zip(positions, transfer_many(batch, session["user_id"])):
+        results[index] = result
+
+    succeeded = sum(1 for ok, _ in results if ok)
+    return jsonify(
+        {
+            "success": succeeded == len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": [
+                {"index": index, "success": ok, "message": message}
+                for index, (ok, message) in enumerate(results)
+            ],
+        }
+    )
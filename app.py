@@ -1,50 +1,63 @@
+import startup_profile  # first: its import time is the boot clock's zero
 from dotenv import load_dotenv
 
 # MUST run before any module that reads os.environ at import time
 # (e.g. split_config.py captures SPLIT_API_KEY at module load).
 load_dotenv()
+startup_profile.mark("dotenv")
+
+from log_config import configure_logging, format_logging_metrics  # noqa: E402
+
+# Before the other imports so their import-time logging is queued too.
+configure_logging()
 
 from flask import Flask, request, session, Response, g  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
 
 from prometheus_minimal import Counter, Histogram, format_metrics  # noqa: E402
+from db_pool import format_pool_metrics  # noqa: E402
+from db_retry import format_retry_metrics  # noqa: E402
+from group_commit import close_all_writers, format_writer_metrics  # noqa: E402
+from treatment_cache import format_treatment_cache_metrics  # noqa: E402
+from money import format_minor  # noqa: E402
+from dao.rows import Row  # noqa: E402
 import os  # noqa: E402
 import time as t  # noqa: E402
 import atexit  # noqa: E402
 
-from api.hello import handle_hello  # noqa: E402
+from api.health import handle_health  # noqa: E402
 from api.home import handle_home  # noqa: E402
 from api.home_content import handle_home_content  # noqa: E402
-from api.home_static import (  # noqa: E402
-    handle_old_home_static,
-    handle_new_home_static,
-    handle_v3_home_static,
-)
-from api.time import handle_time  # noqa: E402
-from api.about import handle_about  # noqa: E402
 from api.pricing import handle_pricing  # noqa: E402
-from api.pricing_static import (  # noqa: E402
-    handle_old_pricing_static,
-    handle_new_pricing_static,
-    handle_v3_pricing_static,
-)
 from api.four_o_four import handle_404  # noqa: E402
 from api.login import handle_login, handle_logout  # noqa: E402
 from api.dashboard import handle_dashboard  # noqa: E402
 from api.accounts import handle_account_detail  # noqa: E402
 from api.profile import handle_profile  # noqa: E402
-from api.transfer import handle_transfer, handle_api_transfer  # noqa: E402
+from api.transfer import (  # noqa: E402
+    handle_transfer,
+    handle_api_transfer,
+    handle_api_transfer_batch,
+)
 from api.transactions import handle_transactions  # noqa: E402
 from api.api_endpoints import (  # noqa: E402
     handle_api_accounts,
     handle_api_transactions,
+    handle_api_transactions_export,
     handle_api_account_detail,
 )
-from api.llms_txt import handle_llms_txt  # noqa: E402
-from api.robots_txt import handle_robots_txt  # noqa: E402
-from api.llms_full_txt import handle_llms_full_txt  # noqa: E402
-from api.sitemap_xml import handle_sitemap_xml  # noqa: E402
 from models import init_db  # noqa: E402
-from split_config import init_split, destroy_split  # noqa: E402
+from commands import init_app as init_commands  # noqa: E402
+from dao.unit_of_work import init_app as init_unit_of_work  # noqa: E402
+from split_config import (  # noqa: E402
+    init_split,
+    destroy_split,
+    format_split_metrics,
+)
+
+# Rarely hit routes (static variants, llms/robots/sitemap, hello/time/about)
+# import their handler on first request instead of at boot; see the views.
+startup_profile.mark("imports")
 
 app = Flask(__name__)
 app.secret_key = os.environ.get(
@@ -52,15 +65,37 @@ app.secret_key = os.environ.get(
 )
 
 
+class _RowJSONProvider(DefaultJSONProvider):
+    """Serializes ``dao.rows`` models only when a response needs JSON."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Row):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+
+app.json = _RowJSONProvider(app)
+
+
 @app.template_filter("currency")
-def currency_filter(value):
-    """Format number as currency with commas and 2 decimal places"""
-    return "{:,.2f}".format(float(value))
+def currency_filter(value, currency=None):
+    """Format integer minor units (cents) as currency with commas and the
+    currency's decimal places"""
+    return format_minor(value, currency)
 
 
-init_db()
+init_unit_of_work(app)
+init_commands(app)
+startup_profile.mark("app_setup")
+# Flags first: init_db() resolves postgres_database, and a backend chosen
+# while Split is still starting is re-checked (and initialized) once it is.
 init_split()
+startup_profile.mark("flag_init")
+init_db()
+startup_profile.mark("db_init")
 atexit.register(destroy_split)
+atexit.register(close_all_writers)
 
 
 REQUEST_COUNT = Counter(
@@ -98,28 +133,48 @@ def _record_request_metrics(response):
 @app.route("/metrics")
 def metrics():
     return Response(
-        format_metrics(),
+        format_metrics()
+        + format_pool_metrics()
+        + format_writer_metrics()
+        + format_retry_metrics()
+        + format_treatment_cache_metrics()
+        + format_split_metrics()
+        + startup_profile.format_startup_metrics()
+        + format_logging_metrics(),
         mimetype="text/plain; version=0.0.4; charset=utf-8",
     )
 
 
+@app.route("/health")
+def health():
+    return handle_health()
+
+
 @app.route("/llms.txt")
 def llms_txt():
+    from api.llms_txt import handle_llms_txt
+
     return handle_llms_txt()
 
 
 @app.route("/robots.txt")
 def robots_txt():
+    from api.robots_txt import handle_robots_txt
+
     return handle_robots_txt()
 
 
 @app.route("/llms-full.txt")
 def llms_full_txt():
+    from api.llms_full_txt import handle_llms_full_txt
+
     return handle_llms_full_txt()
 
 
 @app.route("/sitemap.xml")
 def sitemap_xml():
+    from api.sitemap_xml import handle_sitemap_xml
+
     return handle_sitemap_xml()
 
 
@@ -149,31 +204,43 @@ def home_content():
 
 @app.route("/old-home-static")
 def old_home_static():
+    from api.home_static import handle_old_home_static
+
     return handle_old_home_static()
 
 
 @app.route("/new-home-static")
 def new_home_static():
+    from api.home_static import handle_new_home_static
+
     return handle_new_home_static()
 
 
 @app.route("/v3-home-static")
 def v3_home_static():
+    from api.home_static import handle_v3_home_static
+
     return handle_v3_home_static()
 
 
 @app.route("/hello")
 def hello():
+    from api.hello import handle_hello
+
     return handle_hello()
 
 
 @app.route("/time")
 def time():
+    from api.time import handle_time
+
     return handle_time()
 
 
 @app.route("/about")
 def about():
+    from api.about import handle_about
+
     return handle_about()
 
 
@@ -184,16 +251,22 @@ def pricing():
 
 @app.route("/old-pricing-static")
 def old_pricing_static():
+    from api.pricing_static import handle_old_pricing_static
+
     return handle_old_pricing_static()
 
 
 @app.route("/new-pricing-static")
 def new_pricing_static():
+    from api.pricing_static import handle_new_pricing_static
+
     return handle_new_pricing_static()
 
 
 @app.route("/v3-pricing-static")
 def v3_pricing_static():
+    from api.pricing_static import handle_v3_pricing_static
+
     return handle_v3_pricing_static()
 
 
@@ -249,6 +322,11 @@ def api_transactions():
     return handle_api_transactions()
 
 
+@app.route("/api/transactions/export")
+def api_transactions_export():
+    return handle_api_transactions_export()
+
+
 @app.route("/api/account/<int:account_id>")
 def api_account_detail(account_id):
     return handle_api_account_detail(account_id)
@@ -259,9 +337,15 @@ def api_transfer():
     return handle_api_transfer()
 
 
-if __name__ == "__main__":  # pragma: no cover
-    import logging
+@app.route("/api/transfers/batch", methods=["POST"])
+def api_transfer_batch():
+    return handle_api_transfer_batch()
 
-    logging.basicConfig(level=logging.INFO)
+
+startup_profile.mark("routes")
+startup_profile.finish(app)
+
+
+if __name__ == "__main__":  # pragma: no cover
     debug_mode = os.environ.get("FLASK_DEBUG", "").lower() in {"1", "true", "yes", "on"}
     app.run(host="127.0.0.1", port=5001, debug=debug_mode)
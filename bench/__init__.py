@@ -0,0 +1 @@
+"""Performance tooling: DAO micro-benchmarks and load harnesses (not shipped)."""
@@ -0,0 +1,361 @@
+"""DAO micro-benchmarks: ops/sec and latency percentiles per DAO method.
+
+    python -m bench.dao_bench run --sizes 1000,100000 --output after.json
+    python -m bench.dao_bench compare before.json after.json
+
+Every size is a SQLite database seeded by the ``generate-data`` generator
+with that many transactions (users and accounts scale along). ``--db-dir``
+keeps the seeded files so later runs skip the load. When ``DATABASE_URL`` is
+set the same cases also run on Postgres; synthetic rows are *added* to that
+database until it holds each size, so point it at a scratch database.
+
+Cases call the DAOs directly and through their ``models`` wrappers, outside
+any request, so each call pays for its own pooled checkout just like a
+background job would. Results are JSON so two runs (say, before and after a
+query or row-conversion change) can be compared; ``compare`` exits 1 when a
+case got slower than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+
+from bench.stats import summarize
+
+DEFAULT_SIZES = "1000,100000"
+DEFAULT_SEED = 42
+PAGE = 50
+
+
+class Fixture(NamedTuple):
+    """Ids the cases run against: the busiest account and its owner."""
+
+    user_id: int
+    username: str
+    account_id: int
+    peer_account_id: int
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _use_backend(postgres: bool, sqlite_path: str | None = None) -> None:
+    import models
+
+    os.environ["POSTGRES_DATABASE"] = "on" if postgres else "off"
+    if sqlite_path:
+        os.environ["QUANTUM_BANK_DATABASE"] = sqlite_path
+    models.refresh_backend()
+    models.refresh_rewards_schema_state()
+
+
+def _transaction_count() -> int:
+    import models
+
+    conn = models.get_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS n FROM transactions")
+        return models._scalar_from_row(cursor.fetchone())
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def _seed(size: int, seed: int) -> None:
+    """Grow the active database to ``size`` transactions."""
+    import models
+
+    models.init_db()
+    missing = size - _transaction_count()
+    if missing <= 0:
+        return
+    users = max(10, missing // 100)
+    models.load_synthetic_data(
+        seed=seed + size,
+        users=users,
+        accounts=users * 5 // 2,
+        transactions=missing,
+        rewards=missing // 10,
+    )
+
+
+def _fixture() -> Fixture:
+    import models
+
+    conn = models.get_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT a.id AS account_id, a.user_id, u.username
+            FROM transactions t
+            JOIN accounts a ON a.id = t.account_id
+            JOIN users u ON u.id = a.user_id
+            WHERE a.account_type <> 'credit'
+            GROUP BY a.id, a.user_id, u.username
+            ORDER BY COUNT(*) DESC, a.id
+            LIMIT 1
+            """
+        )
+        busiest = models._row_to_dict(cursor.fetchone())
+        cursor.execute(
+            models._sql(
+                "SELECT id FROM accounts WHERE id <> ? AND account_type <> 'credit'"
+                " ORDER BY id LIMIT 1"
+            ),
+            (busiest["account_id"],),
+        )
+        peer = models._row_to_dict(cursor.fetchone())
+    finally:
+        conn.rollback()
+        conn.close()
+    return Fixture(
+        busiest["user_id"], busiest["username"], busiest["account_id"], peer["id"]
+    )
+
+
+def build_cases(fx: Fixture) -> list[tuple[str, Callable[[], object]]]:
+    """(name, zero-argument call) for every benchmarked DAO method and wrapper."""
+    import models
+    from dao.account_dao import AccountDAO
+    from dao.dashboard_dao import DashboardDAO
+    from dao.transaction_dao import TransactionDAO
+    from dao.user_dao import UserDAO
+
+    first_page, cursor = models.get_transactions_page_by_user(fx.user_id, PAGE)
+    before = models.decode_cursor(cursor) if cursor else None
+    direction = [fx.account_id, fx.peer_account_id]
+
+    def transfer():
+        # Alternate direction so balances (and the funds check) stay put.
+        direction.reverse()
+        return models.transfer_money(direction[0], direction[1], 100, "bench")
+
+    batch = [
+        {
+            "from_account_id": fx.account_id if n % 2 else fx.peer_account_id,
+            "to_account_id": fx.peer_account_id if n % 2 else fx.account_id,
+            "amount": 100,
+            "description": "bench",
+        }
+        for n in range(10)
+    ]
+
+    return [
+        ("UserDAO.get_by_username", lambda: UserDAO().get_by_username(fx.username)),
+        ("AccountDAO.get_by_user", lambda: AccountDAO().get_by_user(fx.user_id)),
+        ("AccountDAO.get_by_id", lambda: AccountDAO().get_by_id(fx.account_id)),
+        (
+            "AccountDAO.get_cards_by_account",
+            lambda: AccountDAO().get_cards_by_account(fx.account_id),
+        ),
+        (
+            f"TransactionDAO.get_by_account[{PAGE}]",
+            lambda: TransactionDAO().get_by_account(fx.account_id, PAGE),
+        ),
+        (
+            f"TransactionDAO.get_by_user[{PAGE}]",
+            lambda: TransactionDAO().get_by_user(fx.user_id, PAGE),
+        ),
+        (
+            f"TransactionDAO.get_by_user[{PAGE},before]",
+            lambda: TransactionDAO().get_by_user(fx.user_id, PAGE, before=before),
+        ),
+        (
+            "TransactionDAO.get_rewards_for_user",
+            lambda: TransactionDAO().get_rewards_for_user(fx.user_id),
+        ),
+        ("DashboardDAO.load", lambda: DashboardDAO().load(fx.user_id)),
+        ("models.get_dashboard", lambda: models.get_dashboard(fx.user_id)),
+        (
+            f"models.get_transactions_page_by_user[{PAGE}]",
+            lambda: models.get_transactions_page_by_user(fx.user_id, PAGE),
+        ),
+        ("models.transfer_money", transfer),
+        ("models.transfer_many[10]", lambda: models.transfer_many(batch)),
+        (
+            "models.create_transaction",
+            lambda: models.create_transaction(
+                fx.account_id, "deposit", 1, "bench", "bench"
+            ),
+        ),
+    ]
+
+
+def measure(call: Callable[[], object], *, warmup: int, iterations: int, max_seconds):
+    """Run ``call`` ``warmup`` times unmeasured, then time up to ``iterations``
+    calls (stopping early after ``max_seconds``)."""
+    for _ in range(warmup):
+        call()
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    deadline = started + max_seconds
+    for _ in range(iterations):
+        t0 = clock()
+        call()
+        t1 = clock()
+        latencies.append(t1 - t0)
+        if t1 >= deadline:
+            break
+    return summarize(latencies, clock() - started)
+
+
+def run_suite(
+    sizes: list[int],
+    *,
+    seed: int = DEFAULT_SEED,
+    warmup: int = 20,
+    iterations: int = 500,
+    max_seconds: float = 5.0,
+    db_dir: str | None = None,
+    postgres: bool | None = None,
+    only: str | None = None,
+    echo: Callable[[str], None] = print,
+) -> dict:
+    """Benchmark every case at every size; returns the JSON-ready report."""
+    if postgres is None:
+        postgres = bool(os.environ.get("DATABASE_URL"))
+    os.environ.setdefault("DEMO_ROLLOUT_SCHEMA", "on")
+    os.environ.setdefault("DEMO_ROLLOUT_FEATURE", "on")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="qb-bench-") as scratch:
+        targets = [("sqlite", size) for size in sizes]
+        if postgres:
+            targets += [("postgres", size) for size in sorted(sizes)]
+        for backend, size in targets:
+            path = os.path.join(db_dir or scratch, f"bench-{size}-{seed}.sqlite")
+            _use_backend(backend == "postgres", path)
+            started = time.perf_counter()
+            _seed(size, seed)
+            echo(f"[{backend} {size}] seeded in {time.perf_counter() - started:.1f}s")
+            for name, call in build_cases(_fixture()):
+                if only and only not in name:
+                    continue
+                stats = measure(
+                    call,
+                    warmup=warmup,
+                    iterations=iterations,
+                    max_seconds=max_seconds,
+                )
+                results.append(
+                    {"backend": backend, "size": size, "case": name, **stats}
+                )
+                echo(
+                    f"  {name:<48} {stats['ops_per_sec']:>10,.0f} ops/s"
+                    f"  p50 {stats['p50_ms']:.3f}ms  p99 {stats['p99_ms']:.3f}ms"
+                )
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "sizes": sizes,
+            "warmup": warmup,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(before: dict, after: dict, threshold: float = 0.2) -> list[dict]:
+    """Per-case change from ``before`` to ``after``; ``regressed`` marks cases
+    whose p50 latency rose, or ops/sec fell, by more than ``threshold``."""
+    index = {(r["backend"], r["size"], r["case"]): r for r in before["results"]}
+    rows = []
+    for new in after["results"]:
+        old = index.get((new["backend"], new["size"], new["case"]))
+        if old is None:
+            continue
+        ops = new["ops_per_sec"] / old["ops_per_sec"] - 1 if old["ops_per_sec"] else 0.0
+        p50 = new["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        rows.append(
+            {
+                "backend": new["backend"],
+                "size": new["size"],
+                "case": new["case"],
+                "ops_per_sec_change": round(ops, 4),
+                "p50_change": round(p50, 4),
+                "regressed": p50 > threshold or ops < -threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.dao_bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--sizes", default=DEFAULT_SIZES, help="transaction counts")
+    run.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run.add_argument("--warmup", type=int, default=20)
+    run.add_argument("--iterations", type=int, default=500)
+    run.add_argument("--max-seconds", type=float, default=5.0, help="per case")
+    run.add_argument("--db-dir", help="keep seeded SQLite files here for reuse")
+    run.add_argument("--only", help="run cases whose name contains this text")
+    run.add_argument("--no-postgres", action="store_true")
+    run.add_argument("--output", "-o", help="JSON results file")
+
+    cmp_ = sub.add_parser("compare", help="diff two result files")
+    cmp_.add_argument("before")
+    cmp_.add_argument("after")
+    cmp_.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run_suite(
+            [int(s) for s in args.sizes.split(",") if s.strip()],
+            seed=args.seed,
+            warmup=args.warmup,
+            iterations=args.iterations,
+            max_seconds=args.max_seconds,
+            db_dir=args.db_dir,
+            postgres=False if args.no_postgres else None,
+            only=args.only,
+        )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+            print(f"wrote {args.output}")
+        return 0
+
+    with open(args.before, encoding="utf-8") as handle:
+        before = json.load(handle)
+    with open(args.after, encoding="utf-8") as handle:
+        after = json.load(handle)
+    rows = compare(before, after, args.threshold)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['backend']:<8} {row['size']:>9} {row['case']:<48}"
+            f" ops/s {row['ops_per_sec_change']:+7.1%}"
+            f"  p50 {row['p50_change']:+7.1%}  {flag}"
+        )
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Latency summaries shared by the benchmark and load tools."""
+
+from __future__ import annotations
+
+import math
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_s: list[float], elapsed_s: float) -> dict[str, float]:
+    """ops, ops/sec and latency percentiles in milliseconds."""
+    ordered = sorted(latencies_s)
+    ops = len(ordered)
+    return {
+        "ops": ops,
+        "ops_per_sec": round(ops / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+        "mean_ms": round(1000 * sum(ordered) / ops, 4) if ops else 0.0,
+        "p50_ms": round(1000 * percentile(ordered, 50), 4),
+        "p95_ms": round(1000 * percentile(ordered, 95), 4),
+        "p99_ms": round(1000 * percentile(ordered, 99), 4),
+        "max_ms": round(1000 * ordered[-1], 4) if ops else 0.0,
+    }
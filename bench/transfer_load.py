@@ -0,0 +1,359 @@
+"""Concurrent load harness for /api/transfer and the read APIs.
+
+    python -m bench.transfer_load --concurrency 32 --duration 30
+    python -m bench.transfer_load --url http://127.0.0.1:5001 --usernames demo
+
+Without ``--url`` the Flask app runs in this process (one test client per
+worker thread) against each of ``--backends``: a scratch SQLite file and,
+when ``DATABASE_URL`` is set, Postgres. With ``--url`` the same traffic goes
+over HTTP to a running server, which is the realistic number for a gunicorn
+deployment; the in-process numbers share one GIL with the client threads.
+
+Every worker logs in as one of ``--usernames`` and loops over a weighted
+``--mix`` of operations until ``--duration`` runs out. Transfers move
+``--amount`` back and forth between two of the user's own non-credit
+accounts, so each user's total balance must be unchanged at the end; that
+money-conservation check fails the run (exit 1) if it does not hold.
+Lock retries are read from the app's /metrics counters before and after.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from bench.stats import summarize
+
+DEFAULT_MIX = "transfer=60,accounts=15,transactions=15,account=10"
+RETRY_METRICS = (
+    "db_transaction_retries_total",
+    "db_transaction_retries_exhausted_total",
+)
+
+
+class InProcessClient:
+    """One Flask test client (one session cookie) per worker."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, *, json_body=None, form=None):
+        response = self._client.open(path, method=method, json=json_body, data=form)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    """Same interface over HTTP with its own cookie jar."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self._base = base_url.rstrip("/")
+        self._timeout = timeout
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, *, json_body=None, form=None):
+        headers, data = {}, None
+        if json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            data = urllib.parse.urlencode(form).encode()
+        req = urllib.request.Request(
+            self._base + path, data=data, headers=headers, method=method
+        )
+        try:
+            with self._opener.open(req, timeout=self._timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """``"transfer=60,accounts=40"`` -> weights; names must be known operations."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"unknown operation {name!r} (known: {', '.join(OPERATIONS)})"
+            )
+        mix[name] = float(weight or 1)
+    if not any(w > 0 for w in mix.values()):
+        raise ValueError("mix needs at least one positive weight")
+    return mix
+
+
+class Worker:
+    """Logged-in client plus the two accounts it transfers between."""
+
+    def __init__(self, client, username: str, amount: str):
+        self.client = client
+        self.username = username
+        self.amount = amount
+        client.request("POST", "/login", form={"username": username})
+        accounts = self.accounts()
+        own = [a for a in accounts if a["account_type"] != "credit"]
+        if len(own) < 2:
+            raise SystemExit(f"{username} needs two non-credit accounts to transfer")
+        self.account_ids = [own[0]["id"], own[1]["id"]]
+
+    def accounts(self) -> list[dict]:
+        status, body = self.client.request("GET", "/api/accounts")
+        if status != 200:
+            raise SystemExit(f"cannot log in as {self.username} (HTTP {status})")
+        return json.loads(body)["accounts"]
+
+
+def _transfer(worker: Worker) -> str:
+    worker.account_ids.reverse()
+    status, body = worker.client.request(
+        "POST",
+        "/api/transfer",
+        json_body={
+            "from_account_id": worker.account_ids[0],
+            "to_account_id": worker.account_ids[1],
+            "amount": worker.amount,
+            "description": "load test",
+        },
+    )
+    if status == 200:
+        return "ok"
+    try:
+        message = json.loads(body).get("message")
+    except ValueError:
+        message = None
+    # "Transfer failed" is the wrapper's answer to a database error.
+    if status >= 500 or message == "Transfer failed":
+        return "error"
+    return "rejected"
+
+
+def _read(path_for):
+    def op(worker: Worker) -> str:
+        status, _ = worker.client.request("GET", path_for(worker))
+        return "ok" if status == 200 else "error"
+
+    return op
+
+
+OPERATIONS = {
+    "transfer": _transfer,
+    "accounts": _read(lambda w: "/api/accounts"),
+    "transactions": _read(lambda w: "/api/transactions?limit=20"),
+    "account": _read(lambda w: f"/api/account/{w.account_ids[0]}"),
+    "dashboard": _read(lambda w: "/dashboard"),
+}
+
+
+def _drive(worker: Worker, mix: dict, deadline: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    tally = {n: {"latencies": [], "ok": 0, "rejected": 0, "errors": 0} for n in names}
+    clock = time.perf_counter
+    while clock() < deadline:
+        name = rng.choices(names, weights)[0]
+        t0 = clock()
+        try:
+            outcome = OPERATIONS[name](worker)
+        except Exception:
+            outcome = "error"
+        tally[name]["latencies"].append(clock() - t0)
+        tally[name]["errors" if outcome == "error" else outcome] += 1
+    return tally
+
+
+def _total_balance(workers: list[Worker]) -> Decimal:
+    """Sum of every participating user's balances, one user at a time."""
+    seen, total = set(), Decimal(0)
+    for worker in workers:
+        if worker.username in seen:
+            continue
+        seen.add(worker.username)
+        total += sum(Decimal(str(a["balance"])) for a in worker.accounts())
+    return total
+
+
+def _retry_count(client) -> int:
+    status, body = client.request("GET", "/metrics")
+    if status != 200:
+        return 0
+    count = 0
+    for line in body.decode().splitlines():
+        if line.startswith(RETRY_METRICS):
+            count += int(float(line.rsplit(" ", 1)[1]))
+    return count
+
+
+def run_load(
+    make_client,
+    *,
+    backend: str,
+    usernames: list[str],
+    concurrency: int,
+    duration: float,
+    mix: dict[str, float],
+    amount: str = "1.00",
+    seed: int = 0,
+) -> dict:
+    """Drive ``concurrency`` workers for ``duration`` seconds; returns the report."""
+    workers = [
+        Worker(make_client(), usernames[n % len(usernames)], amount)
+        for n in range(concurrency)
+    ]
+    before = _total_balance(workers)
+    retries_before = _retry_count(workers[0].client)
+
+    tallies: list[dict] = [{} for _ in workers]
+    started = time.perf_counter()
+    deadline = started + duration
+
+    def run(n: int) -> None:
+        tallies[n] = _drive(workers[n], mix, deadline, seed + n)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    retries = _retry_count(workers[0].client) - retries_before
+    after = _total_balance(workers)
+
+    ops = {}
+    for name in mix:
+        latencies = [s for t in tallies for s in t[name]["latencies"]]
+        counts = {
+            k: sum(t[name][k] for t in tallies) for k in ("ok", "rejected", "errors")
+        }
+        ops[name] = {**summarize(latencies, elapsed), **counts}
+    total = sum(o["ops"] for o in ops.values())
+    errors = sum(o["errors"] for o in ops.values())
+    transfers = ops.get("transfer", {}).get("ops", 0)
+    return {
+        "backend": backend,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput": round(total / elapsed, 1) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "lock_retries": retries,
+        "lock_retry_rate": round(retries / transfers, 4) if transfers else 0.0,
+        "conservation": {
+            "before": str(before),
+            "after": str(after),
+            "ok": before == after,
+        },
+        "ops": ops,
+    }
+
+
+def _in_process_app(backend: str, sqlite_path: str):
+    """Point the app's data layer at ``backend`` and return the Flask app."""
+    os.environ["POSTGRES_DATABASE"] = "on" if backend == "postgres" else "off"
+    os.environ["QUANTUM_BANK_DATABASE"] = sqlite_path
+    os.environ.setdefault("DEMO_ROLLOUT_SCHEMA", "on")
+    os.environ.setdefault("DEMO_ROLLOUT_FEATURE", "on")
+    import models
+    from app import app
+
+    models.refresh_backend()
+    models.refresh_rewards_schema_state()
+    models.init_db()
+    return app
+
+
+def print_report(report: dict) -> None:
+    c = report["conservation"]
+    print(
+        f"[{report['backend']}] {report['concurrency']} workers,"
+        f" {report['duration_s']}s: {report['throughput']:,.1f} req/s,"
+        f" errors {report['error_rate']:.2%},"
+        f" lock retries {report['lock_retries']} ({report['lock_retry_rate']:.2%}"
+        f" of transfers), conservation {'ok' if c['ok'] else 'VIOLATED'}"
+        f" ({c['before']} -> {c['after']})"
+    )
+    for name, o in report["ops"].items():
+        print(
+            f"  {name:<13} {o['ops']:>7} ops {o['ops_per_sec']:>9,.1f}/s"
+            f"  p50 {o['p50_ms']:>8.2f}ms  p95 {o['p95_ms']:>8.2f}ms"
+            f"  p99 {o['p99_ms']:>8.2f}ms  ok {o['ok']} rejected {o['rejected']}"
+            f" errors {o['errors']}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.transfer_load")
+    parser.add_argument("--url", help="drive a running server instead of in-process")
+    parser.add_argument(
+        "--backends",
+        help="in-process backends to compare (default: sqlite, plus postgres"
+        " when DATABASE_URL is set)",
+    )
+    parser.add_argument("--database", help="SQLite file (default: a scratch file)")
+    parser.add_argument("--usernames", default="demo", help="comma-separated logins")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,...")
+    parser.add_argument("--amount", default="1.00", help="per transfer, major units")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    common = dict(
+        usernames=[u.strip() for u in args.usernames.split(",") if u.strip()],
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=mix,
+        amount=args.amount,
+        seed=args.seed,
+    )
+    reports = []
+    if args.url:
+        reports.append(
+            run_load(lambda: HttpClient(args.url), backend=args.url, **common)
+        )
+    else:
+        backends = (args.backends or "").split(",") if args.backends else ["sqlite"]
+        if not args.backends and os.environ.get("DATABASE_URL"):
+            backends.append("postgres")
+        with tempfile.TemporaryDirectory(prefix="qb-load-") as scratch:
+            path = args.database or os.path.join(scratch, "load.sqlite")
+            for backend in backends:
+                app = _in_process_app(backend.strip(), path)
+                reports.append(
+                    run_load(lambda: InProcessClient(app), backend=backend, **common)
+                )
+    for report in reports:
+        print_report(report)
+
+    if args.output:
+        meta = {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "args": vars(args),
+        }
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"meta": meta, "results": reports}, handle, indent=2)
+        print(f"wrote {args.output}")
+    return 0 if all(r["conservation"]["ok"] for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Flask CLI commands (``flask --app app <command>``)."""
+
+import click
+from flask.cli import with_appcontext
+
+
+@click.command("rewards-balance")
+@click.option(
+    "--rebuild",
+    is_flag=True,
+    help="Recompute every rewards_balance row from rewards_ledger first.",
+)
+@with_appcontext
+def rewards_balance_command(rebuild):
+    """Verify (and optionally rebuild) the maintained rewards totals."""
+    from models import rebuild_rewards_balances, verify_rewards_balances
+
+    if rebuild:
+        rows = rebuild_rewards_balances()
+        click.echo(f"Rebuilt rewards_balance: {rows} user(s).")
+
+    drift = verify_rewards_balances()
+    if not drift:
+        click.echo("rewards_balance matches rewards_ledger.")
+        return
+    for row in drift:
+        click.echo(
+            f"user {row['user_id']}: ledger={row['ledger_points']} "
+            f"balance={row['balance_points']}",
+            err=True,
+        )
+    raise click.exceptions.Exit(1)
+
+
+@click.command("generate-data")
+@click.option("--users", default=1_000, show_default=True, help="Users to create.")
+@click.option(
+    "--accounts",
+    default=2_500,
+    show_default=True,
+    help="Accounts to create (at least one per user).",
+)
+@click.option(
+    "--transactions", default=100_000, show_default=True, help="Transaction rows."
+)
+@click.option(
+    "--rewards",
+    default=10_000,
+    show_default=True,
+    help="rewards_ledger rows (skipped when the ledger table is absent).",
+)
+@click.option("--seed", default=42, show_default=True, help="Random seed.")
+@click.option(
+    "--chunk-size",
+    default=10_000,
+    show_default=True,
+    help="Rows generated and written per batch.",
+)
+@with_appcontext
+def generate_data_command(users, accounts, transactions, rewards, seed, chunk_size):
+    """Bulk load deterministic synthetic users, accounts and history."""
+    from models import load_synthetic_data
+
+    def report(table, rows, seconds):
+        rate = rows / seconds if seconds > 0 else float(rows)
+        click.echo(f"{table}: {rows} rows in {seconds:.1f}s ({rate:,.0f} rows/s)")
+
+    written = load_synthetic_data(
+        seed=seed,
+        users=users,
+        accounts=accounts,
+        transactions=transactions,
+        rewards=rewards,
+        chunk_size=chunk_size,
+        progress=report,
+    )
+    if rewards and not written["rewards_ledger"]:
+        click.echo("rewards_ledger not present; rewards rows skipped.", err=True)
+
+
+def init_app(app) -> None:
+    """Register the CLI commands on ``app``."""
+    app.cli.add_command(rewards_balance_command)
+    app.cli.add_command(generate_data_command)
@@ -1,52 +1,43 @@
 """Account data access object."""
 
 from dao.base_dao import BaseDAO
+from dao.rows import Account, Card, fetch_all, fetch_one
+from dao.statements import declare, execute
+
+declare(
+    "accounts.by_user",
+    "SELECT * FROM accounts WHERE user_id = ? ORDER BY created_at",
+)
+declare("accounts.by_id", "SELECT * FROM accounts WHERE id = ?")
+declare("cards.by_account", "SELECT * FROM cards WHERE account_id = ?")
 
 
 class AccountDAO(BaseDAO):
     """Account query operations (read-only)."""
 
-    def get_by_user(self, user_id: int) -> list[dict]:
+    def get_by_user(self, user_id: int) -> list[Account]:
         """Get all accounts for a user."""
-        from models import _sql, _row_to_dict, _normalize_row
-
-        self.get_connection()
+        self.get_connection(positional=True)
         try:
-            self.cursor.execute(
-                _sql("SELECT * FROM accounts WHERE user_id = ? ORDER BY created_at"),
-                (user_id,),
-            )
-            accounts = self.cursor.fetchall()
-            return [_normalize_row(_row_to_dict(account)) for account in accounts]
+            execute(self.cursor, "accounts.by_user", (user_id,))
+            return fetch_all(self.cursor, Account)
         finally:
             self.close()
 
-    def get_by_id(self, account_id: int) -> dict | None:
+    def get_by_id(self, account_id: int) -> Account | None:
         """Get account by ID."""
-        from models import _sql, _row_to_dict, _normalize_row
-
-        self.get_connection()
+        self.get_connection(positional=True)
         try:
-            self.cursor.execute(
-                _sql("SELECT * FROM accounts WHERE id = ?"),
-                (account_id,),
-            )
-            account = self.cursor.fetchone()
-            return _normalize_row(_row_to_dict(account))
+            execute(self.cursor, "accounts.by_id", (account_id,))
+            return fetch_one(self.cursor, Account)
         finally:
             self.close()
 
-    def get_cards_by_account(self, account_id: int) -> list[dict]:
+    def get_cards_by_account(self, account_id: int) -> list[Card]:
         """Get cards for an account."""
-        from models import _sql, _row_to_dict, _normalize_row
-
-        self.get_connection()
+        self.get_connection(positional=True)
         try:
-            self.cursor.execute(
-                _sql("SELECT * FROM cards WHERE account_id = ?"),
-                (account_id,),
-            )
-            cards = self.cursor.fetchall()
-            return [_normalize_row(_row_to_dict(card)) for card in cards]
+            execute(self.cursor, "cards.by_account", (account_id,))
+            return fetch_all(self.cursor, Card)
         finally:
             self.close()
@@ -1,5 +1,7 @@
 """Base Data Access Object with connection management."""
 
+from dao.rows import positional_cursor
+from dao.unit_of_work import current_unit_of_work
 from models import get_db as models_get_db
 
 
@@ -9,16 +11,41 @@ class BaseDAO:
     def __init__(self):
         self.conn = None
         self.cursor = None
+        self._shared = False
 
-    def get_connection(self):
-        """Acquire database connection and cursor."""
-        self.conn = models_get_db()
-        self.cursor = self.conn.cursor()
+    def get_connection(self, positional: bool = False):
+        """Acquire database connection and cursor.
+
+        Inside a request this is the request's unit-of-work connection, which
+        outlives the DAO; otherwise a connection of its own. ``positional``
+        asks for a cursor yielding plain tuples, for ``dao.rows`` models.
+        """
+        uow = current_unit_of_work()
+        if uow is not None:
+            self.conn = uow.connection()
+            self._shared = True
+        else:
+            self.conn = models_get_db()
+            self._shared = False
+        self.cursor = (
+            positional_cursor(self.conn) if positional else self.conn.cursor()
+        )
         return self.cursor
 
+    def rollback(self):
+        """Discard a failed read so later queries on this connection still work."""
+        if self._shared:
+            current_unit_of_work().end_snapshot()
+        elif self.conn:
+            self.conn.rollback()
+
     def close(self):
         """Close connection (safe to call multiple times)."""
-        if self.conn:
+        if self.cursor is not None:
+            self.cursor.close()
+        if self.conn and not self._shared:
+            # Pooled connections are checked back in, not torn down.
             self.conn.close()
-            self.conn = None
-            self.cursor = None
+        self.conn = None
+        self.cursor = None
+        self._shared = False
@@ -0,0 +1,177 @@
+"""Dashboard data access object (one read for the whole page)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import NamedTuple
+
+import dao.account_dao  # noqa: F401  (registers accounts.by_user)
+from dao.base_dao import BaseDAO
+from dao.rows import Account, UserTransaction, fetch_all, positional_cursor
+from dao.statements import declare, execute
+from dao.transaction_dao import REWARDS_STATE_BANNERS
+
+declare(
+    "dashboard.totals",
+    """
+    SELECT
+        COALESCE(SUM(CASE WHEN account_type <> 'credit' THEN balance END), 0)
+            AS total_balance
+    FROM accounts
+    WHERE user_id = ?
+    """,
+)
+
+# Postgres builds the whole page in one statement: accounts and recent activity
+# come back as JSON arrays next to the balance totals (and the rewards total,
+# when the ledger is live), so the dashboard costs a single round trip.
+_PG_DASHBOARD = """
+    WITH acct AS (
+        SELECT * FROM accounts WHERE user_id = %(user_id)s
+    ), recent AS (
+        SELECT t.*, acct.currency, acct.account_type, acct.account_number
+        FROM transactions t
+        JOIN acct ON t.account_id = acct.id
+        ORDER BY t.created_at DESC, t.id DESC
+        LIMIT %(limit)s
+    )
+    SELECT
+        COALESCE(
+            (SELECT json_agg(acct ORDER BY acct.created_at) FROM acct), '[]'::json
+        ) AS accounts,
+        COALESCE(
+            (SELECT json_agg(recent ORDER BY recent.created_at DESC, recent.id DESC)
+             FROM recent),
+            '[]'::json
+        ) AS recent_transactions,
+        (SELECT COALESCE(SUM(balance), 0) FROM acct WHERE account_type <> 'credit')
+            AS total_balance
+"""
+_PG_DASHBOARD_REWARDS = """,
+        COALESCE(
+            (SELECT points FROM rewards_balance WHERE user_id = %(user_id)s), 0
+        ) AS rewards_points
+"""
+
+
+def _from_json(row: dict) -> dict:
+    # json_agg renders timestamptz as ISO-8601 text; psycopg2 (and so every
+    # other Postgres read) returns a datetime.
+    created_at = row.get("created_at")
+    if isinstance(created_at, str):
+        row["created_at"] = datetime.fromisoformat(created_at)
+    return row
+
+
+class DashboardView(NamedTuple):
+    """Everything dashboard.html renders besides the user's name."""
+
+    accounts: list[Account]
+    recent_transactions: list[UserTransaction]
+    total_balance: int
+    rewards_points: int | None
+    rewards_banner_kind: str | None
+
+
+class DashboardDAO(BaseDAO):
+    """Loads the dashboard view model in one snapshot."""
+
+    def load(self, user_id: int, limit: int = 5) -> DashboardView:
+        """Accounts, the last ``limit`` transactions, balance totals and rewards.
+
+        One statement on Postgres; one read transaction on SQLite. Rows come
+        back with the same types as the per-widget wrappers on each backend.
+        """
+        from db_flags import is_demo_rollout_feature_enabled
+        from models import _resolve_rewards_schema_state, using_postgres
+
+        self.get_connection()
+        try:
+            banner = None
+            with_rewards = False
+            if is_demo_rollout_feature_enabled():
+                state = _resolve_rewards_schema_state(self.cursor)
+                banner = REWARDS_STATE_BANNERS.get(state)
+                with_rewards = banner is None
+            if using_postgres():
+                return self._load_postgres(user_id, limit, with_rewards, banner)
+            return self._load_sqlite(user_id, limit, with_rewards, banner)
+        finally:
+            self.close()
+
+    def _rewards_read_failed(self, exc) -> tuple[None, str]:
+        from models import _set_rewards_schema_cache, logger
+
+        logger.warning("rewards.rollout.read_failed reason=%s", exc.__class__.__name__)
+        # An aborted PG transaction would poison later reads that share the
+        # request's connection.
+        self.rollback()
+        # The cached "ready" may be what just failed; re-probe next time.
+        _set_rewards_schema_cache(None)
+        return None, "rollback_runtime_error"
+
+    def _load_postgres(self, user_id, limit, with_rewards, banner) -> DashboardView:
+        from models import _row_to_dict
+
+        params = {"user_id": user_id, "limit": limit}
+        points = None
+        row = None
+        if with_rewards:
+            try:
+                # Trusted in-repo SQL; user input is bound through `params`.
+                # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
+                self.cursor.execute(_PG_DASHBOARD + _PG_DASHBOARD_REWARDS, params)
+                row = _row_to_dict(self.cursor.fetchone())
+                points = int(row["rewards_points"])
+            except Exception as exc:
+                points, banner = self._rewards_read_failed(exc)
+                row = None
+        if row is None:
+            # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
+            self.cursor.execute(_PG_DASHBOARD, params)
+            row = _row_to_dict(self.cursor.fetchone())
+        return DashboardView(
+            accounts=[Account(**_from_json(a)) for a in row["accounts"]],
+            recent_transactions=[
+                UserTransaction(**_from_json(t)) for t in row["recent_transactions"]
+            ],
+            total_balance=int(row["total_balance"]),
+            rewards_points=points,
+            rewards_banner_kind=banner,
+        )
+
+    def _load_sqlite(self, user_id, limit, with_rewards, banner) -> DashboardView:
+        from models import _row_to_dict
+
+        # A request's unit of work already holds a snapshot; otherwise open one
+        # so the reads below agree with each other.
+        own_snapshot = not self._shared
+        if own_snapshot:
+            self.cursor.execute("BEGIN")
+        rows = positional_cursor(self.conn)
+        try:
+            execute(rows, "accounts.by_user", (user_id,))
+            accounts = fetch_all(rows, Account)
+            execute(rows, "transactions.by_user", (user_id, limit))
+            recent = fetch_all(rows, UserTransaction)
+            execute(self.cursor, "dashboard.totals", (user_id,))
+            totals = _row_to_dict(self.cursor.fetchone())
+            points = None
+            if with_rewards:
+                try:
+                    execute(self.cursor, "rewards.points_total", (user_id,))
+                    row = _row_to_dict(self.cursor.fetchone())
+                    points = int(row["points_total"]) if row else 0
+                except Exception as exc:
+                    points, banner = self._rewards_read_failed(exc)
+        finally:
+            rows.close()
+            if own_snapshot:
+                self.conn.rollback()
+        return DashboardView(
+            accounts=accounts,
+            recent_transactions=recent,
+            total_balance=int(totals["total_balance"]),
+            rewards_points=points,
+            rewards_banner_kind=banner,
+        )
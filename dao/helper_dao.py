@@ -1,11 +1,31 @@
 """Helper DAO for rewards schema state machine and validation."""
 
 import logging
-from models import using_postgres
+
+from dao.statements import declare, execute
 
 logger = logging.getLogger(__name__)
 
 REWARDS_LEDGER_TABLE = "rewards_ledger"
+REWARDS_BALANCE_TABLE = "rewards_balance"
+
+declare(
+    "catalog.table_exists",
+    """
+    SELECT 1
+    FROM sqlite_master
+    WHERE type = 'table'
+      AND name = ?
+    LIMIT 1
+    """,
+    postgres="""
+    SELECT EXISTS (
+        SELECT 1 FROM information_schema.tables
+        WHERE table_schema = 'public'
+          AND table_name = %s
+    ) AS exists
+    """,
+)
 
 
 class HelperDAO:
@@ -14,30 +34,15 @@ class HelperDAO:
     @staticmethod
     def rewards_ledger_table_exists(cursor) -> bool:
         """Check if rewards_ledger table exists."""
-        from models import _row_to_dict
+        return HelperDAO.table_exists(cursor, REWARDS_LEDGER_TABLE)
+
+    @staticmethod
+    def table_exists(cursor, table: str) -> bool:
+        """Check if ``table`` exists in the active backend's catalog."""
+        from models import _row_to_dict, using_postgres
 
+        execute(cursor, "catalog.table_exists", (table,))
         if using_postgres():
-            cursor.execute(
-                """
-                SELECT EXISTS (
-                    SELECT 1 FROM information_schema.tables
-                    WHERE table_schema = 'public'
-                      AND table_name = %s
-                ) AS exists
-            """,
-                (REWARDS_LEDGER_TABLE,),
-            )
             row = _row_to_dict(cursor.fetchone())
             return bool(row.get("exists")) if row else False
-        else:
-            cursor.execute(
-                """
-                SELECT 1
-                FROM sqlite_master
-                WHERE type = 'table'
-                  AND name = ?
-                LIMIT 1
-            """,
-                (REWARDS_LEDGER_TABLE,),
-            )
-            return cursor.fetchone() is not None
+        return cursor.fetchone() is not None
@@ -0,0 +1,321 @@
+"""Migration Data Access Object (versioned schema changes).
+
+Schema lives in numbered files — ``migrations/NNN_name.sql`` for Postgres and
+``migrations/sqlite/NNN_name.sql`` for SQLite — and each version is applied
+once and recorded in ``schema_migrations``. A boot with nothing pending costs
+one ``CREATE TABLE IF NOT EXISTS`` and one SELECT; no other DDL runs.
+
+Directives go in the file's leading comment lines:
+
+* ``-- migrate: no-transaction`` runs the statements outside a transaction
+  (autocommit), which Postgres requires for ``CREATE INDEX CONCURRENTLY``: the
+  index builds without blocking writes to a live table. Such files must be
+  idempotent (``IF NOT EXISTS``) because the version is recorded only after
+  every statement has succeeded. A failed concurrent build leaves an INVALID
+  index that ``IF NOT EXISTS`` would skip, so on Postgres the runner drops
+  invalid indexes the file creates before running it, and refuses to record
+  the version if one is still invalid afterwards.
+* ``-- migrate: if-table-exists <table>`` records the version without running
+  anything when ``<table>`` is absent, for tables created outside the
+  versioned set (the flag-gated rewards ledger).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+from typing import NamedTuple
+
+from dao.base_dao import BaseDAO
+from dao.statements import declare, execute
+
+logger = logging.getLogger(__name__)
+
+_DIRECTIVE_PREFIX = "-- migrate:"
+_MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+_CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)",
+    re.IGNORECASE,
+)
+# Session-level lock so concurrent workers booting against one Postgres
+# apply each pending version exactly once ("QBMI" in ASCII).
+_PG_MIGRATION_LOCK = 0x5142_4D49
+
+declare(
+    "migrations.create_table",
+    """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version     INTEGER PRIMARY KEY,
+        name        TEXT NOT NULL,
+        checksum    TEXT NOT NULL,
+        applied_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    postgres="""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version     INTEGER PRIMARY KEY,
+        name        TEXT NOT NULL,
+        checksum    TEXT NOT NULL,
+        applied_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+)
+declare(
+    "migrations.applied",
+    "SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version",
+)
+declare(
+    "migrations.record",
+    "INSERT INTO schema_migrations (version, name, checksum) VALUES (?, ?, ?)",
+)
+
+
+class Migration(NamedTuple):
+    """One versioned migration file."""
+
+    version: int
+    name: str
+    checksum: str
+    statements: list[str]
+    transactional: bool
+    requires_table: str | None = None
+
+    @property
+    def concurrent_indexes(self) -> list[str]:
+        """Names of the indexes this file builds with CREATE INDEX CONCURRENTLY."""
+        return [
+            match.group(1)
+            for sql in self.statements
+            for match in _CONCURRENT_INDEX.finditer(sql)
+        ]
+
+
+def _directives(sql: str) -> list[str]:
+    """``-- migrate:`` directives from the file's leading comment lines."""
+    found = []
+    for line in sql.lstrip().splitlines():
+        line = line.strip()
+        if not line.startswith("--"):
+            break
+        if line.lower().startswith(_DIRECTIVE_PREFIX):
+            found.append(line[len(_DIRECTIVE_PREFIX) :].strip())
+    return found
+
+
+def migrations_dir(postgres: bool) -> str:
+    """Directory holding the migration files for the given backend."""
+    from models import MIGRATIONS_DIR
+
+    return MIGRATIONS_DIR if postgres else os.path.join(MIGRATIONS_DIR, "sqlite")
+
+
+def load_migrations(directory: str) -> list[Migration]:
+    """Parse ``NNN_name.sql`` files in ``directory``, ordered by version."""
+    from models import _split_sql_statements
+
+    migrations: dict[int, Migration] = {}
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise RuntimeError(f"duplicate migration version {version}: {filename}")
+        with open(os.path.join(directory, filename), encoding="utf-8") as handle:
+            sql = handle.read()
+        transactional, requires_table = True, None
+        for directive in _directives(sql):
+            name, _, arg = directive.partition(" ")
+            if name.lower() == "no-transaction":
+                transactional = False
+            elif name.lower() == "if-table-exists" and arg.strip():
+                requires_table = arg.strip()
+        migrations[version] = Migration(
+            version=version,
+            name=match.group(2),
+            checksum=hashlib.sha256(sql.encode("utf-8")).hexdigest(),
+            statements=_split_sql_statements(sql),
+            transactional=transactional,
+            requires_table=requires_table,
+        )
+    return [migrations[version] for version in sorted(migrations)]
+
+
+class MigrationDAO(BaseDAO):
+    """Apply pending migrations and report which versions are recorded."""
+
+    def _applied(self, cursor) -> dict[int, dict]:
+        from models import _row_to_dict
+
+        execute(cursor, "migrations.applied")
+        return {
+            row["version"]: row for row in (_row_to_dict(r) for r in cursor.fetchall())
+        }
+
+    def _pending(self, cursor, migrations: list[Migration]) -> list[Migration]:
+        applied = self._applied(cursor)
+        pending = []
+        for migration in migrations:
+            recorded = applied.get(migration.version)
+            if recorded is None:
+                pending.append(migration)
+            elif recorded["checksum"] != migration.checksum:
+                # Applied files are immutable; ship a new version instead.
+                logger.warning(
+                    "Migration %03d_%s changed after it was applied; not re-running",
+                    migration.version,
+                    migration.name,
+                )
+        return pending
+
+    def migrate(self, conn, directory: str | None = None) -> list[int]:
+        """Apply pending migrations on ``conn``; returns the versions applied."""
+        from models import using_postgres
+
+        postgres = using_postgres()
+        migrations = load_migrations(directory or migrations_dir(postgres))
+        cursor = conn.cursor()
+        execute(cursor, "migrations.create_table")
+        pending = self._pending(cursor, migrations)
+        conn.commit()
+        if not pending:
+            return []
+
+        if postgres:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (_PG_MIGRATION_LOCK,))
+        try:
+            applied = []
+            for migration in migrations:
+                if migration not in pending:
+                    continue
+                if self._apply(conn, cursor, migration, postgres):
+                    applied.append(migration.version)
+            return applied
+        finally:
+            if postgres:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (_PG_MIGRATION_LOCK,))
+                conn.commit()
+
+    def _apply(self, conn, cursor, migration: Migration, postgres: bool) -> bool:
+        from dao.helper_dao import HelperDAO
+        from models import _begin_write
+
+        run = True
+        if migration.requires_table is not None:
+            run = HelperDAO.table_exists(cursor, migration.requires_table)
+            conn.commit()
+            if not run:
+                logger.info(
+                    "Migration %03d_%s: no %s table, nothing to do",
+                    migration.version,
+                    migration.name,
+                    migration.requires_table,
+                )
+
+        if run and not migration.transactional:
+            self._run_outside_transaction(conn, cursor, migration, postgres)
+
+        try:
+            _begin_write(conn)
+            # Another worker may have won the lock first; re-check under it.
+            if migration.version in self._applied(cursor):
+                conn.rollback()
+                return False
+            if run and migration.transactional:
+                self._run(cursor, migration)
+            execute(
+                cursor,
+                "migrations.record",
+                (migration.version, migration.name, migration.checksum),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info("Applied migration %03d_%s", migration.version, migration.name)
+        return True
+
+    def _run_outside_transaction(self, conn, cursor, migration, postgres) -> None:
+        conn.commit()
+        if not postgres:
+            # SQLite only opens transactions around DML, so DDL autocommits.
+            self._run(cursor, migration)
+            return
+        conn.autocommit = True
+        try:
+            indexes = migration.concurrent_indexes
+            for name in self._invalid_indexes(cursor, indexes):
+                # Left by an earlier failed CONCURRENTLY build; IF NOT EXISTS
+                # would skip it and the version would be recorded.
+                logger.warning("Dropping invalid index %s before rebuilding it", name)
+                # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
+                # The name matched \w+ in a trusted in-repo migration file.
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            self._run(cursor, migration)
+            invalid = self._invalid_indexes(cursor, indexes)
+            if invalid:
+                raise RuntimeError(
+                    f"migration {migration.version:03d}_{migration.name} left"
+                    f" invalid indexes: {', '.join(invalid)}"
+                )
+        finally:
+            conn.autocommit = False
+
+    @staticmethod
+    def _invalid_indexes(cursor, names: list[str]) -> list[str]:
+        """Which of ``names`` exist on Postgres with ``pg_index.indisvalid`` false."""
+        from models import _row_to_dict
+
+        if not names:
+            return []
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE NOT i.indisvalid
+              AND c.relname = ANY(%s)
+              AND pg_table_is_visible(c.oid)
+            ORDER BY c.relname
+            """,
+            (list(names),),
+        )
+        return [_row_to_dict(row)["relname"] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _run(cursor, migration: Migration) -> None:
+        for statement in migration.statements:
+            # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
+            # Trusted local migration SQL only (versioned file in repo), not user input.
+            cursor.execute(statement)
+
+    def status(self, directory: str | None = None) -> list[dict]:
+        """Every known migration with whether (and when) it was applied."""
+        from models import using_postgres
+
+        migrations = load_migrations(directory or migrations_dir(using_postgres()))
+        try:
+            cursor = self.get_connection()
+            try:
+                applied = self._applied(cursor)
+            except Exception:
+                # No schema_migrations table yet: nothing has been applied.
+                self.rollback()
+                applied = {}
+        finally:
+            self.close()
+        return [
+            {
+                "version": m.version,
+                "name": m.name,
+                "applied": m.version in applied,
+                "applied_at": applied.get(m.version, {}).get("applied_at"),
+                "checksum_matches": applied.get(m.version, {}).get(
+                    "checksum", m.checksum
+                )
+                == m.checksum,
+            }
+            for m in migrations
+        ]
@@ -0,0 +1,90 @@
+"""Rewards balance data access object (maintained per-user point totals)."""
+
+from dao.base_dao import BaseDAO
+from dao.statements import declare, execute
+
+# rewards_balance holds one row per user, kept equal to SUM(rewards_ledger.points)
+# by the transfer write path, so reads are a primary-key lookup.
+declare(
+    "rewards.balance_add",
+    """
+    INSERT INTO rewards_balance (user_id, points)
+    VALUES (?, ?)
+    ON CONFLICT (user_id) DO UPDATE
+    SET points = rewards_balance.points + excluded.points,
+        updated_at = CURRENT_TIMESTAMP
+    """,
+)
+declare("rewards.balance_clear", "DELETE FROM rewards_balance")
+declare(
+    "rewards.balance_rebuild",
+    """
+    INSERT INTO rewards_balance (user_id, points)
+    SELECT user_id, SUM(points)
+    FROM rewards_ledger
+    GROUP BY user_id
+    """,
+)
+declare(
+    "rewards.balance_drift",
+    """
+    SELECT l.user_id, l.points AS ledger_points,
+           COALESCE(b.points, 0) AS balance_points
+    FROM (
+        SELECT user_id, SUM(points) AS points
+        FROM rewards_ledger
+        GROUP BY user_id
+    ) l
+    LEFT JOIN rewards_balance b ON b.user_id = l.user_id
+    WHERE b.points IS NULL OR b.points <> l.points
+    UNION ALL
+    SELECT b.user_id, 0 AS ledger_points, b.points AS balance_points
+    FROM rewards_balance b
+    WHERE b.points <> 0
+      AND NOT EXISTS (SELECT 1 FROM rewards_ledger l WHERE l.user_id = b.user_id)
+    ORDER BY user_id
+    """,
+)
+
+
+class RewardsDAO(BaseDAO):
+    """Upkeep for rewards_balance: incremental adds, rebuild, and drift checks."""
+
+    @staticmethod
+    def add_points(cursor, user_id: int, points: int) -> None:
+        """Add ``points`` to the user's summary row (caller owns the transaction)."""
+        execute(cursor, "rewards.balance_add", (user_id, points))
+
+    @staticmethod
+    def rebuild_balances(cursor) -> int:
+        """Recompute every summary row from the ledger; returns rows written."""
+        execute(cursor, "rewards.balance_clear")
+        execute(cursor, "rewards.balance_rebuild")
+        return max(cursor.rowcount, 0)
+
+    def rebuild(self) -> int:
+        """Rebuild rewards_balance from rewards_ledger in one write transaction."""
+        from models import _begin_write, get_db
+
+        conn = get_db()
+        try:
+            _begin_write(conn)
+            rows = self.rebuild_balances(conn.cursor())
+            conn.commit()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def verify(self) -> list[dict]:
+        """Users whose summary row disagrees with their ledger (empty when in sync)."""
+        from models import _row_to_dict
+
+        self.get_connection()
+        try:
+            execute(self.cursor, "rewards.balance_drift")
+            return [_row_to_dict(row) for row in self.cursor.fetchall()]
+        finally:
+            self.close()
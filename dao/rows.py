@@ -0,0 +1,207 @@
+"""Typed, slotted row models built straight from cursor rows.
+
+List endpoints used to turn every row into a dict and then copy it again to
+normalize types. These models hold one slot per column instead, and are built
+from positional rows by :func:`fetch_all` / :func:`fetch_one`; a DAO opens a
+:func:`positional_cursor` so the driver hands back plain tuples rather than a
+``sqlite3.Row`` or ``RealDictRow`` per row.
+
+Models read like the dicts they replace (``row["balance"]``, ``row.get()``,
+``dict(row)``), and templates use attribute access. Flask serializes them via
+:meth:`Row.to_dict`, only when a response actually needs JSON.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator
+
+
+class Row:
+    """Base row model: one ``__slots__`` entry per column, readable as a mapping."""
+
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+    _field_set: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ())
+        )
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, *values, **columns):
+        for name, value in zip(self._fields, values):
+            setattr(self, name, value)
+        for name in self._fields[len(values) :]:
+            setattr(self, name, columns.get(name))
+
+    # Mapping protocol, so call sites written against dict rows keep working.
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._field_set:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._field_set:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._field_set else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._field_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def keys(self):
+        return self._fields
+
+    def values(self) -> list:
+        return [getattr(self, name) for name in self._fields]
+
+    def items(self) -> list[tuple[str, Any]]:
+        return [(name, getattr(self, name)) for name in self._fields]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Row):
+            return type(other) is type(self) and other.values() == self.values()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None  # mutable, like the dicts it replaces
+
+    def __repr__(self) -> str:
+        inner = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({inner})"
+
+
+Mapping.register(Row)
+
+
+class User(Row):
+    __slots__ = ("id", "username", "email", "full_name", "created_at")
+
+
+class Account(Row):
+    __slots__ = (
+        "id",
+        "user_id",
+        "account_type",
+        "account_number",
+        "balance",
+        "currency",
+        "status",
+        "created_at",
+    )
+
+
+class Transaction(Row):
+    __slots__ = (
+        "id",
+        "account_id",
+        "transaction_type",
+        "amount",
+        "description",
+        "recipient",
+        "status",
+        "created_at",
+        "currency",  # the account's, joined in: amounts are in its minor unit
+    )
+
+
+class UserTransaction(Transaction):
+    """A transaction joined with its account (history across all accounts)."""
+
+    __slots__ = ("account_type", "account_number")
+
+
+class Card(Row):
+    __slots__ = (
+        "id",
+        "account_id",
+        "card_type",
+        "card_last4",
+        "expiry_date",
+        "status",
+        "created_at",
+    )
+
+
+def positional_cursor(conn):
+    """Cursor on ``conn`` whose rows are plain tuples, for :func:`fetch_all`."""
+    from models import using_postgres
+
+    if using_postgres():
+        import psycopg2.extensions
+
+        return conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+_builders: dict[tuple[type, tuple[str, ...]], Callable[[Any], Row]] = {}
+
+
+def row_factory(model: type[Row], cursor) -> Callable[[Any], Row]:
+    """Builder turning one row of ``cursor``'s current result into ``model``.
+
+    Positional rows are mapped by column name once per result shape (``SELECT
+    *`` column order differs between backends after migrations); mapping rows
+    such as ``RealDictRow`` are read by key.
+    """
+    names = tuple(column[0] for column in cursor.description)
+    builder = _builders.get((model, names))
+    if builder is not None:
+        return builder
+
+    if names == model._fields:
+
+        def builder(row):
+            if isinstance(row, Mapping):
+                return model(*[row[name] for name in names])
+            return model(*row)
+
+    else:
+        positions = [
+            names.index(name) if name in names else None for name in model._fields
+        ]
+
+        def builder(row):
+            if isinstance(row, Mapping):
+                return model(*[row.get(name) for name in model._fields])
+            return model(*[None if i is None else row[i] for i in positions])
+
+    _builders[(model, names)] = builder
+    return builder
+
+
+def fetch_all(cursor, model: type[Row]) -> list:
+    """All remaining rows of ``cursor`` as ``model`` instances."""
+    rows = cursor.fetchall()
+    if not rows:
+        return []
+    build = row_factory(model, cursor)
+    return [build(row) for row in rows]
+
+
+def fetch_one(cursor, model: type[Row]):
+    """Next row of ``cursor`` as a ``model`` instance, or None."""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row_factory(model, cursor)(row)
@@ -1,6 +1,30 @@
 """Schema Data Access Object (initialization and seeding)."""
 
 from dao.base_dao import BaseDAO
+from dao.migration_dao import MigrationDAO
+from dao.statements import declare, execute, insert_returning_id
+
+declare("users.count", "SELECT COUNT(*) FROM users")
+declare(
+    "users.insert",
+    "INSERT INTO users (username, email, full_name) VALUES (?, ?, ?)",
+    returning_id=True,
+)
+declare(
+    "accounts.insert",
+    """
+    INSERT INTO accounts (user_id, account_type, account_number, balance)
+    VALUES (?, ?, ?, ?)
+    """,
+    returning_id=True,
+)
+declare(
+    "cards.insert",
+    """
+    INSERT INTO cards (account_id, card_type, card_last4, expiry_date)
+    VALUES (?, ?, ?, ?)
+    """,
+)
 
 
 class SchemaDAO(BaseDAO):
@@ -9,14 +33,17 @@ class SchemaDAO(BaseDAO):
     def ensure_rewards_ledger_schema(
         self, conn, cursor=None, *, commit: bool = True
     ) -> str:
-        """Ensure the rewards ledger table exists (idempotent).
+        """Ensure the rewards ledger and its rewards_balance summary exist (idempotent).
 
         Returns a small status string for UX/demo messaging.
         """
+        from dao.helper_dao import REWARDS_BALANCE_TABLE, HelperDAO
+        from dao.rewards_dao import RewardsDAO
         from models import (
             is_demo_rollout_schema_enabled,
             is_demo_force_rollout_migration_fail,
             _rewards_ledger_table_exists,
+            _set_rewards_schema_cache,
             using_postgres,
         )
 
@@ -27,7 +54,10 @@ class SchemaDAO(BaseDAO):
             raise RuntimeError("intentional demo migration failure")
 
         cursor = cursor or conn.cursor()
-        if _rewards_ledger_table_exists(cursor):
+        if _rewards_ledger_table_exists(cursor) and HelperDAO.table_exists(
+            cursor, REWARDS_BALANCE_TABLE
+        ):
+            _set_rewards_schema_cache(True)
             return "exists"
 
         if using_postgres():
@@ -45,6 +75,13 @@ class SchemaDAO(BaseDAO):
                 CREATE INDEX IF NOT EXISTS idx_rewards_ledger_user_id
                 ON rewards_ledger(user_id);
                 """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rewards_balance (
+                    user_id     INTEGER PRIMARY KEY REFERENCES users(id),
+                    points      BIGINT NOT NULL DEFAULT 0,
+                    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                );
+                """)
         else:
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS rewards_ledger (
@@ -56,20 +93,36 @@ class SchemaDAO(BaseDAO):
                     created_at         TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
                 )
                 """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rewards_ledger_user_id
+                ON rewards_ledger(user_id)
+                """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rewards_balance (
+                    user_id     INTEGER PRIMARY KEY,
+                    points      INTEGER NOT NULL DEFAULT 0,
+                    updated_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+
+        # A ledger recreated next to a surviving summary table (or a summary
+        # added to an existing ledger) starts from the ledger's truth.
+        RewardsDAO.rebuild_balances(cursor)
 
         if commit:
             conn.commit()
+            _set_rewards_schema_cache(True)
+        else:
+            # Uncommitted DDL may still roll back; let the next read probe.
+            _set_rewards_schema_cache(None)
         return "applied"
 
     def init(self):
         """Initialize the database with tables and sample data."""
         from models import (
             get_db,
-            _apply_postgres_schema,
-            _create_sqlite_schema,
-            using_postgres,
-            _sql,
             _scalar_from_row,
+            _set_rewards_schema_cache,
             logger,
         )
 
@@ -78,11 +131,8 @@ class SchemaDAO(BaseDAO):
         conn = get_db()
         cursor = conn.cursor()
 
-        if using_postgres():
-            _apply_postgres_schema(conn)
-        else:
-            _create_sqlite_schema(cursor)
-            conn.commit()
+        # Versioned: only migrations not yet in schema_migrations run.
+        MigrationDAO().migrate(conn)
 
         try:
             schema_status = self.ensure_rewards_ledger_schema(conn, cursor, commit=True)
@@ -97,9 +147,11 @@ class SchemaDAO(BaseDAO):
                 global_state["rewards_schema_state"] = "forced_fail"
             else:
                 global_state["rewards_schema_state"] = "runtime_error"
+                _set_rewards_schema_cache(None)
                 logger.warning("Rewards schema setup failed at startup: %s", exc)
         except Exception as exc:
             global_state["rewards_schema_state"] = "runtime_error"
+            _set_rewards_schema_cache(None)
             logger.warning("Rewards schema setup failed at startup: %s", exc)
 
         logger.info(
@@ -111,60 +163,40 @@ class SchemaDAO(BaseDAO):
 
         models._rewards_schema_state = global_state["rewards_schema_state"]
 
-        cursor.execute(_sql("SELECT COUNT(*) FROM users"))
+        execute(cursor, "users.count")
         if _scalar_from_row(cursor.fetchone()) == 0:
             self.seed(conn)
 
         conn.close()
 
     def seed(self, conn):
-        """Create sample users and accounts for demo purposes."""
-        from models import _insert_returning_id, _sql
-
+        """Create sample users and accounts for demo purposes (balances in cents)."""
         cursor = conn.cursor()
 
-        user_id = _insert_returning_id(
+        user_id = insert_returning_id(
             cursor,
-            """
-            INSERT INTO users (username, email, full_name)
-            VALUES (?, ?, ?)
-            """,
+            "users.insert",
             ("demo", "jpicard@starfleet.fed", "Jean-Luc Picard"),
         )
 
-        checking_id = _insert_returning_id(
+        checking_id = insert_returning_id(
             cursor,
-            """
-            INSERT INTO accounts (user_id, account_type, account_number, balance)
-            VALUES (?, ?, ?, ?)
-            """,
-            (user_id, "checking", "QB-CHK-100001", 5420.50),
+            "accounts.insert",
+            (user_id, "checking", "QB-CHK-100001", 542050),
         )
 
-        _insert_returning_id(
+        insert_returning_id(
             cursor,
-            """
-            INSERT INTO accounts (user_id, account_type, account_number, balance)
-            VALUES (?, ?, ?, ?)
-            """,
-            (user_id, "savings", "QB-SAV-200001", 12850.75),
+            "accounts.insert",
+            (user_id, "savings", "QB-SAV-200001", 1285075),
         )
 
-        _insert_returning_id(
+        insert_returning_id(
             cursor,
-            """
-            INSERT INTO accounts (user_id, account_type, account_number, balance)
-            VALUES (?, ?, ?, ?)
-            """,
-            (user_id, "credit", "QB-CCC-300001", -500.00),
+            "accounts.insert",
+            (user_id, "credit", "QB-CCC-300001", -50000),
         )
 
-        cursor.execute(
-            _sql("""
-                INSERT INTO cards (account_id, card_type, card_last4, expiry_date)
-                VALUES (?, ?, ?, ?)
-                """),
-            (checking_id, "debit", "1234", "12/2026"),
-        )
+        execute(cursor, "cards.insert", (checking_id, "debit", "1234", "12/2026"))
 
         conn.commit()
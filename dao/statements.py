@@ -0,0 +1,174 @@
+"""Statement registry: each DAO query declared once, compiled per backend at import.
+
+DAO modules call :func:`declare` at import time with SQLite-style ``?``
+placeholders. The Postgres text (``%s`` placeholders, ``RETURNING id`` for
+inserts) is derived once here instead of by ``models._sql()`` on every call,
+and DAO methods run statements by name through :func:`execute`.
+
+With ``PG_PREPARED_STATEMENTS=on`` derived statements are also PREPAREd once
+per pooled Postgres connection and run via ``EXECUTE``, so the server reuses
+the plan. Declared SQL must not contain a literal ``?`` outside placeholders.
+"""
+
+from __future__ import annotations
+
+import os
+import textwrap
+import threading
+import weakref
+
+PG_PREPARED_ENV = "PG_PREPARED_STATEMENTS"
+_ON_VALUES = frozenset({"on", "true", "1", "yes"})
+
+
+class Statement:
+    """One query, precompiled for both backends."""
+
+    __slots__ = (
+        "name",
+        "sqlite",
+        "postgres",
+        "returning_id",
+        "prepare_sql",
+        "execute_sql",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        sqlite: str,
+        postgres: str,
+        returning_id: bool,
+        prepare_sql: str | None,
+        execute_sql: str | None,
+    ):
+        self.name = name
+        self.sqlite = sqlite
+        self.postgres = postgres
+        self.returning_id = returning_id
+        self.prepare_sql = prepare_sql
+        self.execute_sql = execute_sql
+
+
+REGISTRY: dict[str, Statement] = {}
+
+
+def _numbered_placeholders(sql: str) -> tuple[str, int]:
+    parts = sql.split("?")
+    out = [parts[0]]
+    for index, part in enumerate(parts[1:], start=1):
+        out.append(f"${index}")
+        out.append(part)
+    return "".join(out), len(parts) - 1
+
+
+def compile_statement(
+    name: str,
+    sql: str,
+    *,
+    postgres: str | None = None,
+    returning_id: bool = False,
+) -> Statement:
+    """Build a :class:`Statement` without registering it."""
+    sqlite_sql = textwrap.dedent(sql).strip().rstrip(";")
+    prepare_sql = execute_sql = None
+    if postgres is not None:
+        pg_sql = textwrap.dedent(postgres).strip().rstrip(";")
+    else:
+        pg_sql = sqlite_sql.replace("?", "%s")
+        numbered, arity = _numbered_placeholders(sqlite_sql)
+        plan = "qb_" + name.replace(".", "_")
+        if returning_id:
+            numbered += " RETURNING id"
+        prepare_sql = f"PREPARE {plan} AS {numbered}"
+        execute_sql = (
+            f"EXECUTE {plan} ({', '.join(['%s'] * arity)})"
+            if arity
+            else f"EXECUTE {plan}"
+        )
+    if returning_id:
+        pg_sql += " RETURNING id"
+    return Statement(name, sqlite_sql, pg_sql, returning_id, prepare_sql, execute_sql)
+
+
+def declare(
+    name: str,
+    sql: str,
+    *,
+    postgres: str | None = None,
+    returning_id: bool = False,
+) -> Statement:
+    """Register a statement under ``name`` (re-declaring replaces it)."""
+    statement = compile_statement(
+        name, sql, postgres=postgres, returning_id=returning_id
+    )
+    REGISTRY[name] = statement
+    return statement
+
+
+def _prepared_enabled() -> bool:
+    return os.environ.get(PG_PREPARED_ENV, "off").lower() in _ON_VALUES
+
+
+# Plans live per server session, so track them per raw driver connection;
+# a recycled connection drops out of the map and re-prepares on first use.
+_prepared: "weakref.WeakKeyDictionary[object, set[str]]" = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+
+def _ensure_prepared(cursor, statement: Statement) -> None:
+    conn = cursor.connection
+    with _prepared_lock:
+        names = _prepared.setdefault(conn, set())
+    if statement.name in names:
+        return
+    # Trusted in-repo SQL compiled at import; no user input in the text.
+    # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
+    cursor.execute(statement.prepare_sql)
+    names.add(statement.name)
+
+
+def execute(cursor, name: str, params=()) -> None:
+    """Run the registered statement ``name`` for the active backend."""
+    from models import using_postgres
+
+    statement = REGISTRY[name]
+    if not using_postgres():
+        cursor.execute(statement.sqlite, params)
+    elif statement.execute_sql is not None and _prepared_enabled():
+        _ensure_prepared(cursor, statement)
+        cursor.execute(statement.execute_sql, params)
+    else:
+        cursor.execute(statement.postgres, params)
+
+
+def executemany(cursor, name: str, seq_of_params) -> None:
+    """Run the registered statement ``name`` once per parameter tuple.
+
+    Postgres batches the rows with ``execute_batch`` (a few round trips per
+    thousand rows) instead of psycopg2's one-round-trip-per-row executemany.
+    """
+    from models import using_postgres
+
+    statement = REGISTRY[name]
+    if not using_postgres():
+        cursor.executemany(statement.sqlite, seq_of_params)
+        return
+
+    from psycopg2.extras import execute_batch
+
+    if statement.execute_sql is not None and _prepared_enabled():
+        _ensure_prepared(cursor, statement)
+        execute_batch(cursor, statement.execute_sql, seq_of_params)
+    else:
+        execute_batch(cursor, statement.postgres, seq_of_params)
+
+
+def insert_returning_id(cursor, name: str, params) -> int:
+    """Run a ``returning_id`` insert and return the new row id on either backend."""
+    from models import using_postgres
+
+    execute(cursor, name, params)
+    if using_postgres():
+        return cursor.fetchone()["id"]
+    return cursor.lastrowid
@@ -1,57 +1,205 @@
 """Transaction data access object."""
 
+from typing import Iterator
+
 from dao.base_dao import BaseDAO
+from dao.rows import Transaction, UserTransaction, fetch_all, positional_cursor
+from dao.statements import declare, execute
+
+# History is ordered by (created_at, id) so keyset cursors are stable when
+# several rows share a timestamp; the *_before variants resume after a cursor.
+# Rows carry their account's currency: amounts are in its minor unit.
+declare(
+    "transactions.by_account",
+    """
+    SELECT t.*, a.currency
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE t.account_id = ?
+    ORDER BY t.created_at DESC, t.id DESC
+    LIMIT ?
+    """,
+)
+declare(
+    "transactions.by_account_before",
+    """
+    SELECT t.*, a.currency
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE t.account_id = ?
+      AND (t.created_at, t.id) < (?, ?)
+    ORDER BY t.created_at DESC, t.id DESC
+    LIMIT ?
+    """,
+)
+declare(
+    "transactions.by_user",
+    """
+    SELECT t.*, a.currency, a.account_type, a.account_number
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE a.user_id = ?
+    ORDER BY t.created_at DESC, t.id DESC
+    LIMIT ?
+    """,
+)
+declare(
+    "transactions.by_user_before",
+    """
+    SELECT t.*, a.currency, a.account_type, a.account_number
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE a.user_id = ?
+      AND (t.created_at, t.id) < (?, ?)
+    ORDER BY t.created_at DESC, t.id DESC
+    LIMIT ?
+    """,
+)
+# Full history for export, streamed in chunks. The explicit Postgres text keeps
+# it out of PG_PREPARED_STATEMENTS: a named cursor cannot DECLARE over EXECUTE.
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "account_number",
+    "account_type",
+    "transaction_type",
+    "amount",
+    "currency",
+    "description",
+    "recipient",
+    "status",
+)
+declare(
+    "transactions.export_by_user",
+    """
+    SELECT t.id, t.created_at, a.account_number, a.account_type,
+           t.transaction_type, t.amount, a.currency, t.description,
+           t.recipient, t.status
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE a.user_id = ?
+    ORDER BY t.created_at DESC, t.id DESC
+    """,
+    postgres="""
+    SELECT t.id, t.created_at, a.account_number, a.account_type,
+           t.transaction_type, t.amount, a.currency, t.description,
+           t.recipient, t.status
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE a.user_id = %s
+    ORDER BY t.created_at DESC, t.id DESC
+    """,
+)
+# Maintained by the transfer write path (dao.rewards_dao); no row means 0.
+declare(
+    "rewards.points_total",
+    "SELECT points AS points_total FROM rewards_balance WHERE user_id = ?",
+)
+
+# Schema states that keep the rewards card hidden, and the banner shown instead.
+REWARDS_STATE_BANNERS = {
+    "forced_fail": "rollback_forced_fail",
+    "skipped": "legacy_no_schema",
+    "unknown": "legacy_no_schema",
+    "runtime_error": "rollback_runtime_error",
+}
 
 
 class TransactionDAO(BaseDAO):
     """Transaction query operations (read-only)."""
 
-    def get_by_account(self, account_id: int, limit: int = 10) -> list[dict]:
-        """Get transactions for an account."""
-        from models import _sql, _row_to_dict, _normalize_row
+    def get_by_account(
+        self,
+        account_id: int,
+        limit: int = 10,
+        before: tuple[str, int] | None = None,
+    ) -> list[Transaction]:
+        """Get transactions for an account, newest first.
 
-        self.get_connection()
+        ``before`` is a decoded ``(created_at, id)`` keyset cursor.
+        """
+        self.get_connection(positional=True)
         try:
-            self.cursor.execute(
-                _sql("""
-                    SELECT * FROM transactions
-                    WHERE account_id = ?
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """),
-                (account_id, limit),
-            )
-            transactions = self.cursor.fetchall()
-            return [_normalize_row(_row_to_dict(trans)) for trans in transactions]
+            if before is None:
+                execute(self.cursor, "transactions.by_account", (account_id, limit))
+            else:
+                execute(
+                    self.cursor,
+                    "transactions.by_account_before",
+                    (account_id, *before, limit),
+                )
+            return fetch_all(self.cursor, Transaction)
         finally:
             self.close()
 
-    def get_by_user(self, user_id: int, limit: int = 20) -> list[dict]:
-        """Get all transactions for a user across all accounts."""
-        from models import _sql, _row_to_dict, _normalize_row
+    def get_by_user(
+        self,
+        user_id: int,
+        limit: int = 20,
+        before: tuple[str, int] | None = None,
+    ) -> list[UserTransaction]:
+        """Get all transactions for a user across all accounts, newest first.
 
-        self.get_connection()
+        ``before`` is a decoded ``(created_at, id)`` keyset cursor.
+        """
+        self.get_connection(positional=True)
         try:
-            self.cursor.execute(
-                _sql("""
-                    SELECT t.*, a.account_type, a.account_number
-                    FROM transactions t
-                    JOIN accounts a ON t.account_id = a.id
-                    WHERE a.user_id = ?
-                    ORDER BY t.created_at DESC
-                    LIMIT ?
-                    """),
-                (user_id, limit),
-            )
-            transactions = self.cursor.fetchall()
-            return [_normalize_row(_row_to_dict(trans)) for trans in transactions]
+            if before is None:
+                execute(self.cursor, "transactions.by_user", (user_id, limit))
+            else:
+                execute(
+                    self.cursor,
+                    "transactions.by_user_before",
+                    (user_id, *before, limit),
+                )
+            return fetch_all(self.cursor, UserTransaction)
         finally:
             self.close()
 
+    def export_by_user(
+        self, user_id: int, chunk_size: int = 1000
+    ) -> Iterator[list[tuple]]:
+        """Yield a user's whole history, newest first, ``chunk_size`` rows at a time.
+
+        Rows are tuples in ``EXPORT_COLUMNS`` order. Postgres reads through a
+        named (server-side) cursor and SQLite through ``fetchmany``, so memory
+        stays flat however long the history is. The generator holds its own
+        connection, never the request's, until it is exhausted or closed.
+        """
+        from models import get_db, using_postgres
+
+        conn = get_db()
+        try:
+            if using_postgres():
+                import psycopg2.extensions
+
+                cursor = conn.cursor(
+                    name="transactions_export",
+                    cursor_factory=psycopg2.extensions.cursor,
+                )
+                cursor.itersize = chunk_size
+            else:
+                cursor = positional_cursor(conn)
+            execute(cursor, "transactions.export_by_user", (user_id,))
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            # Ends the read snapshot (and the named cursor on Postgres).
+            conn.rollback()
+            conn.close()
+
     def get_rewards_for_user(self, user_id: int) -> tuple[int | None, str | None]:
         """Return (points, banner) for UI; rolls back to legacy mode on errors."""
         from db_flags import is_demo_rollout_feature_enabled
-        from models import logger, _resolve_rewards_schema_state, _sql, _row_to_dict
+        from models import (
+            logger,
+            _resolve_rewards_schema_state,
+            _row_to_dict,
+            _set_rewards_schema_cache,
+        )
 
         if not is_demo_rollout_feature_enabled():
             return None, None
@@ -60,22 +208,11 @@ class TransactionDAO(BaseDAO):
         try:
             schema_state = _resolve_rewards_schema_state(self.cursor)
 
-            if schema_state == "forced_fail":
-                return None, "rollback_forced_fail"
-            if schema_state in {"skipped", "unknown"}:
-                return None, "legacy_no_schema"
-            if schema_state == "runtime_error":
-                return None, "rollback_runtime_error"
+            if schema_state in REWARDS_STATE_BANNERS:
+                return None, REWARDS_STATE_BANNERS[schema_state]
 
             try:
-                self.cursor.execute(
-                    _sql("""
-                        SELECT COALESCE(SUM(points), 0) AS points_total
-                        FROM rewards_ledger
-                        WHERE user_id = ?
-                        """),
-                    (user_id,),
-                )
+                execute(self.cursor, "rewards.points_total", (user_id,))
                 row = self.cursor.fetchone()
                 data = _row_to_dict(row) or {}
                 points_total = data.get("points_total")
@@ -88,6 +225,11 @@ class TransactionDAO(BaseDAO):
                     "rewards.rollout.read_failed reason=%s",
                     exc.__class__.__name__,
                 )
+                # An aborted PG transaction would poison later reads that share
+                # the request's connection.
+                self.rollback()
+                # The cached "ready" may be what just failed; re-probe next time.
+                _set_rewards_schema_cache(None)
                 return None, "rollback_runtime_error"
         finally:
             self.close()
@@ -0,0 +1,135 @@
+"""Request-scoped unit of work: one connection and one read snapshot per request.
+
+Registered on the app with :func:`init_app`. Inside an app context every
+BaseDAO shares the connection stored on ``flask.g`` (opened lazily on first
+use, returned to the pool at teardown or before a write), so a page that calls several models
+wrappers pays for one checkout and reads from a single snapshot. Outside an
+app context — CLI scripts, model tests — DAOs keep opening their own. The
+backend choice is pinned on ``g`` the same way, for the same lifetime.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context
+
+_EXTENSION_KEY = "unit_of_work"
+_G_KEY = "_db_unit_of_work"
+_BACKEND_KEY = "_db_backend_postgres"
+
+_thread_backend = threading.local()
+
+
+class UnitOfWork:
+    """Lazily opened shared connection with a repeatable-read snapshot."""
+
+    def __init__(self):
+        self.conn = None
+        self._snapshot_open = False
+
+    def connection(self):
+        """Return the shared connection, opening it and a snapshot if needed."""
+        import models
+
+        if self.conn is None:
+            self.conn = models.get_db()
+        if not self._snapshot_open:
+            self._begin_snapshot()
+        return self.conn
+
+    def _begin_snapshot(self) -> None:
+        from models import using_postgres
+
+        cursor = self.conn.cursor()
+        try:
+            if using_postgres():
+                # psycopg2 opens the transaction implicitly; this must be its
+                # first statement and only applies to this transaction.
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            else:
+                cursor.execute("BEGIN")
+        finally:
+            cursor.close()
+        self._snapshot_open = True
+
+    def end_snapshot(self) -> None:
+        """Release the read snapshot so a write in this request is not blocked
+        by it and later reads see the write. The connection stays checked out."""
+        if self.conn is not None and self._snapshot_open:
+            self._snapshot_open = False
+            self.conn.rollback()
+
+    def close(self) -> None:
+        if self.conn is None:
+            return
+        conn, self.conn = self.conn, None
+        self._snapshot_open = False
+        # Read-only by contract: the pool rolls back on check-in.
+        conn.close()
+
+
+def init_app(app) -> None:
+    """Enable the request-scoped unit of work for ``app``."""
+    app.extensions[_EXTENSION_KEY] = True
+    app.teardown_appcontext(_teardown_unit_of_work)
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """The active unit of work, or None outside an enabled app context."""
+    if not has_app_context() or not current_app.extensions.get(_EXTENSION_KEY):
+        return None
+    uow = g.get(_G_KEY)
+    if uow is None:
+        uow = UnitOfWork()
+        setattr(g, _G_KEY, uow)
+    return uow
+
+
+def pinned_backend(resolve) -> bool:
+    """Resolve the backend once per app context and reuse it until teardown,
+    so a flag flip mid-request can never split one request across backends."""
+    pinned = getattr(_thread_backend, "postgres", None)
+    if pinned is not None:
+        return pinned
+    if not has_app_context():
+        return resolve()
+    pinned = g.get(_BACKEND_KEY)
+    if pinned is None:
+        pinned = resolve()
+        setattr(g, _BACKEND_KEY, pinned)
+    return pinned
+
+
+@contextmanager
+def thread_backend(postgres: bool):
+    """Pin the backend for this thread, for work that runs outside any request
+    on a connection of a known backend (the SQLite group-commit writer)."""
+    previous = getattr(_thread_backend, "postgres", None)
+    _thread_backend.postgres = postgres
+    try:
+        yield
+    finally:
+        _thread_backend.postgres = previous
+
+
+def release_request_connection() -> None:
+    """Called by write wrappers before they take their own write connection.
+
+    Ends the read snapshot and checks the shared connection back in, so a
+    request never holds two pooled connections at once (concurrent writes
+    would otherwise exhaust the pool waiting on each other). A later read in
+    the same request checks out a fresh one and sees the write.
+    """
+    if not has_app_context():
+        return
+    uow = g.get(_G_KEY)
+    if uow is not None:
+        uow.close()
+
+
+def _teardown_unit_of_work(exc=None) -> None:
+    uow = g.pop(_G_KEY, None)
+    if uow is not None:
+        uow.close()
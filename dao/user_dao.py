@@ -1,36 +1,35 @@
 """User data access object."""
 
 from dao.base_dao import BaseDAO
+from dao.rows import User, fetch_one
+from dao.statements import declare, execute
+
+declare("users.by_username", "SELECT * FROM users WHERE username = ?")
+declare(
+    "users.profile",
+    "SELECT username, email, full_name FROM users WHERE id = ?",
+)
 
 
 class UserDAO(BaseDAO):
     """User query operations (read-only)."""
 
-    def get_by_username(self, username: str) -> dict | None:
+    def get_by_username(self, username: str) -> User | None:
         """Get user by username."""
-        from models import _sql, _row_to_dict
-
-        self.get_connection()
+        self.get_connection(positional=True)
         try:
-            self.cursor.execute(
-                _sql("SELECT * FROM users WHERE username = ?"),
-                (username,),
-            )
-            user = self.cursor.fetchone()
-            return _row_to_dict(user)
+            execute(self.cursor, "users.by_username", (username,))
+            return fetch_one(self.cursor, User)
         finally:
             self.close()
 
     def get_profile(self, user_id: int) -> dict | None:
         """Get user profile (display-safe columns only)."""
-        from models import PROFILE_DEMO_ADDRESS as address_constant, _sql, _row_to_dict
+        from models import PROFILE_DEMO_ADDRESS as address_constant, _row_to_dict
 
         self.get_connection()
         try:
-            self.cursor.execute(
-                _sql("SELECT username, email, full_name FROM users WHERE id = ?"),
-                (user_id,),
-            )
+            execute(self.cursor, "users.profile", (user_id,))
             row = self.cursor.fetchone()
             if row is None:
                 return None
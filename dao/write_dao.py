@@ -1,6 +1,65 @@
 """Write Data Access Object for transaction creation and management."""
 
 from dao.base_dao import BaseDAO
+from dao.rewards_dao import RewardsDAO
+from dao.statements import declare, execute, executemany, insert_returning_id
+from money import to_minor
+
+declare(
+    "transactions.insert",
+    """
+    INSERT INTO transactions (account_id, transaction_type, amount, description, recipient)
+    VALUES (?, ?, ?, ?, ?)
+    """,
+    returning_id=True,
+)
+# Batch legs: no id needed back, so no RETURNING (and executemany-friendly).
+declare(
+    "transactions.insert_leg",
+    """
+    INSERT INTO transactions (account_id, transaction_type, amount, description, recipient)
+    VALUES (?, ?, ?, ?, ?)
+    """,
+)
+declare("accounts.credit", "UPDATE accounts SET balance = balance + ? WHERE id = ?")
+declare("accounts.debit", "UPDATE accounts SET balance = balance - ? WHERE id = ?")
+declare(
+    "accounts.lock_pair",
+    """
+    SELECT id, balance, account_number, user_id, currency FROM accounts
+    WHERE id IN (?, ?)
+    """,
+    postgres="""
+    SELECT id, balance, account_number, user_id, currency FROM accounts
+    WHERE id IN (%s, %s)
+    ORDER BY id
+    FOR UPDATE
+    """,
+)
+# Every account a batch touches, in one statement. The ids travel as one JSON
+# array so the statement text does not depend on the batch size; Postgres
+# locks the rows in id order for the rest of the batch transaction.
+declare(
+    "accounts.transfer_sources",
+    """
+    SELECT id, balance, account_number, user_id, currency FROM accounts
+    WHERE id IN (SELECT value FROM json_each(?))
+    """,
+    postgres="""
+    SELECT id, balance, account_number, user_id, currency FROM accounts
+    WHERE id IN (SELECT value::int FROM json_array_elements_text(%s::json))
+    ORDER BY id
+    FOR UPDATE
+    """,
+)
+declare(
+    "rewards.insert",
+    """
+    INSERT INTO rewards_ledger
+        (user_id, source_account_id, target_account_id, points)
+    VALUES (?, ?, ?, ?)
+    """,
+)
 
 
 class WriteDAO(BaseDAO):
@@ -11,32 +70,20 @@ class WriteDAO(BaseDAO):
         conn,
         account_id: int,
         transaction_type: str,
-        amount: float,
+        amount: int,
         description: str,
         recipient: str = "",
     ) -> int:
         """Create a new transaction (DAO method, receives caller's connection)."""
-        from models import _insert_returning_id, _sql
-
         cursor = conn.cursor()
 
-        transaction_id = _insert_returning_id(
+        transaction_id = insert_returning_id(
             cursor,
-            """
-            INSERT INTO transactions (account_id, transaction_type, amount, description, recipient)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+            "transactions.insert",
             (account_id, transaction_type, amount, description, recipient),
         )
 
-        cursor.execute(
-            _sql("""
-                UPDATE accounts
-                SET balance = balance + ?
-                WHERE id = ?
-                """),
-            (amount, account_id),
-        )
+        execute(cursor, "accounts.credit", (amount, account_id))
 
         return transaction_id
 
@@ -45,47 +92,57 @@ class WriteDAO(BaseDAO):
         conn,
         from_account_id: int,
         to_account_id: int,
-        amount: float,
+        amount: int,
         description: str = "Transfer",
         acting_user_id: int | None = None,
     ) -> tuple[bool, str]:
         """Move money between two accounts (DAO method, receives caller's connection).
 
+        ``amount`` is integer minor units, or a Decimal in major units of the
+        source account's currency, converted here from the locked row.
         Returns ``(ok, message)``. Never commits, rolls back, or closes: the
         caller owns the connection lifecycle. Amount validation stays in the
         models wrapper so no connection is opened for an invalid amount.
         """
-        import models
-        from models import _normalize_row, _row_to_dict, _sql
+        from models import _normalize_row, _row_to_dict
 
         cursor = conn.cursor()
 
-        cursor.execute(
-            _sql("SELECT balance, account_number, user_id FROM accounts WHERE id = ?"),
-            (from_account_id,),
-        )
-        from_account = _normalize_row(_row_to_dict(cursor.fetchone()))
-
-        cursor.execute(
-            _sql("SELECT account_number FROM accounts WHERE id = ?"),
-            (to_account_id,),
-        )
-        to_account = _row_to_dict(cursor.fetchone())
+        # Both rows in one statement; on Postgres this also locks them in id
+        # order, so A->B and B->A queue behind each other instead of deadlocking
+        # and the funds check below cannot be raced.
+        execute(cursor, "accounts.lock_pair", (from_account_id, to_account_id))
+        locked = {
+            row["id"]: row
+            for row in (_normalize_row(_row_to_dict(r)) for r in cursor.fetchall())
+        }
+        from_account = locked.get(from_account_id)
+        to_account = locked.get(to_account_id)
 
         if not from_account or not to_account:
             return False, "Account not found"
 
+        if from_account_id == to_account_id:
+            return False, "Cannot transfer to the same account"
+
         if acting_user_id is not None and from_account["user_id"] != acting_user_id:
             return False, "Forbidden"
 
+        # Amounts are minor units of one currency; there is no FX conversion.
+        if from_account["currency"] != to_account["currency"]:
+            return False, "Currency mismatch"
+
+        try:
+            amount = to_minor(amount, from_account["currency"])
+        except ValueError:
+            return False, "Invalid amount"
+
         if from_account["balance"] < amount:
             return False, "Insufficient funds"
 
-        cursor.execute(
-            _sql("""
-                INSERT INTO transactions (account_id, transaction_type, amount, description, recipient)
-                VALUES (?, ?, ?, ?, ?)
-                """),
+        execute(
+            cursor,
+            "transactions.insert",
             (
                 from_account_id,
                 "transfer",
@@ -95,16 +152,11 @@ class WriteDAO(BaseDAO):
             ),
         )
 
-        cursor.execute(
-            _sql("UPDATE accounts SET balance = balance - ? WHERE id = ?"),
-            (amount, from_account_id),
-        )
+        execute(cursor, "accounts.debit", (amount, from_account_id))
 
-        cursor.execute(
-            _sql("""
-                INSERT INTO transactions (account_id, transaction_type, amount, description, recipient)
-                VALUES (?, ?, ?, ?, ?)
-                """),
+        execute(
+            cursor,
+            "transactions.insert",
             (
                 to_account_id,
                 "transfer",
@@ -114,10 +166,16 @@ class WriteDAO(BaseDAO):
             ),
         )
 
-        cursor.execute(
-            _sql("UPDATE accounts SET balance = balance + ? WHERE id = ?"),
-            (amount, to_account_id),
-        )
+        execute(cursor, "accounts.credit", (amount, to_account_id))
+
+        self._award_rewards(conn, cursor, from_account, to_account, amount)
+
+        return True, "Transfer successful"
+
+    @staticmethod
+    def _award_rewards(conn, cursor, from_account, to_account, amount) -> None:
+        """Rewards for one applied transfer; never fails the money movement."""
+        import models
 
         # Demo-only progressive delivery:
         # writes to rewards_ledger should succeed only after schema is applied.
@@ -130,9 +188,10 @@ class WriteDAO(BaseDAO):
                 conn=conn,
                 cursor=cursor,
                 user_id=from_account["user_id"],
-                source_account_id=from_account_id,
-                target_account_id=to_account_id,
+                source_account_id=from_account["id"],
+                target_account_id=to_account["id"],
                 transfer_amount=amount,
+                currency=from_account["currency"],
             )
             cursor.execute("RELEASE SAVEPOINT rewards_savepoint")
         except Exception:
@@ -141,7 +200,106 @@ class WriteDAO(BaseDAO):
             cursor.execute("ROLLBACK TO SAVEPOINT rewards_savepoint")
             cursor.execute("RELEASE SAVEPOINT rewards_savepoint")
 
-        return True, "Transfer successful"
+    def transfer_many_internal(
+        self,
+        conn,
+        transfers: list[dict],
+        acting_user_id: int | None = None,
+    ) -> list[tuple[bool, str]]:
+        """Apply a batch of transfers (DAO method, receives caller's connection).
+
+        Each item is a dict with ``from_account_id``, ``to_account_id``,
+        ``amount`` (as for ``transfer_internal``) and optional ``description``. Items are validated in order
+        against running balances with the same checks and messages as
+        ``transfer_internal``, and earn rewards through the same
+        ``models.try_insert_rewards_points`` seam, but all accounts are read in
+        one statement and all legs are written with one executemany per
+        statement. Returns one ``(ok, message)`` per item. Never commits, rolls
+        back, or closes.
+        """
+        import json
+
+        from models import _normalize_row, _row_to_dict
+
+        cursor = conn.cursor()
+
+        account_ids = sorted(
+            {t["from_account_id"] for t in transfers}
+            | {t["to_account_id"] for t in transfers}
+        )
+        execute(cursor, "accounts.transfer_sources", (json.dumps(account_ids),))
+        accounts = {
+            row["id"]: row
+            for row in (_normalize_row(_row_to_dict(r)) for r in cursor.fetchall())
+        }
+
+        results: list[tuple[bool, str]] = []
+        legs = []
+        deltas: dict[int, int] = {}
+        applied = []
+        for transfer in transfers:
+            from_account = accounts.get(transfer["from_account_id"])
+            to_account = accounts.get(transfer["to_account_id"])
+            if not from_account or not to_account:
+                results.append((False, "Account not found"))
+                continue
+            if from_account["id"] == to_account["id"]:
+                results.append((False, "Cannot transfer to the same account"))
+                continue
+            if acting_user_id is not None and from_account["user_id"] != acting_user_id:
+                results.append((False, "Forbidden"))
+                continue
+            if from_account["currency"] != to_account["currency"]:
+                results.append((False, "Currency mismatch"))
+                continue
+            try:
+                amount = to_minor(transfer["amount"], from_account["currency"])
+            except ValueError:
+                results.append((False, "Invalid amount"))
+                continue
+            if from_account["balance"] < amount:
+                results.append((False, "Insufficient funds"))
+                continue
+
+            from_account["balance"] -= amount
+            to_account["balance"] += amount
+            deltas[from_account["id"]] = deltas.get(from_account["id"], 0) - amount
+            deltas[to_account["id"]] = deltas.get(to_account["id"], 0) + amount
+            description = transfer.get("description") or "Transfer"
+            legs.append(
+                (
+                    from_account["id"],
+                    "transfer",
+                    -amount,
+                    description,
+                    to_account["account_number"],
+                )
+            )
+            legs.append(
+                (
+                    to_account["id"],
+                    "transfer",
+                    amount,
+                    description,
+                    from_account["account_number"],
+                )
+            )
+            applied.append((from_account, to_account, amount))
+            results.append((True, "Transfer successful"))
+
+        if legs:
+            executemany(cursor, "transactions.insert_leg", legs)
+            executemany(
+                cursor,
+                "accounts.credit",
+                [(delta, account_id) for account_id, delta in sorted(deltas.items())],
+            )
+
+            # Same rewards path (and seam) as transfer_internal, per transfer.
+            for from_account, to_account, amount in applied:
+                self._award_rewards(conn, cursor, from_account, to_account, amount)
+
+        return results
 
     def insert_rewards_points(
         self,
@@ -151,14 +309,15 @@ class WriteDAO(BaseDAO):
         user_id: int,
         source_account_id: int,
         target_account_id: int,
-        transfer_amount: float,
+        transfer_amount: int,
+        currency: str | None = None,
     ) -> bool:
         """Attempt to insert rewards points; never fail the core transfer (exact copy of current implementation)."""
         from db_flags import is_demo_rollout_feature_enabled
         from models import (
             _resolve_rewards_schema_state,
             _compute_reward_points,
-            _sql,
+            _set_rewards_schema_cache,
             logger,
         )
 
@@ -168,22 +327,30 @@ class WriteDAO(BaseDAO):
             return False
 
         try:
-            points = _compute_reward_points(transfer_amount)
+            points = _compute_reward_points(transfer_amount, currency)
             if points <= 0:
                 return False
 
-            cursor.execute(
-                _sql("""
-                    INSERT INTO rewards_ledger
-                        (user_id, source_account_id, target_account_id, points)
-                    VALUES (?, ?, ?, ?)
-                    """),
-                (user_id, source_account_id, target_account_id, points),
-            )
+            # Ledger row and summary row land together or not at all; the
+            # caller's rewards_savepoint encloses this one.
+            cursor.execute("SAVEPOINT rewards_points")
+            try:
+                execute(
+                    cursor,
+                    "rewards.insert",
+                    (user_id, source_account_id, target_account_id, points),
+                )
+                RewardsDAO.add_points(cursor, user_id, points)
+                cursor.execute("RELEASE SAVEPOINT rewards_points")
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT rewards_points")
+                cursor.execute("RELEASE SAVEPOINT rewards_points")
+                raise
             logger.info("rewards.rollout.write_succeeded points=%s", points)
             return True
         except Exception as exc:
             logger.warning(
                 "rewards.rollout.write_failed reason=%s", exc.__class__.__name__
             )
+            _set_rewards_schema_cache(None)
             return False
@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
 
-from split_config import get_split_client
+from split_config import get_split_client, split_status
+from treatment_cache import get_treatment
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +31,7 @@ def is_postgres_database_enabled(user_key: str = "__system__") -> bool:
     split_client = get_split_client()
     if split_client and user_key:
         try:
-            treatment = split_client.get_treatment(user_key, "postgres_database")
+            treatment = get_treatment(split_client, user_key, "postgres_database")
             logger.debug(
                 "Split.io flag 'postgres_database' = %r (user: %s)",
                 treatment,
@@ -68,6 +71,60 @@ def is_postgres_database_enabled(user_key: str = "__system__") -> bool:
     return True
 
 
+# Backend resolution is on every SQL string's path, so the Split evaluation
+# above is memoized for a short TTL. DB_BACKEND_CACHE_TTL=0 disables caching.
+BACKEND_CACHE_TTL_ENV = "DB_BACKEND_CACHE_TTL"
+DEFAULT_BACKEND_CACHE_TTL = 5.0
+# Cap while the Split SDK is still starting (see _split_starting).
+STARTING_BACKEND_CACHE_TTL = 0.5
+
+_backend_cache: tuple[bool, float] | None = None
+_backend_cache_lock = threading.Lock()
+
+
+def _backend_cache_ttl() -> float:
+    raw = os.environ.get(BACKEND_CACHE_TTL_ENV, "")
+    try:
+        return max(0.0, float(raw)) if raw.strip() else DEFAULT_BACKEND_CACHE_TTL
+    except ValueError:
+        return DEFAULT_BACKEND_CACHE_TTL
+
+
+def _split_starting() -> bool:
+    # Until the SDK is ready postgres_database answers "control" and the env
+    # var decides; that answer is cached only briefly, so readiness is seen
+    # within STARTING_BACKEND_CACHE_TTL. "timed_out" can last indefinitely,
+    # so it is still cached rather than re-evaluated on every statement.
+    return split_status()["state"] in ("initializing", "timed_out")
+
+
+def cached_postgres_database_enabled() -> bool:
+    """``is_postgres_database_enabled()`` memoized for ``DB_BACKEND_CACHE_TTL`` s."""
+    global _backend_cache
+    now = time.monotonic()
+    cached = _backend_cache
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    with _backend_cache_lock:
+        cached = _backend_cache
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        enabled = is_postgres_database_enabled()
+        ttl = _backend_cache_ttl()
+        if _split_starting():
+            ttl = min(ttl, STARTING_BACKEND_CACHE_TTL)
+        _backend_cache = (enabled, now + ttl)
+    return enabled
+
+
+def refresh_postgres_database_flag() -> bool:
+    """Drop the cached backend decision and resolve it again now."""
+    global _backend_cache
+    with _backend_cache_lock:
+        _backend_cache = None
+    return cached_postgres_database_enabled()
+
+
 def _env_enabled(var_name: str, default: str = "off") -> bool:
     return os.environ.get(var_name, default).lower() in _ON_VALUES
 
@@ -0,0 +1,395 @@
+"""Bounded, thread-safe connection pools behind models.get_db().
+
+One pool per (backend, target) — the Postgres DSN or the SQLite file path — so
+tests that point QUANTUM_BANK_DATABASE at a fresh file get a fresh pool.
+Checked-out connections are wrapped in :class:`PooledConnection`, whose
+``close()`` rolls back any open transaction and returns the connection to the
+pool instead of tearing it down, so DAO code keeps its open/close shape.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from prometheus_minimal import _fmt_labels
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE_ENV = "DB_POOL_SIZE"
+POOL_TIMEOUT_ENV = "DB_POOL_TIMEOUT"
+POOL_MAX_LIFETIME_ENV = "DB_POOL_MAX_LIFETIME"
+POOL_PING_INTERVAL_ENV = "DB_POOL_PING_INTERVAL"
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_TIMEOUT = 10.0
+DEFAULT_MAX_LIFETIME = 1800.0
+DEFAULT_PING_INTERVAL = 30.0
+
+
+class PoolTimeout(RuntimeError):
+    """No connection became free within the pool's checkout timeout."""
+
+
+def _env_number(var_name: str, default: float) -> float:
+    raw = os.environ.get(var_name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning("Ignoring non-numeric %s=%r", var_name, raw)
+        return default
+
+
+def pool_size() -> int:
+    """Max connections per pool; ``DB_POOL_SIZE=0`` disables pooling."""
+    return max(0, int(_env_number(POOL_SIZE_ENV, DEFAULT_POOL_SIZE)))
+
+
+def pooling_enabled() -> bool:
+    return pool_size() > 0
+
+
+def _default_ping(conn) -> None:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        cursor.close()
+    conn.rollback()
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:  # pragma: no cover — already-dead connections
+        pass
+
+
+class _Slot:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """Connection proxy handed out by the pool; ``close()`` checks it back in."""
+
+    __slots__ = ("_pool", "_slot")
+
+    def __init__(self, pool: "ConnectionPool", slot: _Slot):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_slot", slot)
+
+    @property
+    def raw(self):
+        """The underlying driver connection (sqlite3 / psycopg2)."""
+        if self._slot is None:
+            raise RuntimeError("connection already returned to the pool")
+        return self._slot.conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.raw, name, value)
+
+    def close(self) -> None:
+        """Return the connection to the pool (safe to call multiple times)."""
+        slot = self._slot
+        if slot is None:
+            return
+        object.__setattr__(self, "_slot", None)
+        self._pool._checkin(slot)
+
+    def __del__(self):
+        try:
+            slot = object.__getattribute__(self, "_slot")
+        except AttributeError:
+            return
+        if slot is not None:
+            self._pool._release_leaked(slot)
+
+
+class ConnectionPool:
+    """Bounded LIFO pool with checkout timeout, lifetime recycling and pings.
+
+    ``connect`` opens a new driver connection; it is only ever called outside
+    the pool lock so a slow handshake never blocks check-ins.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Any],
+        *,
+        max_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_POOL_TIMEOUT,
+        max_lifetime: float = DEFAULT_MAX_LIFETIME,
+        ping_interval: float = DEFAULT_PING_INTERVAL,
+        ping: Callable[[Any], None] | None = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self._connect = connect
+        self._ping = ping or _default_ping
+        self._after_fork()
+        self._closed = False
+
+    def _after_fork(self) -> None:
+        # Inherited sockets belong to the parent: drop them without closing
+        # (closing would terminate the parent's server session) and start
+        # over with a fresh lock, since the parent may have held it mid-fork.
+        self._cond = threading.Condition()
+        self._idle: deque[_Slot] = deque()
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._broken = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+
+    def checkout(self, timeout: float | None = None) -> PooledConnection:
+        """Borrow a connection, waiting up to ``timeout`` seconds for a free slot."""
+        if os.getpid() != self._pid:
+            self._after_fork()
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"pool {self.name} is closed")
+            while True:
+                if self._idle:
+                    slot = self._idle.pop()
+                    break
+                if self._in_use < self.max_size:
+                    slot = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"no connection available from pool {self.name} "
+                        f"within {timeout:.1f}s (size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_seconds += time.monotonic() - start
+
+        try:
+            if slot is not None:
+                slot = self._validate(slot)
+            if slot is None:
+                slot = _Slot(self._connect())
+                with self._cond:
+                    self._created += 1
+        except BaseException:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, slot)
+
+    def _validate(self, slot: _Slot) -> _Slot | None:
+        now = time.monotonic()
+        if now - slot.created_at >= self.max_lifetime:
+            _close_quietly(slot.conn)
+            with self._cond:
+                self._recycled += 1
+            return None
+        if now - slot.last_used >= self.ping_interval:
+            try:
+                self._ping(slot.conn)
+            except Exception as exc:
+                logger.info("db.pool.ping_failed pool=%s reason=%s", self.name, exc)
+                _close_quietly(slot.conn)
+                with self._cond:
+                    self._broken += 1
+                return None
+        return slot
+
+    def _checkin(self, slot: _Slot) -> None:
+        if os.getpid() != self._pid:
+            return
+        healthy = True
+        try:
+            slot.conn.rollback()
+        except Exception:
+            healthy = False
+        now = time.monotonic()
+        expired = now - slot.created_at >= self.max_lifetime
+        with self._cond:
+            self._in_use -= 1
+            keep = healthy and not expired and not self._closed
+            if keep:
+                slot.last_used = now
+                self._idle.append(slot)
+            elif expired:
+                self._recycled += 1
+            elif not healthy:
+                self._broken += 1
+            self._cond.notify()
+        if not keep:
+            _close_quietly(slot.conn)
+
+    def _release_leaked(self, slot: _Slot) -> None:
+        if os.getpid() != self._pid:
+            return
+        logger.warning(
+            "db.pool.leaked pool=%s — connection was never closed", self.name
+        )
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+        _close_quietly(slot.conn)
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed on check-in."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for slot in idle:
+            _close_quietly(slot.conn)
+
+    def stats(self) -> dict:
+        """Point-in-time counters for sizing the pool under load."""
+        with self._cond:
+            return {
+                "pool": self.name,
+                "max_size": self.max_size,
+                "size": self._in_use + len(self._idle),
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "broken": self._broken,
+                "waits": self._waits,
+                "wait_seconds": self._wait_seconds,
+                "timeouts": self._timeouts,
+            }
+
+
+_pools: dict[tuple[str, str], ConnectionPool] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool(
+    key: tuple[str, str],
+    connect: Callable[[], Any],
+    *,
+    name: str,
+    ping: Callable[[Any], None] | None = None,
+) -> ConnectionPool:
+    """Return the process-wide pool for ``key``, creating it from env settings."""
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    with _registry_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                name,
+                connect,
+                max_size=max(1, pool_size()),
+                timeout=_env_number(POOL_TIMEOUT_ENV, DEFAULT_POOL_TIMEOUT),
+                max_lifetime=_env_number(POOL_MAX_LIFETIME_ENV, DEFAULT_MAX_LIFETIME),
+                ping_interval=_env_number(
+                    POOL_PING_INTERVAL_ENV, DEFAULT_PING_INTERVAL
+                ),
+                ping=ping,
+            )
+            _pools[key] = pool
+    return pool
+
+
+def close_all_pools() -> None:
+    with _registry_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats() -> list[dict]:
+    return [pool.stats() for pool in list(_pools.values())]
+
+
+_GAUGES = (
+    ("db_pool_max_size", "Configured pool capacity", "max_size"),
+    ("db_pool_in_use", "Connections currently checked out", "in_use"),
+    ("db_pool_idle", "Idle connections held by the pool", "idle"),
+)
+_COUNTERS = (
+    ("db_pool_checkouts_total", "Connections handed out", "checkouts"),
+    ("db_pool_created_total", "Driver connections opened", "created"),
+    (
+        "db_pool_recycled_total",
+        "Connections closed for exceeding max lifetime",
+        "recycled",
+    ),
+    (
+        "db_pool_broken_total",
+        "Connections discarded after a failed ping/rollback",
+        "broken",
+    ),
+    ("db_pool_waits_total", "Checkouts that had to wait for a free slot", "waits"),
+    (
+        "db_pool_wait_seconds_total",
+        "Time spent waiting for a free slot",
+        "wait_seconds",
+    ),
+    ("db_pool_timeouts_total", "Checkouts that gave up after the timeout", "timeouts"),
+)
+
+
+def format_pool_metrics() -> str:
+    """Prometheus text for every live pool (appended to /metrics)."""
+    snapshot = pool_stats()
+    if not snapshot:
+        return ""
+    lines: list[str] = []
+    for kind, family in (("gauge", _GAUGES), ("counter", _COUNTERS)):
+        for metric, doc, field in family:
+            lines.append(f"# HELP {metric} {doc}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for stats in snapshot:
+                lab = _fmt_labels((("pool", stats["pool"]),))
+                lines.append(f"{metric}{{{lab}}} {stats[field]}")
+    return "\n".join(lines) + "\n"
+
+
+def _reset_pools_after_fork() -> None:
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    for pool in list(_pools.values()):
+        pool._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
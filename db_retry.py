@@ -0,0 +1,118 @@
+"""Bounded retry for write transactions that lose a Postgres lock race.
+
+Transfers lock their account rows in id order, which rules out lock-order
+deadlocks between transfers, but Postgres can still abort a transaction with
+``serialization_failure`` (40001) or ``deadlock_detected`` (40P01), e.g. when
+another writer's lock order differs. Those are safe to re-run from the top:
+:func:`call_with_retry` rolls back, sleeps with jittered exponential backoff
+and tries again, up to ``TRANSFER_MAX_RETRIES`` times. Counters are exported
+on /metrics.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, TypeVar
+
+from db_pool import _env_number
+from prometheus_minimal import _fmt_labels
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES_ENV = "TRANSFER_MAX_RETRIES"
+RETRY_BASE_MS_ENV = "TRANSFER_RETRY_BASE_MS"
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BASE_MS = 10.0
+MAX_BACKOFF_SECONDS = 0.5
+
+RETRYABLE_SQLSTATES = {
+    "40001": "serialization_failure",
+    "40P01": "deadlock_detected",
+}
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_retries: dict[tuple[str, str], int] = defaultdict(int)
+_exhausted: dict[tuple[str, str], int] = defaultdict(int)
+
+
+def retryable_reason(exc: BaseException) -> str | None:
+    """Name of the retryable Postgres error behind ``exc``, if it is one."""
+    return RETRYABLE_SQLSTATES.get(getattr(exc, "pgcode", None) or "")
+
+
+def max_retries() -> int:
+    return max(0, int(_env_number(MAX_RETRIES_ENV, DEFAULT_MAX_RETRIES)))
+
+
+def backoff_seconds(attempt: int) -> float:
+    """Full-jitter exponential backoff for the ``attempt``-th retry (0-based)."""
+    base = _env_number(RETRY_BASE_MS_ENV, DEFAULT_RETRY_BASE_MS) / 1000.0
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, base * (2**attempt)))
+
+
+def call_with_retry(op: str, conn, attempt_fn: Callable[[], T]) -> T:
+    """Run ``attempt_fn`` (one whole transaction on ``conn``), retrying on
+    serialization failures and deadlocks. Other errors propagate untouched."""
+    attempt = 0
+    while True:
+        try:
+            return attempt_fn()
+        except Exception as exc:
+            reason = retryable_reason(exc)
+            if reason is None:
+                raise
+            if attempt >= max_retries():
+                with _lock:
+                    _exhausted[(op, reason)] += 1
+                logger.warning("%s gave up after %s retries (%s)", op, attempt, reason)
+                raise
+            conn.rollback()
+            with _lock:
+                _retries[(op, reason)] += 1
+            time.sleep(backoff_seconds(attempt))
+            attempt += 1
+
+
+def retry_stats() -> dict[str, dict[str, int]]:
+    """``{"retries": {"op:reason": n}, "exhausted": {...}}`` since process start."""
+    with _lock:
+        return {
+            "retries": {f"{op}:{reason}": n for (op, reason), n in _retries.items()},
+            "exhausted": {
+                f"{op}:{reason}": n for (op, reason), n in _exhausted.items()
+            },
+        }
+
+
+def format_retry_metrics() -> str:
+    """Prometheus text for the retry counters (appended to /metrics)."""
+    with _lock:
+        families = (
+            (
+                "db_transaction_retries_total",
+                "Write transactions re-run after a lock conflict",
+                sorted(_retries.items()),
+            ),
+            (
+                "db_transaction_retries_exhausted_total",
+                "Write transactions that failed after the last retry",
+                sorted(_exhausted.items()),
+            ),
+        )
+    if not any(samples for _, _, samples in families):
+        return ""
+    lines: list[str] = []
+    for metric, doc, samples in families:
+        lines.append(f"# HELP {metric} {doc}")
+        lines.append(f"# TYPE {metric} counter")
+        for (op, reason), value in samples:
+            lab = _fmt_labels((("op", op), ("reason", reason)))
+            lines.append(f"{metric}{{{lab}}} {value}")
+    return "\n".join(lines) + "\n"
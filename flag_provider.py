@@ -0,0 +1,189 @@
+"""Flag providers: anything that answers ``get_treatment`` like the Split client.
+
+``split_config.get_split_client()`` returns a provider, and callers
+(db_flags, the home/pricing handlers, treatment_cache) only use
+``get_treatment``, ``get_treatments`` and ``destroy``. The Split SDK client
+already has that shape; :class:`FileFlagProvider` is the offline one, chosen
+by setting ``FLAG_FILE`` to a JSON or YAML file of definitions::
+
+    postgres_database: "off"          # fixed treatment
+    demo_mode:
+      default: "off"
+      rules:                          # first match wins
+        - attribute: url-entry
+          contains: demo
+          treatment: "on"
+    home_page_variant:
+      default: new_home
+      allocations:                    # percent of keys, deterministic per key
+        old_home: 50
+        dev_home: 25
+
+Rules match an attribute with ``equals``, ``contains``, ``starts_with`` or
+``in`` and serve either a ``treatment`` or their own ``allocations``; a
+``keys`` map pins individual keys. Unknown flags answer ``"control"``, as
+Split does. The file is re-read when its mtime changes (checked at most every
+``FLAG_FILE_POLL_SECONDS``, default 1); a file that fails to parse keeps the
+last good definitions. treatment_cache does not share a provider's answers
+across requests, so an edit is served within one poll interval.
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Iterable
+
+from db_pool import _env_number
+
+logger = logging.getLogger(__name__)
+
+FLAG_FILE_ENV = "FLAG_FILE"
+POLL_SECONDS_ENV = "FLAG_FILE_POLL_SECONDS"
+DEFAULT_POLL_SECONDS = 1.0
+
+CONTROL = "control"
+_MATCHERS = {
+    "equals": lambda value, arg: value == str(arg),
+    "contains": lambda value, arg: str(arg).lower() in value.lower(),
+    "starts_with": lambda value, arg: value.startswith(str(arg)),
+    "in": lambda value, arg: value in {str(a) for a in arg},
+}
+
+
+class FlagProvider(abc.ABC):
+    """Provider interface; subclasses implement :meth:`get_treatment`."""
+
+    @abc.abstractmethod
+    def get_treatment(self, key, flag, attributes=None) -> str:
+        """Treatment for ``key``, or ``"control"`` for an unknown flag."""
+
+    def get_treatments(self, key, flags, attributes=None) -> dict[str, str]:
+        return {flag: self.get_treatment(key, flag, attributes) for flag in flags}
+
+    def destroy(self) -> None:
+        pass
+
+
+def bucket(key: str, flag: str) -> int:
+    """Stable 0..99 bucket for ``key`` within ``flag``."""
+    digest = hashlib.sha256(f"{flag}:{key}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % 100
+
+
+def _allocate(allocations: dict, key: str, flag: str) -> str | None:
+    point, edge = bucket(key, flag), 0.0
+    for treatment, percent in allocations.items():
+        edge += float(percent)
+        if point < edge:
+            return str(treatment)
+    return None
+
+
+def _rule_matches(rule: dict, attributes: dict | None) -> bool:
+    value = (attributes or {}).get(rule.get("attribute"))
+    if value is None:
+        return False
+    tests = [(op, arg) for op, arg in rule.items() if op in _MATCHERS]
+    return bool(tests) and all(_MATCHERS[op](str(value), arg) for op, arg in tests)
+
+
+def evaluate(definition, key: str, flag: str, attributes: dict | None = None) -> str:
+    """Treatment for ``key`` under one flag definition."""
+    if not isinstance(definition, dict):
+        return str(definition)
+    pinned = (definition.get("keys") or {}).get(key)
+    if pinned is not None:
+        return str(pinned)
+    default = str(definition.get("default", CONTROL))
+    for rule in definition.get("rules") or ():
+        if _rule_matches(rule, attributes):
+            if "treatment" in rule:
+                return str(rule["treatment"])
+            return _allocate(rule.get("allocations") or {}, key, flag) or default
+    allocations = definition.get("allocations")
+    if allocations:
+        return _allocate(allocations, key, flag) or default
+    return default
+
+
+def load_definitions(path: str) -> dict:
+    """Parse a JSON or (with PyYAML installed) YAML definitions file."""
+    with open(path, encoding="utf-8") as handle:
+        text = handle.read()
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as exc:  # pragma: no cover — depends on the environment
+            raise RuntimeError("YAML flag files need PyYAML; use JSON") from exc
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping of flag definitions")
+    return data
+
+
+class FileFlagProvider(FlagProvider):
+    """Evaluates flags from a local file, re-reading it when it changes."""
+
+    def __init__(self, path: str, poll_seconds: float | None = None):
+        self.path = path
+        if poll_seconds is None:
+            poll_seconds = _env_number(POLL_SECONDS_ENV, DEFAULT_POLL_SECONDS)
+        self._poll = max(0.0, poll_seconds)
+        self._lock = threading.Lock()
+        self._definitions: dict = {}
+        self._mtime: float | None = None
+        self._next_check = 0.0
+        self.reloads = 0
+        self._maybe_reload(force=True)
+
+    def _maybe_reload(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        with self._lock:
+            if not force and now < self._next_check:
+                return
+            self._next_check = now + self._poll
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as exc:
+                if self._mtime is not None or force:
+                    # Once per outage; the last definitions keep serving.
+                    logger.warning("Flag file %s unreadable: %s", self.path, exc)
+                    self._mtime = None
+                return
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            try:
+                self._definitions = load_definitions(self.path)
+            except Exception as exc:
+                logger.error(
+                    "Keeping previous flags; %s is invalid: %s", self.path, exc
+                )
+                return
+            self.reloads += 1
+        logger.info("Loaded %d flags from %s", len(self._definitions), self.path)
+
+    def get_treatment(self, key, flag, attributes=None) -> str:
+        self._maybe_reload()
+        definition = self._definitions.get(flag)
+        if definition is None:
+            return CONTROL
+        return evaluate(definition, str(key), flag, attributes)
+
+    def get_treatments(
+        self, key, flags: Iterable[str], attributes=None
+    ) -> dict[str, str]:
+        self._maybe_reload()
+        return super().get_treatments(key, flags, attributes)
@@ -0,0 +1,297 @@
+"""Single-writer group commit for SQLite transfers.
+
+SQLite allows one writer at a time and every commit pays an fsync, so N
+concurrent transfers mean N lock hand-offs and N fsyncs. With
+``SQLITE_GROUP_COMMIT=on`` transfers are handed to one writer thread per
+database file instead. It drains whatever is queued (up to
+``SQLITE_GROUP_COMMIT_MAX_BATCH`` jobs, lingering at most
+``SQLITE_GROUP_COMMIT_MAX_WAIT_MS`` for stragglers) into one transaction,
+runs each job inside its own savepoint so a failing job only undoes itself,
+commits once, and then resolves every caller's future.
+
+Jobs are plain callables taking the writer's connection; they must not
+commit, roll back, or close it. A writer that is closed (or whose thread has
+died) fails new submissions at once, and callers wait at most
+``SQLITE_GROUP_COMMIT_TIMEOUT`` seconds, cancelling the job if the writer has
+not picked it up by then. A job already running may still commit, so its
+caller waits for the group's result instead of reporting a failure.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from db_pool import _env_number
+from prometheus_minimal import _fmt_labels
+
+logger = logging.getLogger(__name__)
+
+GROUP_COMMIT_ENV = "SQLITE_GROUP_COMMIT"
+MAX_BATCH_ENV = "SQLITE_GROUP_COMMIT_MAX_BATCH"
+MAX_WAIT_ENV = "SQLITE_GROUP_COMMIT_MAX_WAIT_MS"
+TIMEOUT_ENV = "SQLITE_GROUP_COMMIT_TIMEOUT"
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+DEFAULT_TIMEOUT = 30.0
+
+_ON_VALUES = frozenset({"on", "true", "1", "yes"})
+_STOP = object()
+
+
+def group_commit_enabled() -> bool:
+    return os.environ.get(GROUP_COMMIT_ENV, "off").strip().lower() in _ON_VALUES
+
+
+def result_timeout() -> float:
+    """Seconds a caller waits for its job's group to commit."""
+    return max(0.1, _env_number(TIMEOUT_ENV, DEFAULT_TIMEOUT))
+
+
+class WriterUnavailable(RuntimeError):
+    """The writer was closed, or its thread is no longer running."""
+
+
+class GroupCommitWriter:
+    """One writer thread and connection draining a job queue in groups."""
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Any],
+        *,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_wait: float = DEFAULT_MAX_WAIT_MS / 1000.0,
+    ):
+        self.name = name
+        self._connect = connect
+        self._max_batch = max(1, max_batch)
+        self._max_wait = max(0.0, max_wait)
+        self._queue: queue.Queue = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._conn = None
+        self._stats_lock = threading.Lock()
+        self._groups = 0
+        self._jobs = 0
+        self._failed_jobs = 0
+        self._failed_groups = 0
+        self._largest_group = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"group-commit-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, job: Callable[[Any], Any]) -> Future:
+        """Queue ``job(conn)``; the future resolves once its group has committed.
+
+        After :meth:`close`, or if the writer thread has died, the future
+        fails with :class:`WriterUnavailable` instead of never resolving.
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed or not self._thread.is_alive():
+                future.set_exception(WriterUnavailable(f"writer {self.name} is closed"))
+            else:
+                self._queue.put((job, future))
+        return future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued jobs, then stop the thread and close the connection."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self._thread.is_alive()
+
+    def _next_group(self) -> tuple[list, bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        group = [first]
+        deadline = time.monotonic() + self._max_wait
+        while len(group) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return group, True
+            group.append(item)
+        return group, False
+
+    def _run(self) -> None:
+        stopping = False
+        try:
+            while not stopping:
+                group, stopping = self._next_group()
+                if group:
+                    self._commit_group(group)
+        finally:
+            with self._submit_lock:
+                self._closed = True
+            self._fail_queued()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _fail_queued(self) -> None:
+        # Jobs still queued when the thread exits (it crashed) would never run.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(WriterUnavailable(f"writer {self.name} stopped"))
+
+    def _commit_group(self, group: list) -> None:
+        # Callers that gave up (Future.cancel) before pickup are skipped.
+        group = [item for item in group if item[1].set_running_or_notify_cancel()]
+        if not group:
+            return
+        outcomes = []
+        try:
+            if self._conn is None:
+                self._conn = self._connect()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            for job, _future in group:
+                conn.execute("SAVEPOINT group_item")
+                try:
+                    outcomes.append((True, job(conn)))
+                    conn.execute("RELEASE SAVEPOINT group_item")
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO SAVEPOINT group_item")
+                    conn.execute("RELEASE SAVEPOINT group_item")
+                    outcomes.append((False, exc))
+            conn.commit()
+        except Exception as exc:
+            logger.exception("group commit failed (%s jobs)", len(group))
+            self._discard_connection()
+            with self._stats_lock:
+                self._failed_groups += 1
+            outcomes = [(False, exc)] * len(group)
+
+        with self._stats_lock:
+            self._groups += 1
+            self._jobs += len(group)
+            self._failed_jobs += sum(1 for ok, _ in outcomes if not ok)
+            self._largest_group = max(self._largest_group, len(group))
+        # Only now, after the commit, do callers learn their result.
+        for (_job, future), (ok, value) in zip(group, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _discard_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.rollback()
+            conn.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "writer": self.name,
+                "queued": self._queue.qsize(),
+                "groups": self._groups,
+                "jobs": self._jobs,
+                "failed_jobs": self._failed_jobs,
+                "failed_groups": self._failed_groups,
+                "largest_group": self._largest_group,
+            }
+
+
+_writers: dict[tuple[str, str], GroupCommitWriter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_writer(
+    key: tuple[str, str], connect: Callable[[], Any], *, name: str
+) -> GroupCommitWriter:
+    """Return the process-wide writer for ``key``, starting it on first use."""
+    writer = _writers.get(key)
+    if writer is not None and writer.alive:
+        return writer
+    with _registry_lock:
+        writer = _writers.get(key)
+        if writer is None or not writer.alive:
+            writer = GroupCommitWriter(
+                name,
+                connect,
+                max_batch=int(_env_number(MAX_BATCH_ENV, DEFAULT_MAX_BATCH)),
+                max_wait=_env_number(MAX_WAIT_ENV, DEFAULT_MAX_WAIT_MS) / 1000.0,
+            )
+            _writers[key] = writer
+    return writer
+
+
+def close_all_writers() -> None:
+    with _registry_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def writer_stats() -> list[dict]:
+    return [writer.stats() for writer in list(_writers.values())]
+
+
+_METRICS = (
+    (
+        "sqlite_group_commit_groups_total",
+        "Transactions committed by the writer",
+        "groups",
+    ),
+    ("sqlite_group_commit_jobs_total", "Jobs run by the writer", "jobs"),
+    ("sqlite_group_commit_failed_jobs_total", "Jobs that raised", "failed_jobs"),
+)
+
+
+def format_writer_metrics() -> str:
+    """Prometheus text for every live writer (appended to /metrics)."""
+    snapshot = writer_stats()
+    if not snapshot:
+        return ""
+    lines: list[str] = []
+    for metric, doc, field in _METRICS:
+        lines.append(f"# HELP {metric} {doc}")
+        lines.append(f"# TYPE {metric} counter")
+        for stats in snapshot:
+            lab = _fmt_labels((("writer", stats["writer"]),))
+            lines.append(f"{metric}{{{lab}}} {stats[field]}")
+    return "\n".join(lines) + "\n"
+
+
+def _reset_writers_after_fork() -> None:
+    # The writer threads did not survive the fork; children start their own.
+    global _registry_lock
+    _writers.clear()
+    _registry_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_writers_after_fork)
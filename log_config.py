@@ -0,0 +1,258 @@
+"""Non-blocking, level-gated structured logging for the app.
+
+:func:`configure_logging` puts a :class:`logging.handlers.QueueHandler` on the
+root logger and starts a :class:`~logging.handlers.QueueListener` thread that
+does the actual writing, so a request thread's log call is a level check and
+a queue put, never stdout I/O. The queue is bounded (``LOG_QUEUE_SIZE``);
+when it is full, records are dropped and counted rather than blocking.
+
+Settings (all optional):
+
+* ``LOG_LEVEL`` — root level, default ``INFO``.
+* ``LOG_LEVELS`` — per-logger levels, e.g. ``api.home=DEBUG,db_flags=WARNING``.
+* ``LOG_SAMPLE`` — keep only a fraction of a logger's records below WARNING,
+  e.g. ``api.home=0.01``; warnings and errors are never sampled out.
+* ``LOG_FORMAT`` — ``json`` (one object per line, default) or ``text``.
+
+Fields passed with ``extra={...}`` become top-level keys of the JSON record.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+
+from db_pool import _env_number
+
+LEVEL_ENV = "LOG_LEVEL"
+LEVELS_ENV = "LOG_LEVELS"
+SAMPLE_ENV = "LOG_SAMPLE"
+FORMAT_ENV = "LOG_FORMAT"
+QUEUE_SIZE_ENV = "LOG_QUEUE_SIZE"
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+# Attributes every LogRecord has; anything else came from ``extra``.
+_RECORD_FIELDS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+}
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_listener: logging.handlers.QueueListener | None = None
+_handler: logging.handlers.QueueHandler | None = None
+_dropped = 0
+
+
+def _parse_level(raw: str) -> int | None:
+    """``DEBUG``/``debug``/``10`` -> 10; ``None`` for anything logging rejects."""
+    value = raw.strip().upper()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value)
+    return level if isinstance(level, int) else None
+
+
+def _parse_pairs(raw: str) -> dict[str, str]:
+    pairs = {}
+    for part in raw.split(","):
+        name, sep, value = part.partition("=")
+        if sep and name.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """``time level logger message key=value ...`` for local development."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = [
+            f"{key}={value}"
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_FIELDS and not key.startswith("_")
+        ]
+        return " ".join([line, *extras]) if extras else line
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps ``rate`` of a logger's (and its children's) records below WARNING."""
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        name = record.name
+        while name:
+            rate = self.rates.get(name)
+            if rate is not None:
+                return random.random() < rate
+            name = name.rpartition(".")[0]
+        return True
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to whatever ``sys.stderr`` is at emit time (tests swap it)."""
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now (the writer thread cannot
+        # see the caller's objects later), but keep them separate fields.
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with _lock:
+                _dropped += 1
+
+
+def configure_logging(stream=None) -> None:
+    """Install the queue handler and start the writer thread (idempotent).
+
+    An invalid ``LOG_LEVEL``, ``LOG_LEVELS`` entry or ``LOG_SAMPLE`` rate is
+    logged and ignored (the root level falls back to ``INFO``).
+    """
+    global _listener, _handler
+    ignored = []
+    with _lock:
+        if _listener is not None:
+            return
+        root = logging.getLogger()
+        raw_level = os.environ.get(LEVEL_ENV, "INFO")
+        level = _parse_level(raw_level)
+        if level is None:
+            ignored.append((LEVEL_ENV, raw_level))
+            level = logging.INFO
+        root.setLevel(level)
+        for name, raw in _parse_pairs(os.environ.get(LEVELS_ENV, "")).items():
+            level = _parse_level(raw)
+            if level is None:
+                ignored.append((LEVELS_ENV, f"{name}={raw}"))
+            else:
+                logging.getLogger(name).setLevel(level)
+
+        writer = logging.StreamHandler(stream) if stream else _StderrHandler()
+        if os.environ.get(FORMAT_ENV, "json").strip().lower() == "text":
+            writer.setFormatter(TextFormatter())
+        else:
+            writer.setFormatter(JsonFormatter())
+
+        size = max(1, int(_env_number(QUEUE_SIZE_ENV, DEFAULT_QUEUE_SIZE)))
+        _handler = _DroppingQueueHandler(queue.Queue(size))
+        rates = {}
+        for name, raw in _parse_pairs(os.environ.get(SAMPLE_ENV, "")).items():
+            try:
+                rates[name] = max(0.0, min(1.0, float(raw)))
+            except ValueError:
+                ignored.append((SAMPLE_ENV, f"{name}={raw}"))
+        _handler.addFilter(SamplingFilter(rates))
+        root.addHandler(_handler)
+        _listener = logging.handlers.QueueListener(
+            _handler.queue, writer, respect_handler_level=True
+        )
+        _listener.start()
+    # Outside the lock: a full queue takes it to count the drop.
+    for var_name, raw in ignored:
+        logger.warning("Ignoring invalid %s entry %r", var_name, raw)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener, _handler
+    with _lock:
+        listener, handler = _listener, _handler
+        _listener = _handler = None
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+
+
+def logging_stats() -> dict[str, int]:
+    with _lock:
+        return {"dropped": _dropped}
+
+
+def format_logging_metrics() -> str:
+    """Prometheus text for dropped log records (appended to /metrics)."""
+    dropped = logging_stats()["dropped"]
+    if not dropped:
+        return ""
+    metric = "log_records_dropped_total"
+    return (
+        f"# HELP {metric} Log records dropped because the log queue was full\n"
+        f"# TYPE {metric} counter\n"
+        f"{metric} {dropped}\n"
+    )
+
+
+def _restart_after_fork() -> None:
+    # The writer thread did not survive the fork; start a fresh one.
+    global _listener, _handler, _lock
+    _lock = threading.Lock()
+    if _handler is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener = _handler = None
+    configure_logging()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- Keyset pagination for transaction history (PostgreSQL).
+-- Matches ORDER BY created_at DESC, id DESC with an account_id prefix so every
+-- page of /transactions, /api/transactions and account detail is an index
+-- range scan regardless of how deep the cursor is.
+-- Built CONCURRENTLY so it can land on a live transactions table without
+-- blocking writes (hence no-transaction: CONCURRENTLY cannot run in one).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_account_created_id
+    ON transactions(account_id, created_at DESC, id DESC);
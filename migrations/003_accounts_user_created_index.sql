@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Accounts are listed per user ordered by created_at (AccountDAO.get_by_user);
+-- the composite serves both the filter and the sort. Mirrors the SQLite schema.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_accounts_user_created
+    ON accounts(user_id, created_at);
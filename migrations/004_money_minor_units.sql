@@ -0,0 +1,20 @@
+-- Store money as integer minor units (cents) instead of NUMERIC(19, 4).
+-- Amounts are scaled by the account currency's exponent (JPY/KRW have none).
+-- Rewrites both tables under an ACCESS EXCLUSIVE lock; run it in a quiet window.
+
+ALTER TABLE transactions ADD COLUMN amount_minor BIGINT;
+
+UPDATE transactions t
+SET amount_minor = round(t.amount * CASE WHEN a.currency IN ('JPY', 'KRW') THEN 1 ELSE 100 END)::bigint
+FROM accounts a
+WHERE a.id = t.account_id;
+
+ALTER TABLE transactions DROP COLUMN amount;
+ALTER TABLE transactions RENAME COLUMN amount_minor TO amount;
+ALTER TABLE transactions ALTER COLUMN amount SET NOT NULL;
+
+ALTER TABLE accounts
+    ALTER COLUMN balance DROP DEFAULT,
+    ALTER COLUMN balance TYPE BIGINT
+        USING round(balance * CASE WHEN currency IN ('JPY', 'KRW') THEN 1 ELSE 100 END)::bigint,
+    ALTER COLUMN balance SET DEFAULT 0;
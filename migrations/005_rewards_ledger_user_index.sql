@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- migrate: if-table-exists rewards_ledger
+-- The flag-gated rewards ledger is created outside the versioned set, and a
+-- ledger created by an older build may lack its user_id index. Nothing to do
+-- until the ledger exists; new ledgers are created with the index.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_rewards_ledger_user_id
+    ON rewards_ledger(user_id);
@@ -0,0 +1,50 @@
+-- QuantumBank initial schema (SQLite).
+-- Mirrors ../001_initial.sql; applied when the postgres_database flag is off.
+-- D12: synthetic demo data only — masked last4, no CVV or full PAN.
+
+CREATE TABLE IF NOT EXISTS users (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    username    TEXT UNIQUE NOT NULL,
+    email       TEXT UNIQUE NOT NULL,
+    full_name   TEXT NOT NULL,
+    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS accounts (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id         INTEGER NOT NULL,
+    account_type    TEXT NOT NULL,
+    account_number  TEXT UNIQUE NOT NULL,
+    balance         REAL NOT NULL DEFAULT 0.0,
+    currency        TEXT DEFAULT 'USD',
+    status          TEXT DEFAULT 'active',
+    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id                INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id        INTEGER NOT NULL,
+    transaction_type  TEXT NOT NULL,
+    amount            REAL NOT NULL,
+    description       TEXT,
+    recipient         TEXT,
+    status            TEXT DEFAULT 'completed',
+    created_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at DESC);
+
+CREATE TABLE IF NOT EXISTS cards (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id    INTEGER NOT NULL,
+    card_type     TEXT NOT NULL,
+    card_last4    TEXT NOT NULL,
+    expiry_date   TEXT NOT NULL,
+    status        TEXT DEFAULT 'active',
+    created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cards_account_id ON cards(account_id);
@@ -0,0 +1,5 @@
+-- Keyset pagination for transaction history (SQLite). Mirrors ../002.
+-- Also serves plain account_id lookups, so no single-column index is needed.
+
+CREATE INDEX IF NOT EXISTS idx_transactions_account_created_id
+    ON transactions(account_id, created_at DESC, id DESC);
@@ -0,0 +1,4 @@
+-- AccountDAO.get_by_user filters on user_id and sorts on created_at. Mirrors ../003.
+
+CREATE INDEX IF NOT EXISTS idx_accounts_user_created
+    ON accounts(user_id, created_at);
@@ -0,0 +1,54 @@
+-- Store money as integer minor units (cents). Mirrors ../004.
+-- SQLite cannot change a column's type in place, so accounts and transactions
+-- are rebuilt with INTEGER columns; amounts are scaled by the account
+-- currency's exponent (JPY/KRW have none) and rounded half away from zero.
+
+CREATE TABLE accounts_minor (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id         INTEGER NOT NULL,
+    account_type    TEXT NOT NULL,
+    account_number  TEXT UNIQUE NOT NULL,
+    balance         INTEGER NOT NULL DEFAULT 0,
+    currency        TEXT DEFAULT 'USD',
+    status          TEXT DEFAULT 'active',
+    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+INSERT INTO accounts_minor
+    (id, user_id, account_type, account_number, balance, currency, status, created_at)
+SELECT id, user_id, account_type, account_number,
+       CAST(ROUND(balance * CASE WHEN currency IN ('JPY', 'KRW') THEN 1 ELSE 100 END) AS INTEGER),
+       currency, status, created_at
+FROM accounts;
+
+CREATE TABLE transactions_minor (
+    id                INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id        INTEGER NOT NULL,
+    transaction_type  TEXT NOT NULL,
+    amount            INTEGER NOT NULL,
+    description       TEXT,
+    recipient         TEXT,
+    status            TEXT DEFAULT 'completed',
+    created_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+);
+
+INSERT INTO transactions_minor
+    (id, account_id, transaction_type, amount, description, recipient, status, created_at)
+SELECT t.id, t.account_id, t.transaction_type,
+       CAST(ROUND(t.amount * CASE WHEN a.currency IN ('JPY', 'KRW') THEN 1 ELSE 100 END) AS INTEGER),
+       t.description, t.recipient, t.status, t.created_at
+FROM transactions t
+LEFT JOIN accounts a ON a.id = t.account_id;
+
+DROP TABLE transactions;
+DROP TABLE accounts;
+ALTER TABLE accounts_minor RENAME TO accounts;
+ALTER TABLE transactions_minor RENAME TO transactions;
+
+CREATE INDEX IF NOT EXISTS idx_accounts_user_created
+    ON accounts(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_transactions_account_created_id
+    ON transactions(account_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at DESC);
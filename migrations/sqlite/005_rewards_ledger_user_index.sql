@@ -0,0 +1,7 @@
+-- migrate: if-table-exists rewards_ledger
+-- Ledgers created before the SQLite index parity change have no user_id
+-- index, and the ledger's create path returns early once the table exists.
+-- Mirrors ../005.
+
+CREATE INDEX IF NOT EXISTS idx_rewards_ledger_user_id
+    ON rewards_ledger(user_id);
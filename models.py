@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import concurrent.futures
+import json
 import logging
 import os
 import sqlite3
-import math
+import threading
 from decimal import Decimal
 
+import db_pool
+import db_retry
+import group_commit
+from dao.rows import Account, Card, Transaction, User, UserTransaction
+from dao.unit_of_work import pinned_backend
 from db_flags import (
+    cached_postgres_database_enabled,
     is_demo_force_rollout_migration_fail,
     is_demo_rollout_schema_enabled,
-    is_postgres_database_enabled,
+    refresh_postgres_database_flag,
 )
+from money import exponent, is_amount
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +41,45 @@ PROFILE_DEMO_ADDRESS = os.environ.get(
 )
 # TODO: migrate to an address column once a migration runner exists (plan-v1 §3 fork (b))
 
+# SQLite performance profile applied to every new connection: WAL so readers
+# never block the writer, NORMAL sync (durable at checkpoints under WAL), a
+# busy timeout instead of instant "database is locked", mmap'd reads and a
+# larger page cache. Each PRAGMA can be overridden through its env var.
+SQLITE_PRAGMA_DEFAULTS = {
+    "journal_mode": ("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": ("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": ("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "mmap_size": ("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "cache_size": ("SQLITE_CACHE_SIZE", "-20000"),
+    "temp_store": ("SQLITE_TEMP_STORE", "MEMORY"),
+}
+_SQLITE_PRAGMA_CHOICES = {
+    "journal_mode": frozenset({"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL"}),
+    "synchronous": frozenset({"OFF", "NORMAL", "FULL", "EXTRA"}),
+    "temp_store": frozenset({"DEFAULT", "FILE", "MEMORY"}),
+}
+
 _backend_logged = False
 _rewards_schema_state = "unknown"
+# Rewards ledger presence per database (see _backend_target), so the dashboard
+# and transfer paths skip the catalog probe once it is known.
+_rewards_table_cache: dict[tuple[str, str], bool] = {}
+# Backends ("sqlite"/"postgres") whose schema this process has initialized. A
+# worker the postgres_database flag moves to the other backend after boot runs
+# init_db() there before first use instead of querying an unmigrated schema.
+_initialized_backends: set[str] = set()
+_schema_pending: set[str] = set()
+_schema_lock = threading.RLock()  # re-entered by init_db()'s own get_db()
 
 
 def using_postgres() -> bool:
-    return is_postgres_database_enabled()
+    """Active backend: pinned per request, else the TTL-cached flag."""
+    return pinned_backend(cached_postgres_database_enabled)
+
+
+def refresh_backend() -> bool:
+    """Re-evaluate the postgres_database flag now (e.g. after a flag flip)."""
+    return refresh_postgres_database_flag()
 
 
 def db_path() -> str:
@@ -55,6 +99,7 @@ def _log_backend_once() -> None:
 
 
 def _sql(query: str) -> str:
+    """Ad-hoc placeholder rewrite; DAO queries are precompiled in dao.statements."""
     return query.replace("?", "%s") if using_postgres() else query
 
 
@@ -67,12 +112,14 @@ def _row_to_dict(row):
 
 
 def _normalize_row(row_dict):
+    # Money columns are integer minor units; Postgres still hands back SUM()
+    # of a BIGINT as NUMERIC, so integral Decimals become ints again.
     if not row_dict:
         return row_dict
     out = dict(row_dict)
     for key, value in out.items():
         if isinstance(value, Decimal):
-            out[key] = float(value)
+            out[key] = int(value) if value == value.to_integral_value() else float(value)
     return out
 
 
@@ -83,6 +130,39 @@ def _scalar_from_row(row) -> int:
     return int(next(iter(data.values())))
 
 
+class InvalidCursor(ValueError):
+    """A pagination cursor that was not produced by :func:`encode_cursor`."""
+
+
+def encode_cursor(row) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of ``row``."""
+    created_at = row["created_at"]
+    if not isinstance(created_at, str):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, row["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, int]:
+    """Inverse of :func:`encode_cursor`; raises InvalidCursor on tampering."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error) as exc:
+        raise InvalidCursor(token) from exc
+    if not isinstance(created_at, str) or type(row_id) is not int:
+        raise InvalidCursor(token)
+    return created_at, row_id
+
+
+def _keyset_page(rows: list, limit: int) -> tuple[list, str | None]:
+    # Callers fetch limit + 1 rows: the extra one only says another page exists.
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1])
+
+
 def _split_sql_statements(sql: str) -> list[str]:
     statements: list[str] = []
     current: list[str] = []
@@ -101,81 +181,109 @@ def _split_sql_statements(sql: str) -> list[str]:
     return statements
 
 
+def _connect_postgres(dsn: str):
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    conn = psycopg2.connect(dsn)
+    conn.cursor_factory = RealDictCursor
+    return conn
+
+
+def sqlite_pragmas() -> dict[str, str]:
+    """Resolved SQLite profile; invalid env overrides fall back to the default."""
+    resolved = {}
+    for pragma, (env_var, default) in SQLITE_PRAGMA_DEFAULTS.items():
+        value = os.environ.get(env_var, default).strip().upper()
+        choices = _SQLITE_PRAGMA_CHOICES.get(pragma)
+        valid = value in choices if choices else value.lstrip("-").isdigit()
+        if not valid:
+            logger.warning("Ignoring invalid %s=%r", env_var, value)
+            value = default
+        resolved[pragma] = value
+    return resolved
+
+
+def _connect_sqlite(path: str):
+    # Pooled connections hop between request threads (one holder at a time).
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for pragma, value in sqlite_pragmas().items():
+        # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
+        # PRAGMA names are fixed; values are validated against a whitelist/integer.
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    return conn
+
+
+def _begin_write(conn) -> None:
+    """Take the SQLite write lock up front for read-then-write paths.
+
+    A deferred transaction that reads and then writes must upgrade its lock,
+    which under WAL fails with SQLITE_BUSY without honoring busy_timeout when
+    another writer got there first. BEGIN IMMEDIATE queues on busy_timeout
+    instead. Postgres needs nothing here (psycopg2 begins implicitly).
+    """
+    if not using_postgres():
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def _backend_target() -> tuple[str, str]:
+    """("postgres", dsn) or ("sqlite", path) for the active backend."""
+    if using_postgres():
+        return "postgres", os.environ[DATABASE_URL_ENV]
+    return "sqlite", db_path()
+
+
 def get_db():
-    """Return a new DB connection (one per call — fine for demo; pool before sustained PG traffic)."""
+    """Check out a DB connection; ``close()`` hands it back to the pool.
+
+    Pools are per backend target (DSN or SQLite path) and sized via
+    ``DB_POOL_SIZE``; ``DB_POOL_SIZE=0`` falls back to one connection per call.
+    """
     _log_backend_once()
+    key = _backend_target()
+    _ensure_schema(key[0])
     if using_postgres():
-        import psycopg2
-        from psycopg2.extras import RealDictCursor
+        dsn = key[1]
+        name = "postgres"
 
-        conn = psycopg2.connect(os.environ[DATABASE_URL_ENV])
-        conn.cursor_factory = RealDictCursor
-        return conn
-    conn = sqlite3.connect(db_path())
-    conn.row_factory = sqlite3.Row
-    return conn
+        def connect():
+            return _connect_postgres(dsn)
 
+    else:
+        path = key[1]
+        name = f"sqlite:{os.path.basename(path)}"
 
-def _apply_postgres_schema(conn) -> None:
-    path = os.path.join(MIGRATIONS_DIR, "001_initial.sql")
-    with open(path, encoding="utf-8") as handle:
-        sql = handle.read()
-    cursor = conn.cursor()
-    for statement in _split_sql_statements(sql):
-        # nosemgrep: python.sqlalchemy.security.sqlalchemy-execute-raw-query.sqlalchemy-execute-raw-query
-        # Trusted local migration SQL only (versioned file in repo), not user input.
-        cursor.execute(statement)
-    conn.commit()
-
-
-def _create_sqlite_schema(cursor) -> None:
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            full_name TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS accounts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            account_type TEXT NOT NULL,
-            account_number TEXT UNIQUE NOT NULL,
-            balance REAL NOT NULL DEFAULT 0.0,
-            currency TEXT DEFAULT 'USD',
-            status TEXT DEFAULT 'active',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            transaction_type TEXT NOT NULL,
-            amount REAL NOT NULL,
-            description TEXT,
-            recipient TEXT,
-            status TEXT DEFAULT 'completed',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (account_id) REFERENCES accounts (id)
-        )
-        """)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS cards (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            account_id INTEGER NOT NULL,
-            card_type TEXT NOT NULL,
-            card_last4 TEXT NOT NULL,
-            expiry_date TEXT NOT NULL,
-            status TEXT DEFAULT 'active',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (account_id) REFERENCES accounts (id)
-        )
-        """)
+        def connect():
+            return _connect_sqlite(path)
+
+    if not db_pool.pooling_enabled():
+        return connect()
+    return db_pool.get_pool(key, connect, name=name).checkout()
+
+
+def _ensure_schema(backend: str) -> None:
+    if not _initialized_backends or backend in _initialized_backends:
+        return  # before boot's init_db(), or already initialized
+    with _schema_lock:
+        if backend in _initialized_backends or backend in _schema_pending:
+            return
+        logger.info("Database backend switched to %s; initializing it", backend)
+        _schema_pending.add(backend)
+        try:
+            init_db()
+        finally:
+            _schema_pending.discard(backend)
+
+
+def retry_stats() -> dict[str, dict[str, int]]:
+    """Lock-conflict retry counters for write transactions."""
+    return db_retry.retry_stats()
+
+
+def pool_stats() -> list[dict]:
+    """Size / in-use / wait counters for every live connection pool."""
+    return db_pool.pool_stats()
 
 
 def _rewards_ledger_table_exists(cursor) -> bool:
@@ -195,56 +303,25 @@ def ensure_rewards_ledger_schema(
 
     Returns a small status string for UX/demo messaging.
     """
-    if not is_demo_rollout_schema_enabled():
-        return "skipped_schema_off"
-
-    if is_demo_force_rollout_migration_fail():
-        raise RuntimeError("intentional demo migration failure")
-
-    cursor = cursor or conn.cursor()
-    if _rewards_ledger_table_exists(cursor):
-        return "exists"
-
-    if using_postgres():
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rewards_ledger (
-                id                  SERIAL PRIMARY KEY,
-                user_id             INTEGER NOT NULL REFERENCES users(id),
-                source_account_id  INTEGER NOT NULL REFERENCES accounts(id),
-                target_account_id  INTEGER NOT NULL REFERENCES accounts(id),
-                points              INTEGER NOT NULL,
-                created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            );
-            """)
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_rewards_ledger_user_id
-            ON rewards_ledger(user_id);
-            """)
-    else:
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS rewards_ledger (
-                id                 INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id            INTEGER NOT NULL,
-                source_account_id INTEGER NOT NULL,
-                target_account_id INTEGER NOT NULL,
-                points             INTEGER NOT NULL,
-                created_at         TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
+    from dao.schema_dao import SchemaDAO
 
-    if commit:
-        conn.commit()
-    return "applied"
+    return SchemaDAO().ensure_rewards_ledger_schema(conn, cursor, commit=commit)
 
 
-def _compute_reward_points(transfer_amount: float) -> int:
-    # Demo logic: 1 point per $10 transferred (floored). Kept intentionally simple.
-    # Example: $10.00 => 1 point, $19.99 => 1 point, $9.99 => 0 points.
-    return max(0, int(transfer_amount // (10.0 / REWARDS_POINTS_PER_10_DOLLARS)))
+def _compute_reward_points(transfer_amount: int, currency: str | None = None) -> int:
+    # Demo logic: 1 point per 10 major units transferred (floored). Kept
+    # intentionally simple. Amounts are minor units of the source account's
+    # currency. Example (USD): 1000 => 1 point, 1999 => 1 point, 999 => 0 points.
+    per_point = 10 * 10 ** exponent(currency) // REWARDS_POINTS_PER_10_DOLLARS
+    return max(0, transfer_amount // per_point)
 
 
 def _resolve_rewards_schema_state(cursor=None) -> str:
-    """Resolve rollout schema state from live flags + table presence."""
+    """Resolve rollout schema state from live flags + table presence.
+
+    Table presence comes from a process-level cache filled at init_db(); only
+    a cold or invalidated cache probes the catalog.
+    """
     global _rewards_schema_state
 
     if is_demo_force_rollout_migration_fail():
@@ -255,6 +332,21 @@ def _resolve_rewards_schema_state(cursor=None) -> str:
         _rewards_schema_state = "skipped"
         return _rewards_schema_state
 
+    key = _backend_target()
+    present = _rewards_table_cache.get(key)
+    if present is None:
+        try:
+            present = _probe_rewards_ledger(cursor)
+        except Exception:
+            _rewards_schema_state = "runtime_error"
+            return _rewards_schema_state
+        _rewards_table_cache[key] = present
+
+    _rewards_schema_state = "ready" if present else "skipped"
+    return _rewards_schema_state
+
+
+def _probe_rewards_ledger(cursor=None) -> bool:
     from dao.helper_dao import HelperDAO
 
     own_conn = None
@@ -262,18 +354,34 @@ def _resolve_rewards_schema_state(cursor=None) -> str:
         own_conn = get_db()
         cursor = own_conn.cursor()
     try:
-        _rewards_schema_state = (
-            "ready" if HelperDAO().rewards_ledger_table_exists(cursor) else "skipped"
-        )
-        return _rewards_schema_state
-    except Exception:
-        _rewards_schema_state = "runtime_error"
-        return _rewards_schema_state
+        return HelperDAO().rewards_ledger_table_exists(cursor)
     finally:
         if own_conn is not None:
             own_conn.close()
 
 
+def _set_rewards_schema_cache(present: bool | None) -> None:
+    """Record (or, with None, forget) ledger presence for the active database.
+
+    Forgetting is how DDL errors on the rewards tables are handled: the next
+    caller re-probes instead of trusting a state the error just disproved.
+    """
+    key = _backend_target()
+    if present is None:
+        _rewards_table_cache.pop(key, None)
+    else:
+        _rewards_table_cache[key] = present
+
+
+def refresh_rewards_schema_state() -> str:
+    """Drop every cached ledger-presence entry and resolve the state again.
+
+    For out-of-band schema changes (e.g. the ledger dropped by an operator).
+    """
+    _rewards_table_cache.clear()
+    return _resolve_rewards_schema_state()
+
+
 def try_insert_rewards_points(
     *,
     conn,
@@ -281,7 +389,8 @@ def try_insert_rewards_points(
     user_id: int,
     source_account_id: int,
     target_account_id: int,
-    transfer_amount: float,
+    transfer_amount: int,
+    currency: str | None = None,
 ) -> bool:
     """Attempt to insert rewards points; never fail the core transfer (wrapper, injectable seam)."""
     from dao.write_dao import WriteDAO
@@ -293,6 +402,7 @@ def try_insert_rewards_points(
         source_account_id=source_account_id,
         target_account_id=target_account_id,
         transfer_amount=transfer_amount,
+        currency=currency,
     )
 
 
@@ -305,6 +415,93 @@ def get_rewards_points_for_user(
     return TransactionDAO().get_rewards_for_user(user_id)
 
 
+def rebuild_rewards_balances() -> int:
+    """Recompute rewards_balance from rewards_ledger; returns summary rows written."""
+    from dao.rewards_dao import RewardsDAO
+
+    return RewardsDAO().rebuild()
+
+
+def load_synthetic_data(
+    *,
+    seed: int,
+    users: int,
+    accounts: int,
+    transactions: int,
+    rewards: int,
+    chunk_size: int = 10_000,
+    progress=None,
+) -> dict[str, int]:
+    """Generate and bulk load a deterministic synthetic data set.
+
+    New ids start after the current maxima, so it can run against a seeded
+    database. Rewards rows are skipped (reported as 0) when the ledger table
+    does not exist. ``progress(table, rows, seconds)`` is called per table.
+    """
+    import time
+
+    from dao.bulk_load_dao import BulkLoadDAO
+    from dao.helper_dao import HelperDAO
+    from dao.rewards_dao import RewardsDAO
+    from synthetic_data import (
+        ACCOUNT_COLUMNS,
+        REWARDS_COLUMNS,
+        TRANSACTION_COLUMNS,
+        USER_COLUMNS,
+        StartIds,
+        SyntheticData,
+    )
+
+    dao = BulkLoadDAO()
+    conn = get_db()
+    try:
+        data = SyntheticData(
+            seed=seed,
+            users=users,
+            accounts=accounts,
+            transactions=transactions,
+            rewards=rewards,
+            start=StartIds(*dao.next_ids(conn)),
+            chunk_size=chunk_size,
+        )
+        with_rewards = rewards > 0 and HelperDAO.rewards_ledger_table_exists(
+            conn.cursor()
+        )
+        conn.rollback()
+        phases = [
+            ("users", USER_COLUMNS, data.user_chunks),
+            ("accounts", ACCOUNT_COLUMNS, data.account_chunks),
+            ("transactions", TRANSACTION_COLUMNS, data.transaction_chunks),
+        ]
+        if with_rewards:
+            phases.append(("rewards_ledger", REWARDS_COLUMNS, data.rewards_chunks))
+
+        written = {"users": 0, "accounts": 0, "transactions": 0, "rewards_ledger": 0}
+        for table, columns, chunks in phases:
+            started = time.perf_counter()
+            written[table] = dao.load(conn, table, columns, chunks())
+            if progress is not None:
+                progress(table, written[table], time.perf_counter() - started)
+        dao.sync_sequences(conn)
+        if with_rewards:
+            _begin_write(conn)
+            RewardsDAO.rebuild_balances(conn.cursor())
+            conn.commit()
+        return written
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def verify_rewards_balances() -> list[dict]:
+    """Users whose rewards_balance row disagrees with the ledger (empty when in sync)."""
+    from dao.rewards_dao import RewardsDAO
+
+    return RewardsDAO().verify()
+
+
 def _insert_returning_id(cursor, sql, params):
     if using_postgres():
         # nosemgrep: python.lang.security.audit.formatted-sql-query.formatted-sql-query
@@ -323,7 +520,9 @@ def init_db():
     """Initialize the database with tables and sample data."""
     from dao.schema_dao import SchemaDAO
 
+    backend = _backend_target()[0]
     SchemaDAO().init()
+    _initialized_backends.add(backend)
 
 
 def create_sample_data(conn):
@@ -333,7 +532,7 @@ def create_sample_data(conn):
     SchemaDAO().seed(conn)
 
 
-def get_user_by_username(username: str) -> dict | None:
+def get_user_by_username(username: str) -> User | None:
     """Get user by username."""
     from dao.user_dao import UserDAO
 
@@ -347,35 +546,75 @@ def get_user_profile(user_id: int) -> dict | None:
     return UserDAO().get_profile(user_id)
 
 
-def get_accounts_by_user(user_id: int) -> list[dict]:
+def get_accounts_by_user(user_id: int) -> list[Account]:
     """Get all accounts for a user."""
     from dao.account_dao import AccountDAO
 
     return AccountDAO().get_by_user(user_id)
 
 
-def get_account_by_id(account_id: int) -> dict | None:
+def get_account_by_id(account_id: int) -> Account | None:
     """Get account by ID."""
     from dao.account_dao import AccountDAO
 
     return AccountDAO().get_by_id(account_id)
 
 
-def get_transactions_by_account(account_id: int, limit: int = 10) -> list[dict]:
+def get_transactions_by_account(
+    account_id: int, limit: int = 10
+) -> list[Transaction]:
     """Get transactions for an account."""
     from dao.transaction_dao import TransactionDAO
 
     return TransactionDAO().get_by_account(account_id, limit)
 
 
-def get_all_transactions_by_user(user_id: int, limit: int = 20) -> list[dict]:
+def get_all_transactions_by_user(
+    user_id: int, limit: int = 20
+) -> list[UserTransaction]:
     """Get all transactions for a user across all accounts."""
     from dao.transaction_dao import TransactionDAO
 
     return TransactionDAO().get_by_user(user_id, limit)
 
 
-def get_cards_by_account(account_id: int) -> list[dict]:
+def get_transactions_page_by_account(
+    account_id: int, limit: int = 20, cursor: str | None = None
+) -> tuple[list[Transaction], str | None]:
+    """One keyset page of an account's transactions and the next page's cursor."""
+    from dao.transaction_dao import TransactionDAO
+
+    before = decode_cursor(cursor) if cursor else None
+    rows = TransactionDAO().get_by_account(account_id, limit + 1, before=before)
+    return _keyset_page(rows, limit)
+
+
+def get_transactions_page_by_user(
+    user_id: int, limit: int = 50, cursor: str | None = None
+) -> tuple[list[UserTransaction], str | None]:
+    """One keyset page of a user's transactions and the next page's cursor."""
+    from dao.transaction_dao import TransactionDAO
+
+    before = decode_cursor(cursor) if cursor else None
+    rows = TransactionDAO().get_by_user(user_id, limit + 1, before=before)
+    return _keyset_page(rows, limit)
+
+
+def export_transactions_by_user(user_id: int, chunk_size: int = 1000):
+    """Chunks of a user's full transaction history for streaming export."""
+    from dao.transaction_dao import TransactionDAO
+
+    return TransactionDAO().export_by_user(user_id, chunk_size)
+
+
+def get_dashboard(user_id: int, limit: int = 5):
+    """Dashboard view model (accounts, recent activity, totals, rewards) in one read."""
+    from dao.dashboard_dao import DashboardDAO
+
+    return DashboardDAO().load(user_id, limit)
+
+
+def get_cards_by_account(account_id: int) -> list[Card]:
     """Get cards for an account."""
     from dao.account_dao import AccountDAO
 
@@ -385,15 +624,19 @@ def get_cards_by_account(account_id: int) -> list[dict]:
 def create_transaction(
     account_id: int,
     transaction_type: str,
-    amount: float,
+    amount: int,
     description: str,
     recipient: str = "",
 ) -> int:
-    """Create a new transaction (wrapper owns connection lifecycle)."""
+    """Create a new transaction of ``amount`` minor units (wrapper owns connection lifecycle)."""
+    from dao.unit_of_work import release_request_connection
     from dao.write_dao import WriteDAO
 
-    conn = get_db()
+    release_request_connection()
+    conn = None
     try:
+        conn = get_db()
+        _begin_write(conn)
         transaction_id = WriteDAO().create_transaction_internal(
             conn,
             account_id,
@@ -405,28 +648,43 @@ def create_transaction(
         conn.commit()
         return transaction_id
     except Exception:
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
         raise
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
 
 
 def transfer_money(
     from_account_id: int,
     to_account_id: int,
-    amount: float,
+    amount: int,
     description: str = "Transfer",
     acting_user_id: int | None = None,
 ) -> tuple[bool, str]:
-    """Transfer money between accounts (wrapper owns connection lifecycle)."""
+    """Transfer ``amount`` between accounts (wrapper owns connection lifecycle).
+
+    ``amount`` is integer minor units (cents), or a Decimal in major units of
+    the source account's currency (``money.parse_major``), which the DAO
+    converts once it has read the account.
+    """
+    from dao.unit_of_work import release_request_connection
     from dao.write_dao import WriteDAO
 
-    if amount <= 0 or not math.isfinite(amount):
+    if not is_amount(amount):
         return False, "Invalid amount"
 
-    conn = get_db()
+    release_request_connection()
+    if group_commit.group_commit_enabled() and not using_postgres():
+        return _transfer_via_group_commit(
+            from_account_id, to_account_id, amount, description, acting_user_id
+        )
 
-    try:
+    conn = None
+
+    def attempt() -> tuple[bool, str]:
+        _begin_write(conn)
         ok, message = WriteDAO().transfer_internal(
             conn,
             from_account_id,
@@ -444,11 +702,103 @@ def transfer_money(
             conn.rollback()
         return ok, message
 
-    except (
-        Exception
-    ):  # pragma: no cover — defensive; hard to trigger without DB corruption
+    try:
+        conn = get_db()  # inside the try: a PoolTimeout is a failed transfer
+        return db_retry.call_with_retry("transfer", conn, attempt)
+
+    except Exception:
         logger.exception("transfer_money failed")
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
         return False, "Transfer failed"
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+
+def _transfer_via_group_commit(
+    from_account_id, to_account_id, amount, description, acting_user_id
+) -> tuple[bool, str]:
+    """Run the transfer on the SQLite writer thread; wait for its group commit."""
+    from dao.unit_of_work import thread_backend
+    from dao.write_dao import WriteDAO
+
+    path = db_path()
+    writer = group_commit.get_writer(
+        ("sqlite", path),
+        lambda: _connect_sqlite(path),
+        name=f"sqlite:{os.path.basename(path)}",
+    )
+
+    def job(conn):
+        # The writer runs outside any request, where using_postgres() would
+        # follow the live flag; its connection is SQLite whatever the flag says.
+        with thread_backend(postgres=False):
+            return WriteDAO().transfer_internal(
+                conn,
+                from_account_id,
+                to_account_id,
+                amount,
+                description,
+                acting_user_id,
+            )
+
+    future = writer.submit(job)
+    try:
+        try:
+            return future.result(timeout=group_commit.result_timeout())
+        except concurrent.futures.TimeoutError:
+            if future.cancel():
+                logger.error(
+                    "transfer_money timed out waiting for the group-commit writer"
+                )
+                return False, "Transfer failed"
+            # Already running in a group that may still commit: reporting a
+            # failure now could make a retrying client move the money twice.
+            logger.warning("transfer_money is slow to commit; waiting for its group")
+            return future.result()
+    except Exception:
+        logger.exception("transfer_money failed")
+        return False, "Transfer failed"
+
+
+def transfer_many(
+    transfers: list[dict],
+    acting_user_id: int | None = None,
+) -> list[tuple[bool, str]]:
+    """Apply many transfers in one transaction (wrapper owns connection lifecycle).
+
+    Returns one ``(ok, message)`` per item, in order. Rejected items write
+    nothing; accepted ones commit together with a single commit. If the batch
+    itself fails every item reports ``"Transfer failed"``.
+    """
+    from dao.unit_of_work import release_request_connection
+    from dao.write_dao import WriteDAO
+
+    if not transfers:
+        return []
+
+    release_request_connection()
+    conn = None
+
+    def attempt() -> list[tuple[bool, str]]:
+        _begin_write(conn)
+        results = WriteDAO().transfer_many_internal(conn, transfers, acting_user_id)
+        if any(ok for ok, _ in results):
+            conn.commit()
+        else:
+            conn.rollback()
+        return results
+
+    try:
+        conn = get_db()
+        return db_retry.call_with_retry("transfer_many", conn, attempt)
+
+    except Exception:
+        logger.exception("transfer_many failed")
+        if conn is not None:
+            conn.rollback()
+        return [(False, "Transfer failed")] * len(transfers)
+    finally:
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,111 @@
+"""Money as integer minor units (cents), converted only at the edges.
+
+Balances and amounts are stored, summed and compared as integers in the
+currency's minor unit (``accounts.balance = 542050`` is $5,420.50). Input is
+parsed straight from text with :class:`~decimal.Decimal` (never ``float``),
+and output is formatted by the ``currency`` Jinja filter or converted to
+major units by :func:`json_money` when an API response is built.
+"""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+DEFAULT_CURRENCY = "USD"
+
+# ISO 4217 minor-unit exponents that differ from the default of 2. Keep in
+# step with the CASE in migrations/*/004_money_minor_units.sql.
+_EXPONENTS = {"JPY": 0, "KRW": 0}
+
+MONEY_FIELDS = ("balance", "amount")
+
+# Money columns are BIGINT on Postgres.
+MAX_MINOR = 2**63 - 1
+
+
+def exponent(currency: str | None = None) -> int:
+    """Minor-unit exponent for ``currency`` (2 unless ISO 4217 says otherwise)."""
+    return _EXPONENTS.get((currency or DEFAULT_CURRENCY).upper(), 2)
+
+
+def is_minor_amount(value) -> bool:
+    """True for a positive integer minor-unit amount (``bool`` excluded)."""
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def is_amount(value) -> bool:
+    """A transfer amount: integer minor units, or a positive finite
+    :class:`~decimal.Decimal` in major units (see :func:`parse_major`)."""
+    if isinstance(value, Decimal):
+        return value.is_finite() and value > 0
+    return is_minor_amount(value)
+
+
+def parse_major(value) -> Decimal:
+    """Positive major-unit amount from form/JSON input; ValueError otherwise.
+
+    Handlers parse with this and leave the minor-unit conversion to the DAO,
+    which knows the source account's currency once it has locked the row.
+    """
+    try:
+        major = Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"not an amount: {value!r}") from None
+    if not major.is_finite() or major <= 0:
+        raise ValueError(f"not an amount: {value!r}")
+    return major
+
+
+def to_minor(amount, currency: str | None = None) -> int:
+    """Minor units of ``amount`` in ``currency``; ValueError if out of range.
+
+    Integers are already minor units and pass through. A Decimal is rounded
+    half-up to the currency's minor unit; anything that rounds to zero (or
+    below), or past BIGINT, is rejected.
+    """
+    if is_minor_amount(amount):
+        minor = amount
+    elif isinstance(amount, Decimal) and amount.is_finite():
+        minor = int(amount.scaleb(exponent(currency)).to_integral_value(ROUND_HALF_UP))
+    else:
+        raise ValueError(f"not an amount: {amount!r}")
+    if not 0 < minor <= MAX_MINOR:
+        raise ValueError(f"amount out of range: {amount!r}")
+    return minor
+
+
+def parse_amount(value, currency: str | None = None) -> int:
+    """Positive amount from form/JSON input, in minor units; ValueError otherwise.
+
+    Rounds half-up to the currency's minor unit; anything that rounds to zero
+    (or below), or past BIGINT, is rejected along with NaN/Infinity and
+    non-numbers.
+    """
+    return to_minor(parse_major(value), currency)
+
+
+def to_major(minor: int, currency: str | None = None) -> Decimal:
+    """Exact major-unit value of ``minor`` (e.g. ``542050`` -> ``5420.50``)."""
+    exp = exponent(currency)
+    return Decimal(int(minor)).scaleb(-exp).quantize(Decimal(1).scaleb(-exp))
+
+
+def format_minor(minor: int, currency: str | None = None) -> str:
+    """``1,234.56``-style text for a minor-unit value (the Jinja ``currency`` filter)."""
+    exp = exponent(currency)
+    return f"{to_major(minor, currency):,.{exp}f}"
+
+
+def json_money(row: dict | None, currency: str | None = None) -> dict | None:
+    """Copy of ``row`` with money fields as major-unit JSON numbers.
+
+    Uses the row's own ``currency`` column when it has one.
+    """
+    if row is None:
+        return None
+    out = dict(row)
+    code = out.get("currency") or currency
+    for field in MONEY_FIELDS:
+        if isinstance(out.get(field), int):
+            out[field] = float(to_major(out[field], code))
+    return out
@@ -1,60 +1,190 @@
 """
 Split.io configuration and client initialization
+
+With FLAG_FILE set, flags come from that local file instead of Split.io
+(see flag_provider.py); nothing else changes for callers.
+
+init_split() does not wait for the SDK: it builds the factory and returns,
+and a background thread waits for readiness. Until then evaluations answer
+"control", so callers fall back to their env/default treatments. The state
+(split_status()) is reported by /health and as split_* gauges on /metrics.
+SPLIT_BLOCK_UNTIL_READY=on restores the old blocking start.
+
+The splitio package is imported only when a factory is actually built, so
+workers without a key (or using FLAG_FILE) skip its import cost at boot.
 """
 
-from splitio import get_factory
-from splitio.exceptions import TimeoutException
+from db_pool import _env_number
+from flag_provider import FLAG_FILE_ENV, FileFlagProvider
+from prometheus_minimal import _fmt_labels
 import os
+import threading
+import time
 
 # Split.io API key - loaded from environment variable
 # Make sure to set SPLIT_API_KEY in your .env file
 SPLIT_API_KEY = os.environ.get("SPLIT_API_KEY")
 
-if not SPLIT_API_KEY:
+if not SPLIT_API_KEY and not os.environ.get(FLAG_FILE_ENV):
     print("⚠ WARNING: SPLIT_API_KEY not found in environment variables!")
     print("   Please set it in your .env file or environment")
 
+READY_TIMEOUT_ENV = "SPLIT_READY_TIMEOUT"
+BLOCK_ENV = "SPLIT_BLOCK_UNTIL_READY"
+DEFAULT_READY_TIMEOUT = 5.0
+_ON_VALUES = frozenset({"on", "true", "1", "yes"})
+
+# States: not_started -> initializing -> ready, or timed_out (still waiting)
+# -> ready; "disabled" (no key) and "failed" last until destroy_split().
+
 # Initialize Split.io factory
 split_factory = None
 split_client = None
 
+_status_lock = threading.Lock()
+_state = "not_started"
+_time_to_ready: float | None = None
 
-def init_split():
-    """Initialize Split.io client"""
-    global split_factory, split_client
+
+def _set_state(state, time_to_ready=None, factory=None):
+    """Record ``state``; with ``factory``, only while it is still the current
+    one (a waiter of a destroyed or replaced factory must not overwrite the
+    state of its successor). Returns whether the state was recorded."""
+    global _state, _time_to_ready
+    with _status_lock:
+        if factory is not None and split_factory is not factory:
+            return False
+        _state = state
+        if time_to_ready is not None:
+            _time_to_ready = time_to_ready
+    return True
+
+
+def _get_factory(api_key, config):
+    from splitio import get_factory
+
+    return get_factory(api_key, config=config)
+
+
+def _wait_until_ready(factory, started, timeout, first_wait_done):
+    """Background: wait for the SDK, re-arming after each timeout until ready
+    or until the factory is replaced/destroyed."""
+    from splitio.exceptions import TimeoutException
+
+    try:
+        while split_factory is factory:
+            try:
+                factory.block_until_ready(timeout)
+            except TimeoutException:
+                if _state == "initializing" and _set_state("timed_out", None, factory):
+                    print(
+                        f"⚠ Split.io not ready after {timeout:g}s, serving default"
+                        " treatments until it is"
+                    )
+                first_wait_done.set()
+                continue
+            except Exception as e:
+                if _set_state("failed", None, factory):
+                    print(f"✗ Split.io readiness check failed: {e}")
+                return
+            elapsed = time.monotonic() - started
+            if _set_state("ready", elapsed, factory):
+                print(f"✓ Split.io client ready in {elapsed:.2f}s")
+            return
+    finally:
+        first_wait_done.set()
+
+
+def init_split(block=None):
+    """Initialize Split.io client (or the local file provider) without waiting
+    for it to become ready, unless ``block`` (or SPLIT_BLOCK_UNTIL_READY)."""
+    global split_factory, split_client, _time_to_ready
+
+    if block is None:
+        block = os.environ.get(BLOCK_ENV, "off").strip().lower() in _ON_VALUES
+    if split_client is not None:
+        destroy_split()  # re-init: never leave the previous factory running
+    started = time.monotonic()
+    with _status_lock:
+        _time_to_ready = None
+
+    flag_file = os.environ.get(FLAG_FILE_ENV)
+    if flag_file:
+        split_client = FileFlagProvider(flag_file)
+        _set_state("ready", time.monotonic() - started)
+        print(f"✓ Feature flags served from {flag_file} (Split.io not used)")
+        return split_client
+
+    if not SPLIT_API_KEY:
+        split_client = None
+        _set_state("disabled")
+        return None
 
     try:
         # Create factory with API key and config
         config = {"impressionsMode": "optimized"}
-        split_factory = get_factory(SPLIT_API_KEY, config=config)
+        split_factory = _get_factory(SPLIT_API_KEY, config)
 
         # Get client instance
         split_client = split_factory.client()
-
-        # Wait for SDK to be ready (with timeout)
-        try:
-            split_factory.block_until_ready(5)  # 5 second timeout
-            print("✓ Split.io client initialized successfully")
-        except TimeoutException:
-            print(
-                "⚠ Split.io client initialization timed out, using default treatments"
-            )
-
     except Exception as e:
         print(f"✗ Failed to initialize Split.io: {e}")
         split_client = None
+        _set_state("failed")
+        return None
 
+    _set_state("initializing")
+    timeout = max(0.1, _env_number(READY_TIMEOUT_ENV, DEFAULT_READY_TIMEOUT))
+    first_wait_done = threading.Event()
+    threading.Thread(
+        target=_wait_until_ready,
+        args=(split_factory, started, timeout, first_wait_done),
+        name="split-ready",
+        daemon=True,
+    ).start()
+    if block:
+        first_wait_done.wait()
     return split_client
 
 
 def get_split_client():
     """Get the Split.io client instance"""
-    global split_client
-    if split_client is None:
+    if split_client is None and _state == "not_started":
         init_split()
     return split_client
 
 
+def split_status():
+    """``{"state", "ready", "time_to_ready_seconds"}`` for /health."""
+    with _status_lock:
+        state, time_to_ready = _state, _time_to_ready
+    return {
+        "state": state,
+        "ready": state == "ready",
+        "time_to_ready_seconds": (
+            round(time_to_ready, 4) if time_to_ready is not None else None
+        ),
+    }
+
+
+def format_split_metrics():
+    """Prometheus text for flag-provider readiness (appended to /metrics)."""
+    status = split_status()
+    lines = [
+        "# HELP split_ready Whether the flag provider is ready (by state)",
+        "# TYPE split_ready gauge",
+        f"split_ready{{{_fmt_labels((('state', status['state']),))}}}"
+        f" {int(status['ready'])}",
+    ]
+    if status["time_to_ready_seconds"] is not None:
+        lines += [
+            "# HELP split_time_to_ready_seconds Seconds from init_split() to ready",
+            "# TYPE split_time_to_ready_seconds gauge",
+            f"split_time_to_ready_seconds {status['time_to_ready_seconds']}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
 def destroy_split():
     """Clean up Split.io client"""
     global split_factory, split_client
@@ -63,3 +193,4 @@ def destroy_split():
         split_client = None
     if split_factory:
         split_factory = None
+    _set_state("not_started")
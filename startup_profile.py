@@ -0,0 +1,101 @@
+"""Per-phase timings for a worker's boot (importing ``app``).
+
+app.py calls :func:`mark` after each boot phase (dotenv, imports, flag init,
+DB init, ...); each mark records the wall time and the number of modules
+imported since the previous one. Recording is two counters per phase, so it is
+always on: /metrics exports the phases as ``app_startup_phase_seconds``.
+
+``STARTUP_PROFILE=on`` also prints the report when boot finishes, and
+``STARTUP_PROFILE=<file>.json`` writes it there too. In profile mode
+:func:`finish` additionally compiles every template (the ``templates`` phase),
+which is otherwise paid lazily by the first request that renders each one.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+PROFILE_ENV = "STARTUP_PROFILE"
+
+_ON_VALUES = frozenset({"on", "true", "1", "yes"})
+
+_started = time.perf_counter()
+_last = (_started, len(sys.modules))
+_phases: list[dict] = []
+
+
+def mark(name: str) -> None:
+    """Close the phase that ran since the previous mark (or module import)."""
+    global _last
+    now, modules = time.perf_counter(), len(sys.modules)
+    _phases.append(
+        {
+            "phase": name,
+            "seconds": round(now - _last[0], 6),
+            "modules_imported": modules - _last[1],
+        }
+    )
+    _last = (now, modules)
+
+
+def startup_report() -> dict:
+    return {
+        "total_seconds": round(sum(p["seconds"] for p in _phases), 6),
+        "phases": list(_phases),
+    }
+
+
+def _profile_target() -> str | None:
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if value.lower() in _ON_VALUES:
+        return "stdout"
+    if value.lower().endswith(".json"):
+        return value
+    return None
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Startup: {report['total_seconds'] * 1000:.1f} ms"]
+    for p in report["phases"]:
+        lines.append(
+            f"  {p['phase']:<12} {p['seconds'] * 1000:>9.1f} ms"
+            f"  ({p['modules_imported']} modules)"
+        )
+    return "\n".join(lines)
+
+
+def finish(app=None) -> dict | None:
+    """End of boot: in profile mode, time template compilation and emit the report."""
+    target = _profile_target()
+    if target is None:
+        return None
+    if app is not None:
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+        mark("templates")
+    report = startup_report()
+    print(format_report(report))
+    if target != "stdout":
+        with open(target, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return report
+
+
+def format_startup_metrics() -> str:
+    """Prometheus text for the boot phases (appended to /metrics)."""
+    from prometheus_minimal import _fmt_labels
+
+    if not _phases:
+        return ""
+    metric = "app_startup_phase_seconds"
+    lines = [
+        f"# HELP {metric} Wall time of each boot phase of this worker",
+        f"# TYPE {metric} gauge",
+    ]
+    for p in _phases:
+        lab = _fmt_labels((("phase", p["phase"]),))
+        lines.append(f"{metric}{{{lab}}} {p['seconds']}")
+    return "\n".join(lines) + "\n"
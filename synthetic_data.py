@@ -0,0 +1,245 @@
+"""Deterministic synthetic banking data for load testing.
+
+:class:`SyntheticData` turns a seed and target row counts into chunks of
+insert-ready tuples for users, accounts, transactions and rewards_ledger.
+Rows are produced lazily, ``chunk_size`` at a time, so only per-account
+bookkeeping (owner id and a sampling weight) is held in memory however many
+transactions are generated. The same seed, counts and starting ids always
+yield the same rows.
+
+Distributions are rough but shaped like real usage: every user gets a
+checking account and some get savings/credit; account activity is
+Pareto-skewed (a few busy accounts, a long quiet tail); amounts are
+log-normal per transaction type; timestamps spread over the year before
+``until``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple
+
+USER_COLUMNS = ("id", "username", "email", "full_name", "created_at")
+ACCOUNT_COLUMNS = (
+    "id",
+    "user_id",
+    "account_type",
+    "account_number",
+    "balance",
+    "currency",
+    "status",
+    "created_at",
+)
+TRANSACTION_COLUMNS = (
+    "account_id",
+    "transaction_type",
+    "amount",
+    "description",
+    "recipient",
+    "status",
+    "created_at",
+)
+REWARDS_COLUMNS = (
+    "user_id",
+    "source_account_id",
+    "target_account_id",
+    "points",
+    "created_at",
+)
+
+DEFAULT_UNTIL = datetime(2026, 1, 1)
+HISTORY_DAYS = 365
+
+_FIRST_NAMES = (
+    "Ada", "Alan", "Grace", "Linus", "Margaret", "Dennis", "Barbara", "Ken",
+    "Frances", "Edsger", "Radia", "Donald", "Hedy", "John", "Katherine", "Tim",
+)  # fmt: skip
+_LAST_NAMES = (
+    "Lovelace", "Turing", "Hopper", "Torvalds", "Hamilton", "Ritchie", "Liskov",
+    "Thompson", "Allen", "Dijkstra", "Perlman", "Knuth", "Lamarr", "McCarthy",
+)  # fmt: skip
+_MERCHANTS = (
+    "Grocery Mart", "Coffee Corner", "Metro Transit", "Online Books",
+    "Fuel Stop", "City Utilities", "Streaming Plus", "Pharmacy Co",
+)  # fmt: skip
+
+# (type, weight, sign, log-normal mu, sigma) for amounts in cents.
+_TRANSACTION_MIX = (
+    ("purchase", 45, -1, 7.6, 1.0),  # median ~$20
+    ("deposit", 20, 1, 11.0, 0.7),  # median ~$600
+    ("transfer", 15, 0, 9.9, 1.1),  # median ~$200, either direction
+    ("payment", 10, -1, 10.3, 0.8),  # median ~$300
+    ("withdrawal", 10, -1, 8.9, 0.6),  # median ~$75
+)
+_EXTRA_ACCOUNT_TYPES = (("savings", 0.6), ("credit", 0.3), ("checking", 0.1))
+_ACCOUNT_PREFIX = {"checking": "CHK", "savings": "SAV", "credit": "CCC"}
+
+
+class StartIds(NamedTuple):
+    """First id to assign in each table (one past the current maximum)."""
+
+    user: int
+    account: int
+
+
+class SyntheticData:
+    """Chunked, seeded generator for one synthetic data set."""
+
+    def __init__(
+        self,
+        *,
+        seed: int,
+        users: int,
+        accounts: int,
+        transactions: int,
+        rewards: int,
+        start: StartIds = StartIds(1, 1),
+        chunk_size: int = 10_000,
+        until: datetime = DEFAULT_UNTIL,
+    ):
+        if users < 1 and (accounts or transactions or rewards):
+            raise ValueError("accounts, transactions and rewards need users")
+        if accounts < users:
+            accounts = users  # every user owns at least a checking account
+        self.seed = seed
+        self.users = users
+        self.accounts = accounts
+        self.transactions = transactions
+        self.rewards = rewards
+        self.start = start
+        self.chunk_size = max(1, chunk_size)
+        self.until = until
+        # Per-account bookkeeping shared by the transaction/rewards phases.
+        self._owners: list[int] = []
+        self._cum_weights: list[float] = []
+
+    def _rng(self, phase: str) -> random.Random:
+        # One stream per phase: changing --transactions does not reshuffle accounts.
+        return random.Random(f"{self.seed}:{phase}")
+
+    def _timestamp(self, rng: random.Random) -> str:
+        moment = self.until - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86_400))
+        return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _chunks(self, rows: Iterator[tuple]) -> Iterator[list[tuple]]:
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def user_chunks(self) -> Iterator[list[tuple]]:
+        return self._chunks(self._user_rows())
+
+    def _user_rows(self) -> Iterator[tuple]:
+        rng = self._rng("users")
+        for user_id in range(self.start.user, self.start.user + self.users):
+            first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+            yield (
+                user_id,
+                f"user{user_id}",
+                f"user{user_id}@example.test",
+                f"{first} {last}",
+                self._timestamp(rng),
+            )
+
+    def account_chunks(self) -> Iterator[list[tuple]]:
+        return self._chunks(self._account_rows())
+
+    def _account_rows(self) -> Iterator[tuple]:
+        rng = self._rng("accounts")
+        types = [t for t, _ in _EXTRA_ACCOUNT_TYPES]
+        type_weights = [w for _, w in _EXTRA_ACCOUNT_TYPES]
+        self._owners = []
+        self._cum_weights = []
+        total = 0.0
+        for offset in range(self.accounts):
+            account_id = self.start.account + offset
+            if offset < self.users:
+                user_id = self.start.user + offset
+                account_type = "checking"
+            else:
+                user_id = self.start.user + rng.randrange(self.users)
+                account_type = rng.choices(types, type_weights)[0]
+            if account_type == "credit":
+                balance = -int(rng.lognormvariate(11.0, 1.0))
+            else:
+                balance = int(rng.lognormvariate(12.5, 1.2))
+            total += rng.paretovariate(1.2)
+            self._owners.append(user_id)
+            self._cum_weights.append(total)
+            yield (
+                account_id,
+                user_id,
+                account_type,
+                f"QB-{_ACCOUNT_PREFIX[account_type]}-{account_id:09d}",
+                balance,
+                "USD",
+                "active",
+                self._timestamp(rng),
+            )
+
+    def _pick_accounts(self, rng: random.Random, k: int) -> list[int]:
+        """``k`` account offsets, weighted by activity."""
+        if not self._cum_weights:
+            # Accounts phase skipped in this run; replay it for the weights.
+            for _ in self._account_rows():
+                pass
+        return rng.choices(range(self.accounts), cum_weights=self._cum_weights, k=k)
+
+    def transaction_chunks(self) -> Iterator[list[tuple]]:
+        rng = self._rng("transactions")
+        names = [m[0] for m in _TRANSACTION_MIX]
+        weights = [m[1] for m in _TRANSACTION_MIX]
+        shapes = {m[0]: m[2:] for m in _TRANSACTION_MIX}
+        remaining = self.transactions
+        while remaining > 0:
+            size = min(self.chunk_size, remaining)
+            remaining -= size
+            chunk = []
+            kinds = rng.choices(names, weights, k=size)
+            for offset, kind in zip(self._pick_accounts(rng, size), kinds):
+                sign, mu, sigma = shapes[kind]
+                if sign == 0:
+                    sign = rng.choice((-1, 1))
+                amount = sign * max(1, int(rng.lognormvariate(mu, sigma)))
+                if kind == "transfer":
+                    peer = self.start.account + rng.randrange(self.accounts)
+                    recipient = f"QB-XFR-{peer:09d}"
+                    description = "Transfer"
+                else:
+                    recipient = rng.choice(_MERCHANTS)
+                    description = f"{kind.title()} - {recipient}"
+                chunk.append(
+                    (
+                        self.start.account + offset,
+                        kind,
+                        amount,
+                        description,
+                        recipient,
+                        "completed",
+                        self._timestamp(rng),
+                    )
+                )
+            yield chunk
+
+    def rewards_chunks(self) -> Iterator[list[tuple]]:
+        rng = self._rng("rewards")
+        remaining = self.rewards
+        while remaining > 0:
+            size = min(self.chunk_size, remaining)
+            remaining -= size
+            chunk = []
+            for offset in self._pick_accounts(rng, size):
+                chunk.append(
+                    (
+                        self._owners[offset],
+                        self.start.account + offset,
+                        self.start.account + rng.randrange(self.accounts),
+                        1 + min(49, int(rng.expovariate(0.25))),
+                        self._timestamp(rng),
+                    )
+                )
+            yield chunk
@@ -51,7 +51,7 @@ def rollout_env(monkeypatch):
 
 @pytest.fixture
 def rewards_ledger_clean():
-    """Drop rewards table and clear cache after each test."""
+    """Drop rewards tables and clear cache after each test."""
     yield
 
     use_pg = os.environ.get("POSTGRES_DATABASE", "off").lower() in {
@@ -68,6 +68,7 @@ def rewards_ledger_clean():
         try:
             with conn.cursor() as cursor:
                 cursor.execute("DROP TABLE IF EXISTS rewards_ledger")
+                cursor.execute("DROP TABLE IF EXISTS rewards_balance")
             conn.commit()
         finally:
             conn.close()
@@ -75,6 +76,7 @@ def rewards_ledger_clean():
         conn = sqlite3.connect(os.environ["QUANTUM_BANK_DATABASE"])
         try:
             conn.execute("DROP TABLE IF EXISTS rewards_ledger")
+            conn.execute("DROP TABLE IF EXISTS rewards_balance")
             conn.commit()
         finally:
             conn.close()
@@ -83,3 +85,6 @@ def rewards_ledger_clean():
 
     if hasattr(models, "_rewards_schema_state"):
         models._rewards_schema_state = "unknown"
+    if hasattr(models, "_rewards_table_cache"):
+        # The tables were dropped behind the cache's back.
+        models._rewards_table_cache.clear()
@@ -127,7 +127,7 @@ def test_init_db_seeds_demo_on_empty_database(monkeypatch, split_unavailable, tm
 
     account_id = accounts[0]["id"]
     transaction_id = models.create_transaction(
-        account_id, "deposit", 1.0, "bootstrap", "pytest"
+        account_id, "deposit", 100, "bootstrap", "pytest"
     )
     assert isinstance(transaction_id, int)
     assert transaction_id > 0
@@ -148,7 +148,7 @@ def test_transfer_money_small_amount_updates_balances(
 
     before_checking = checking["balance"]
     before_savings = savings["balance"]
-    amount = 10.0
+    amount = 1000
 
     ok, message = models.transfer_money(checking["id"], savings["id"], amount, "pytest")
 
@@ -182,7 +182,7 @@ def test_transfer_money_rejects_unknown_destination_account(
 
     missing_account_id = 10_000_000
     ok, message = models.transfer_money(
-        checking["id"], missing_account_id, 10.0, "pytest"
+        checking["id"], missing_account_id, 1000, "pytest"
     )
 
     assert ok is False
@@ -211,7 +211,7 @@ def test_transfer_money_rejects_transfer_from_another_users_account(
     ok, message = models.transfer_money(
         checking["id"],
         savings["id"],
-        10.0,
+        1000,
         "pytest",
         acting_user_id=impostor_user_id,
     )
@@ -244,7 +244,7 @@ def test_transfer_money_rejects_insufficient_funds(
     before_savings = savings["balance"]
 
     ok, message = models.transfer_money(
-        checking["id"], savings["id"], before_checking + 1_000.0, "pytest"
+        checking["id"], savings["id"], before_checking + 100_000, "pytest"
     )
 
     assert ok is False
@@ -274,7 +274,8 @@ def test_transfer_money_rejects_nonfinite_amount_without_opening_connection(
 
     monkeypatch.setattr(models, "get_db", _fail_if_called)
 
-    for bad_amount in (float("inf"), float("nan"), 0.0, -5.0):
+    # Amounts are integer cents: floats (even whole ones) are refused too.
+    for bad_amount in (float("inf"), float("nan"), 0, -500, 10.0, True):
         ok, message = models.transfer_money(1, 2, bad_amount, "pytest")
         assert ok is False
         assert message == "Invalid amount"
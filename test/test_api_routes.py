@@ -311,7 +311,7 @@ def test_api_transfer_rejects_cross_user_source_account(client):
             INSERT INTO accounts (user_id, account_type, account_number, balance)
             VALUES (?, ?, ?, ?)
             """,
-            (attacker_user_id, "checking", f"QB-CHK-{suffix}", 500.0),
+            (attacker_user_id, "checking", f"QB-CHK-{suffix}", 50000),
         )
         conn.commit()
     finally:
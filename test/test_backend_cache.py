@@ -0,0 +1,96 @@
+"""Backend selection: TTL-cached flag, explicit refresh, pinned per request."""
+
+import pytest
+
+
+@pytest.fixture
+def counted_flag(monkeypatch):
+    import db_flags
+
+    calls = []
+    results = [False]
+
+    def fake_resolve(user_key="__system__"):
+        calls.append(user_key)
+        return results[-1]
+
+    from app import app  # noqa: F401 -- booting caches the flag; reset after it
+
+    monkeypatch.setattr(db_flags, "is_postgres_database_enabled", fake_resolve)
+    monkeypatch.setattr(db_flags, "_backend_cache", None)
+    yield calls, results
+    monkeypatch.setattr(db_flags, "_backend_cache", None)
+
+
+@pytest.mark.models
+def test_backend_flag_is_evaluated_once_within_ttl(counted_flag):
+    import db_flags
+
+    calls, _ = counted_flag
+
+    for _ in range(10):
+        assert db_flags.cached_postgres_database_enabled() is False
+
+    assert len(calls) == 1
+
+
+@pytest.mark.models
+def test_backend_flag_is_cached_briefly_while_split_is_starting(
+    counted_flag, monkeypatch
+):
+    import time
+
+    import db_flags
+
+    calls, _ = counted_flag
+    monkeypatch.setattr(db_flags, "_split_starting", lambda: True)  # e.g. timed_out
+
+    for _ in range(10):
+        assert db_flags.cached_postgres_database_enabled() is False
+
+    assert len(calls) == 1
+    expires_in = db_flags._backend_cache[1] - time.monotonic()
+    assert expires_in <= db_flags.STARTING_BACKEND_CACHE_TTL
+
+
+@pytest.mark.models
+def test_backend_flag_is_re_evaluated_after_ttl(counted_flag, monkeypatch):
+    import db_flags
+
+    calls, _ = counted_flag
+    monkeypatch.setenv("DB_BACKEND_CACHE_TTL", "0")
+
+    db_flags.cached_postgres_database_enabled()
+    db_flags.cached_postgres_database_enabled()
+
+    assert len(calls) == 2
+
+
+@pytest.mark.models
+def test_refresh_picks_up_a_flag_flip_immediately(counted_flag):
+    import db_flags
+
+    _, results = counted_flag
+    assert db_flags.cached_postgres_database_enabled() is False
+
+    results.append(True)
+
+    assert db_flags.cached_postgres_database_enabled() is False
+    assert db_flags.refresh_postgres_database_flag() is True
+
+
+@pytest.mark.models
+def test_backend_is_pinned_for_the_whole_request(counted_flag, monkeypatch):
+    import db_flags
+    import models
+    from app import app
+
+    _, results = counted_flag
+    monkeypatch.setenv("DB_BACKEND_CACHE_TTL", "0")
+
+    with app.test_request_context("/"):
+        assert models.using_postgres() is False
+        results.append(True)
+        assert models.using_postgres() is False
+
+    assert db_flags.cached_postgres_database_enabled() is True
@@ -353,7 +353,7 @@ def test_transfer_post_rejects_cross_user_source_account(client):
             INSERT INTO accounts (user_id, account_type, account_number, balance)
             VALUES (?, ?, ?, ?)
             """,
-            (attacker_user_id, "checking", f"QB-CHK-{suffix}", 500.0),
+            (attacker_user_id, "checking", f"QB-CHK-{suffix}", 50000),
         )
         conn.commit()
     finally:
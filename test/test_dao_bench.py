@@ -0,0 +1,94 @@
+"""DAO micro-benchmark suite: a tiny end-to-end run and result comparison."""
+
+import json
+
+import pytest
+
+
+@pytest.mark.models
+def test_run_covers_every_case_and_reuses_seeded_databases(
+    monkeypatch, split_unavailable, rollout_env, tmp_path
+):
+    import models
+    from bench import dao_bench
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    # run_suite points these at its own databases; restore them afterwards.
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", str(tmp_path / "unused.sqlite"))
+    monkeypatch.setenv("DEMO_ROLLOUT_SCHEMA", "on")
+    monkeypatch.setenv("DEMO_ROLLOUT_FEATURE", "on")
+    lines = []
+
+    try:
+        report = dao_bench.run_suite(
+            [300],
+            warmup=1,
+            iterations=3,
+            db_dir=str(tmp_path),
+            echo=lines.append,
+        )
+        again = dao_bench.run_suite(
+            [300], warmup=0, iterations=1, db_dir=str(tmp_path), echo=lambda _: None
+        )
+    finally:
+        monkeypatch.undo()
+        models.refresh_backend()
+
+    cases = [r["case"] for r in report["results"]]
+    assert len(cases) == len(set(cases)) >= 14
+    assert {"DashboardDAO.load", "models.transfer_money"} <= set(cases)
+    for result in report["results"]:
+        assert (result["backend"], result["size"], result["ops"]) == ("sqlite", 300, 3)
+        assert 0 < result["p50_ms"] <= result["p99_ms"] <= result["max_ms"]
+    json.dumps(report)  # results are plain JSON
+    assert lines[0].startswith("[sqlite 300] seeded")
+    assert len(again["results"]) == len(cases)
+
+
+@pytest.mark.models
+def test_compare_flags_slower_cases_only():
+    from bench.dao_bench import compare
+
+    def report(**p50):
+        return {
+            "results": [
+                {
+                    "backend": "sqlite",
+                    "size": 1000,
+                    "case": case,
+                    "ops_per_sec": 1000 / ms,
+                    "p50_ms": ms,
+                }
+                for case, ms in p50.items()
+            ]
+        }
+
+    before = report(fast=1.0, steady=2.0, gone=1.0)
+    after = report(fast=1.5, steady=2.1, new=1.0)
+
+    rows = {row["case"]: row for row in compare(before, after, threshold=0.2)}
+
+    assert set(rows) == {"fast", "steady"}
+    assert rows["fast"]["regressed"] and rows["fast"]["p50_change"] == 0.5
+    assert not rows["steady"]["regressed"]
+    assert compare(after, before) and not any(
+        r["regressed"] for r in compare(after, before)
+    )
+
+
+@pytest.mark.models
+def test_compare_command_exits_nonzero_on_regression(tmp_path, capsys):
+    from bench.dao_bench import main
+
+    def write(name, ms):
+        path = tmp_path / name
+        row = {"backend": "sqlite", "size": 1, "case": "c", "ops_per_sec": 1 / ms}
+        path.write_text(json.dumps({"results": [{**row, "p50_ms": ms}]}))
+        return str(path)
+
+    before, slower = write("before.json", 1.0), write("after.json", 2.0)
+
+    assert main(["compare", before, before]) == 0
+    assert main(["compare", before, slower]) == 1
+    assert "REGRESSED" in capsys.readouterr().out
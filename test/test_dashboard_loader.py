@@ -0,0 +1,100 @@
+"""Dashboard view model: one read instead of a query per widget."""
+
+import pytest
+
+from dao import dashboard_dao
+
+
+@pytest.fixture
+def sqlite_env(monkeypatch, split_unavailable, rollout_env, tmp_path):
+    import models
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", str(tmp_path / "qb.sqlite"))
+    models.init_db()
+    return models
+
+
+def _demo_user_id(models):
+    return models.get_user_by_username("demo")["id"]
+
+
+@pytest.mark.models
+def test_view_matches_the_per_widget_queries(sqlite_env):
+    models = sqlite_env
+    user_id = _demo_user_id(models)
+    accounts = models.get_accounts_by_user(user_id)
+    for n in range(7):
+        models.create_transaction(accounts[0]["id"], "deposit", 100, f"d{n}", "pytest")
+
+    view = models.get_dashboard(user_id, limit=5)
+
+    accounts = models.get_accounts_by_user(user_id)
+    assert view.accounts == accounts
+    assert view.recent_transactions == models.get_all_transactions_by_user(
+        user_id, limit=5
+    )
+    assert view.total_balance == pytest.approx(
+        sum(a["balance"] for a in accounts if a["account_type"] != "credit")
+    )
+    assert (view.rewards_points, view.rewards_banner_kind) == (None, None)
+
+
+@pytest.mark.models
+def test_rewards_come_from_the_same_read_when_the_ledger_is_live(
+    sqlite_env, monkeypatch, rewards_ledger_clean
+):
+    models = sqlite_env
+    monkeypatch.setenv("DEMO_ROLLOUT_SCHEMA", "on")
+    monkeypatch.setenv("DEMO_ROLLOUT_FEATURE", "on")
+    models.init_db()
+
+    view = models.get_dashboard(_demo_user_id(models))
+
+    assert (view.rewards_points, view.rewards_banner_kind) == (0, None)
+
+
+@pytest.mark.models
+def test_postgres_loads_the_page_in_one_statement():
+    sql = dashboard_dao._PG_DASHBOARD + dashboard_dao._PG_DASHBOARD_REWARDS
+
+    assert sql.count(";") == 0
+    for column in ("accounts", "recent_transactions", "total_balance"):
+        assert f"AS {column}" in sql
+    assert "AS rewards_points" in sql
+
+
+@pytest.mark.models
+def test_postgres_json_rows_get_the_same_types_as_the_wrappers():
+    from datetime import datetime
+
+    class JsonCursor:
+        def execute(self, sql, params):
+            pass
+
+        def fetchone(self):
+            return {
+                "accounts": [
+                    {
+                        "id": 1,
+                        "balance": 500,
+                        "created_at": "2026-01-02T03:04:05.5+00:00",
+                    }
+                ],
+                "recent_transactions": [
+                    {"id": 7, "amount": -5, "created_at": "2026-01-03T00:00:00+00:00"}
+                ],
+                "total_balance": 500,
+            }
+
+    dao = dashboard_dao.DashboardDAO()
+    dao.cursor = JsonCursor()
+
+    view = dao._load_postgres(1, 5, with_rewards=False, banner=None)
+
+    assert view.accounts[0]["created_at"] == datetime.fromisoformat(
+        "2026-01-02T03:04:05.500+00:00"
+    )
+    assert isinstance(view.recent_transactions[0]["created_at"], datetime)
+    assert "credit_balance" not in dashboard_dao.DashboardView._fields
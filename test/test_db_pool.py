@@ -0,0 +1,175 @@
+"""Connection pool behind models.get_db(): reuse, bounds, recycling, fork reset."""
+
+import sqlite3
+import threading
+
+import pytest
+
+import db_pool
+
+
+def _sqlite_pool(tmp_path, **kwargs):
+    path = str(tmp_path / "pool.sqlite")
+    opened = []
+
+    def connect():
+        conn = sqlite3.connect(path, check_same_thread=False)
+        opened.append(conn)
+        return conn
+
+    return db_pool.ConnectionPool("test", connect, **kwargs), opened
+
+
+@pytest.mark.models
+def test_closed_connection_is_reused_on_next_checkout(tmp_path):
+    pool, opened = _sqlite_pool(tmp_path)
+
+    first = pool.checkout()
+    raw = first.raw
+    first.close()
+    second = pool.checkout()
+
+    assert second.raw is raw
+    assert len(opened) == 1
+    second.close()
+
+
+@pytest.mark.models
+def test_checkout_times_out_when_pool_is_exhausted(tmp_path):
+    pool, _ = _sqlite_pool(tmp_path, max_size=1)
+    held = pool.checkout()
+
+    with pytest.raises(db_pool.PoolTimeout):
+        pool.checkout(timeout=0.05)
+
+    assert pool.stats()["timeouts"] == 1
+    held.close()
+
+
+@pytest.mark.models
+def test_waiting_checkout_gets_connection_released_by_another_thread(tmp_path):
+    pool, opened = _sqlite_pool(tmp_path, max_size=1)
+    held = pool.checkout()
+    timer = threading.Timer(0.05, held.close)
+    timer.start()
+
+    conn = pool.checkout(timeout=2.0)
+
+    assert conn.raw is opened[0]
+    assert pool.stats()["waits"] == 1
+    conn.close()
+    timer.join()
+
+
+@pytest.mark.models
+def test_connection_past_max_lifetime_is_recycled(tmp_path):
+    pool, opened = _sqlite_pool(tmp_path, max_lifetime=0.0)
+
+    pool.checkout().close()
+    pool.checkout().close()
+
+    assert len(opened) == 2
+    assert pool.stats()["recycled"] >= 1
+
+
+@pytest.mark.models
+def test_failed_ping_replaces_idle_connection(tmp_path):
+    calls = []
+
+    def failing_ping(conn):
+        calls.append(conn)
+        raise sqlite3.OperationalError("server closed the connection")
+
+    pool, opened = _sqlite_pool(tmp_path, ping_interval=0.0, ping=failing_ping)
+    pool.checkout().close()
+
+    conn = pool.checkout()
+
+    assert calls == [opened[0]]
+    assert conn.raw is opened[1]
+    assert pool.stats()["broken"] == 1
+    conn.close()
+
+
+@pytest.mark.models
+def test_close_rolls_back_uncommitted_work(tmp_path):
+    pool, _ = _sqlite_pool(tmp_path)
+    setup = pool.checkout()
+    setup.execute("CREATE TABLE t (x INTEGER)")
+    setup.commit()
+    setup.close()
+
+    dirty = pool.checkout()
+    dirty.execute("INSERT INTO t VALUES (1)")
+    dirty.close()
+
+    conn = pool.checkout()
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+
+
+@pytest.mark.models
+def test_pool_drops_inherited_connections_after_fork(tmp_path, monkeypatch):
+    pool, opened = _sqlite_pool(tmp_path)
+    pool.checkout().close()
+
+    monkeypatch.setattr(pool, "_pid", -1)
+    conn = pool.checkout()
+
+    assert conn.raw is opened[1]
+    assert pool.stats()["in_use"] == 1
+    conn.close()
+
+
+@pytest.mark.models
+def test_get_db_draws_from_pool_and_reports_stats():
+    import models
+
+    conn = models.get_db()
+    raw = conn.raw
+    conn.close()
+    again = models.get_db()
+
+    assert again.raw is raw
+    again.close()
+    stats = [s for s in models.pool_stats() if s["pool"].startswith("sqlite:")]
+    assert stats and all(s["in_use"] == 0 for s in stats)
+
+
+@pytest.mark.models
+def test_get_db_opens_direct_connection_when_pool_size_is_zero(monkeypatch):
+    import models
+
+    monkeypatch.setenv("DB_POOL_SIZE", "0")
+
+    conn = models.get_db()
+
+    assert isinstance(conn, sqlite3.Connection)
+    conn.close()
+
+
+@pytest.mark.models
+def test_write_wrappers_report_a_pool_timeout_as_a_failed_write(monkeypatch):
+    import models
+
+    def exhausted():
+        raise db_pool.PoolTimeout("no connection available")
+
+    monkeypatch.setattr(models, "get_db", exhausted)
+
+    assert models.transfer_money(1, 2, 100) == (False, "Transfer failed")
+    assert models.transfer_many(
+        [{"from_account_id": 1, "to_account_id": 2, "amount": 100}]
+    ) == [(False, "Transfer failed")]
+    with pytest.raises(db_pool.PoolTimeout):
+        models.create_transaction(1, "deposit", 100, "no pool")
+
+
+@pytest.mark.public
+def test_metrics_exposes_pool_gauges(client):
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+
+    data = client.get("/metrics").get_data(as_text=True)
+
+    assert "db_pool_in_use{" in data
+    assert "db_pool_wait_seconds_total{" in data
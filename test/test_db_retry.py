@@ -0,0 +1,111 @@
+"""Transfers lock rows in id order and retry lost Postgres lock races."""
+
+import pytest
+
+import db_retry
+from dao import statements
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class _Conn:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setenv("TRANSFER_RETRY_BASE_MS", "0")
+
+
+def _flaky(failures):
+    calls = []
+
+    def attempt():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return "done"
+
+    return attempt, calls
+
+
+@pytest.mark.models
+def test_deadlocks_and_serialization_failures_are_retried():
+    conn = _Conn()
+    before = db_retry.retry_stats()["retries"]
+    attempt, calls = _flaky([_PgError("40P01"), _PgError("40001")])
+
+    assert db_retry.call_with_retry("unit", conn, attempt) == "done"
+
+    assert len(calls) == 3 and conn.rollbacks == 2
+    after = db_retry.retry_stats()["retries"]
+    assert (
+        after["unit:deadlock_detected"] == before.get("unit:deadlock_detected", 0) + 1
+    )
+    assert after["unit:serialization_failure"] == (
+        before.get("unit:serialization_failure", 0) + 1
+    )
+
+
+@pytest.mark.models
+def test_other_errors_propagate_without_retry_and_retries_are_bounded(monkeypatch):
+    attempt, calls = _flaky([_PgError("23505")])
+    with pytest.raises(_PgError):
+        db_retry.call_with_retry("unit", _Conn(), attempt)
+    assert len(calls) == 1
+
+    monkeypatch.setenv("TRANSFER_MAX_RETRIES", "2")
+    attempt, calls = _flaky([_PgError("40P01")] * 5)
+    with pytest.raises(_PgError):
+        db_retry.call_with_retry("unit", _Conn(), attempt)
+    assert len(calls) == 3
+    assert db_retry.retry_stats()["exhausted"]["unit:deadlock_detected"] >= 1
+
+
+@pytest.mark.models
+def test_postgres_transfer_locks_both_rows_in_id_order():
+    import dao.write_dao  # noqa: F401
+
+    sql = statements.REGISTRY["accounts.lock_pair"].postgres
+
+    assert "ORDER BY id" in sql and sql.rstrip().endswith("FOR UPDATE")
+
+
+@pytest.mark.banking
+def test_transfer_money_retries_a_deadlocked_attempt(client, monkeypatch):
+    import models
+    from dao.write_dao import WriteDAO
+
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+    accounts = {
+        a["account_type"]: a for a in client.get("/api/accounts").get_json()["accounts"]
+    }
+    real = WriteDAO.transfer_internal
+    attempts = []
+
+    def deadlock_once(self, conn, *args, **kwargs):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise _PgError("40P01")
+        return real(self, conn, *args, **kwargs)
+
+    monkeypatch.setattr(WriteDAO, "transfer_internal", deadlock_once)
+
+    result = models.transfer_money(
+        accounts["checking"]["id"], accounts["savings"]["id"], 100, "retry"
+    )
+    models.transfer_money(
+        accounts["savings"]["id"], accounts["checking"]["id"], 100, "undo"
+    )
+
+    assert result == (True, "Transfer successful")
+    assert len(attempts) == 3
+    assert b"db_transaction_retries_total" in client.get("/metrics").data
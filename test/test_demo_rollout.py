@@ -242,20 +242,18 @@ def test_transfer_still_succeeds_when_rewards_insert_hits_real_db_error(
     _login_demo(client)
     checking_before, savings_before = _get_checking_to_savings_accounts(client)
 
-    import models
-
-    original_sql = models._sql
-
-    def _break_rewards_insert_query(query):
-        if "INSERT INTO rewards_ledger" in query:
-            return (
-                "INSERT INTO rewards_ledger "
-                "(missing_column, source_account_id, target_account_id, points) "
-                "VALUES (?, ?, ?, ?)"
-            )
-        return original_sql(query)
-
-    monkeypatch.setattr(models, "_sql", _break_rewards_insert_query)
+    from dao import statements
+
+    monkeypatch.setitem(
+        statements.REGISTRY,
+        "rewards.insert",
+        statements.compile_statement(
+            "rewards.insert",
+            "INSERT INTO rewards_ledger "
+            "(missing_column, source_account_id, target_account_id, points) "
+            "VALUES (?, ?, ?, ?)",
+        ),
+    )
 
     response = _post_transfer(client, 10.0)
     checking_after, savings_after = _get_checking_to_savings_accounts(client)
@@ -274,16 +272,15 @@ def test_dashboard_shows_runtime_error_banner_when_rewards_read_raises(
     _login_demo(client)
     _post_transfer(client, 10.0)
 
-    import models
-
-    original_sql = models._sql
+    from dao import statements
 
-    def _break_rewards_sum_query(query):
-        if "SELECT COALESCE(SUM(points), 0) AS points_total" in query:
-            return "SELECT missing_column FROM rewards_ledger"
-        return original_sql(query)
-
-    monkeypatch.setattr(models, "_sql", _break_rewards_sum_query)
+    monkeypatch.setitem(
+        statements.REGISTRY,
+        "rewards.points_total",
+        statements.compile_statement(
+            "rewards.points_total", "SELECT missing_column FROM rewards_ledger"
+        ),
+    )
 
     response = _get_dashboard(client)
 
@@ -0,0 +1,158 @@
+"""Offline flag provider: targeting, bucketing, hot reload and wiring."""
+
+import json
+import os
+
+import pytest
+
+DEFINITIONS = {
+    "postgres_database": "off",
+    "demo_mode": {
+        "default": "off",
+        "keys": {"10.0.0.1": "on"},
+        "rules": [{"attribute": "url-entry", "contains": "demo", "treatment": "on"}],
+    },
+    "home_page_variant": {
+        "default": "new_home",
+        "rules": [
+            {
+                "attribute": "url-entry",
+                "in": ["/pricing"],
+                "allocations": {"dev_home": 100},
+            }
+        ],
+        "allocations": {"old_home": 50},
+    },
+}
+
+
+def _write(path, definitions, mtime=None):
+    path.write_text(json.dumps(definitions))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+@pytest.mark.public
+def test_targeting_keys_and_deterministic_buckets(tmp_path):
+    from flag_provider import FileFlagProvider
+
+    flags = FileFlagProvider(_write(tmp_path / "flags.json", DEFINITIONS))
+
+    assert flags.get_treatment("k", "postgres_database") == "off"
+    assert flags.get_treatment("k", "unknown_flag") == "control"
+    assert flags.get_treatment("k", "demo_mode") == "off"
+    assert flags.get_treatment("k", "demo_mode", {"url-entry": "/Demo"}) == "on"
+    assert flags.get_treatment("10.0.0.1", "demo_mode") == "on"
+    assert (
+        flags.get_treatment("k", "home_page_variant", {"url-entry": "/pricing"})
+        == "dev_home"
+    )
+
+    variants = [
+        flags.get_treatment(f"user-{n}", "home_page_variant") for n in range(2000)
+    ]
+    assert variants == [
+        flags.get_treatment(f"user-{n}", "home_page_variant") for n in range(2000)
+    ]
+    assert set(variants) == {"old_home", "new_home"}
+    assert 900 < variants.count("old_home") < 1100
+    assert flags.get_treatments("k", ["postgres_database", "nope"]) == {
+        "postgres_database": "off",
+        "nope": "control",
+    }
+
+
+@pytest.mark.public
+def test_file_is_reloaded_on_change_and_bad_edits_are_ignored(tmp_path):
+    import treatment_cache
+    from flag_provider import FileFlagProvider
+
+    path = tmp_path / "flags.json"
+    flags = FileFlagProvider(_write(path, {"demo_mode": "off"}, 1000), poll_seconds=0)
+    assert treatment_cache.get_treatment(flags, "k", "demo_mode") == "off"
+
+    _write(path, {"demo_mode": "on"}, 2000)
+    # The shared cache never holds file answers, so the edit shows up at once.
+    assert treatment_cache.get_treatment(flags, "k", "demo_mode") == "on"
+    assert flags.get_treatment("k", "demo_mode") == "on"
+
+    path.write_text("{not json")
+    os.utime(path, (3000, 3000))
+    assert flags.get_treatment("k", "demo_mode") == "on"
+    assert flags.reloads == 2
+
+
+@pytest.mark.public
+def test_edits_reach_cached_page_renders_within_the_poll_interval(
+    client, monkeypatch, tmp_path
+):
+    import split_config
+    import treatment_cache
+    from flag_provider import FileFlagProvider
+
+    monkeypatch.setenv("SPLIT_TREATMENT_CACHE_TTL", "300")
+    path = tmp_path / "flags.json"
+    flags = FileFlagProvider(
+        _write(path, {"demo_mode": "off", "home_page_variant": "old_home"}, 1000),
+        poll_seconds=0,
+    )
+    monkeypatch.setattr(split_config, "split_client", flags)
+    monkeypatch.setattr(split_config, "_state", "ready")
+    monkeypatch.delenv("DEMO_MODE", raising=False)
+    treatment_cache.clear_treatment_cache()
+
+    assert "Simple Landing Page" in client.get("/").get_data(as_text=True)
+    _write(path, {"demo_mode": "off", "home_page_variant": "new_home"}, 2000)
+    assert "Simple Landing Page" not in client.get("/").get_data(as_text=True)
+    assert treatment_cache.treatment_cache_stats()["entries"] == 0
+
+
+@pytest.mark.public
+def test_flag_provider_requires_get_treatment():
+    from flag_provider import FlagProvider
+
+    with pytest.raises(TypeError):
+        FlagProvider()
+
+
+@pytest.mark.public
+def test_yaml_definitions(tmp_path):
+    pytest.importorskip("yaml")
+    from flag_provider import FileFlagProvider
+
+    path = tmp_path / "flags.yaml"
+    path.write_text("demo_mode:\n  default: 'off'\npostgres_database: 'on'\n")
+
+    flags = FileFlagProvider(str(path))
+
+    assert flags.get_treatments("k", ["demo_mode", "postgres_database"]) == {
+        "demo_mode": "off",
+        "postgres_database": "on",
+    }
+
+
+@pytest.mark.public
+def test_flag_file_replaces_split_for_every_caller(client, monkeypatch, tmp_path):
+    import db_flags
+    import split_config
+    import treatment_cache
+    from flag_provider import FileFlagProvider
+
+    definitions = {**DEFINITIONS, "home_page_variant": "old_home"}
+    monkeypatch.setenv("FLAG_FILE", _write(tmp_path / "flags.json", definitions))
+    monkeypatch.setattr(split_config, "split_client", None)
+    treatment_cache.clear_treatment_cache()
+
+    flags = split_config.init_split()
+    try:
+        assert isinstance(flags, FileFlagProvider)
+        monkeypatch.setattr(db_flags, "get_split_client", lambda: flags)
+        monkeypatch.setenv("POSTGRES_DATABASE", "on")
+        assert db_flags.is_postgres_database_enabled() is False  # file says off
+
+        assert "Simple Landing Page" in client.get("/").get_data(as_text=True)
+        assert "pricing-table" in client.get("/pricing").get_data(as_text=True)
+    finally:
+        split_config.destroy_split()
+        treatment_cache.clear_treatment_cache()
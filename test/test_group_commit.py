@@ -0,0 +1,210 @@
+"""SQLite group commit: one writer thread, one transaction per group of jobs."""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import group_commit
+
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    path = str(tmp_path / "gc.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (v INTEGER NOT NULL)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _connect(path):
+    return lambda: sqlite3.connect(path, check_same_thread=False)
+
+
+def _values(path):
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT v FROM t"))
+    finally:
+        conn.close()
+
+
+@pytest.mark.models
+def test_queued_jobs_share_one_commit_and_failures_only_undo_themselves(
+    scratch_db,
+):
+    writer = group_commit.GroupCommitWriter(
+        "scratch", _connect(scratch_db), max_batch=64, max_wait=0
+    )
+    started, gate = threading.Event(), threading.Event()
+    try:
+        # Hold the writer inside a first group so the rest queue up behind it.
+        first = writer.submit(lambda conn: started.set() or gate.wait(5))
+        assert started.wait(5)
+
+        def insert(value):
+            def job(conn):
+                conn.execute("INSERT INTO t (v) VALUES (?)", (value,))
+                if value == 3:
+                    raise ValueError("bad item")
+                return value
+
+            return job
+
+        futures = [writer.submit(insert(v)) for v in range(1, 6)]
+        gate.set()
+
+        assert first.result(5) is True
+        assert [f.result(5) for f in futures if f.exception(5) is None] == [1, 2, 4, 5]
+        with pytest.raises(ValueError):
+            futures[2].result(5)
+    finally:
+        writer.close()
+
+    assert _values(scratch_db) == [1, 2, 4, 5]
+    stats = writer.stats()
+    assert (stats["groups"], stats["jobs"], stats["failed_jobs"]) == (2, 6, 1)
+    assert stats["largest_group"] == 5
+
+
+@pytest.mark.models
+def test_transfers_route_through_the_writer_when_enabled(
+    monkeypatch, split_unavailable, rollout_env, tmp_path
+):
+    import models
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", str(tmp_path / "qb.sqlite"))
+    monkeypatch.setenv("SQLITE_GROUP_COMMIT", "on")
+    monkeypatch.setenv("SQLITE_GROUP_COMMIT_MAX_WAIT_MS", "5")
+    models.init_db()
+    user = models.get_user_by_username("demo")
+    accounts = {a["account_type"]: a for a in models.get_accounts_by_user(user["id"])}
+    checking, savings = accounts["checking"], accounts["savings"]
+    total_before = checking["balance"] + savings["balance"]
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(
+                    lambda n: models.transfer_money(
+                        checking["id"], savings["id"], 100, f"gc-{n}"
+                    ),
+                    range(40),
+                )
+            )
+        rejected = models.transfer_money(checking["id"], savings["id"], 10**11, "big")
+        stats = group_commit.writer_stats()
+    finally:
+        group_commit.close_all_writers()
+
+    assert results == [(True, "Transfer successful")] * 40
+    assert rejected == (False, "Insufficient funds")
+    assert stats[0]["jobs"] == 41
+    after = {a["account_type"]: a for a in models.get_accounts_by_user(user["id"])}
+    assert after["checking"]["balance"] == checking["balance"] - 4000
+    assert after["checking"]["balance"] + after["savings"]["balance"] == total_before
+
+
+@pytest.mark.models
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_closed_or_dead_writer_fails_submissions_instead_of_hanging(scratch_db):
+    writer = group_commit.GroupCommitWriter("closed", _connect(scratch_db))
+    writer.close()
+
+    with pytest.raises(group_commit.WriterUnavailable):
+        writer.submit(lambda conn: 1).result(1)
+
+    dead = group_commit.GroupCommitWriter("dead", _connect(scratch_db))
+    dead._queue.put(None)  # not a (job, future) pair: crashes the thread
+    dead._thread.join(5)
+
+    assert not dead.alive
+    with pytest.raises(group_commit.WriterUnavailable):
+        dead.submit(lambda conn: 1).result(1)
+
+
+@pytest.mark.models
+def test_a_caller_that_times_out_cancels_its_queued_job(scratch_db):
+    writer = group_commit.GroupCommitWriter(
+        "slow", _connect(scratch_db), max_batch=1, max_wait=0
+    )
+    started, gate = threading.Event(), threading.Event()
+    try:
+        writer.submit(lambda conn: started.set() or gate.wait(5))
+        assert started.wait(5)
+        queued = writer.submit(
+            lambda conn: conn.execute("INSERT INTO t (v) VALUES (1)")
+        )
+        with pytest.raises(TimeoutError):
+            queued.result(timeout=0.05)
+        assert queued.cancel()
+        gate.set()
+    finally:
+        writer.close()
+
+    assert _values(scratch_db) == []
+
+
+@pytest.mark.models
+def test_a_transfer_already_in_a_group_waits_for_its_commit(
+    monkeypatch, split_unavailable, rollout_env, tmp_path
+):
+    import models
+    from dao.write_dao import WriteDAO
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", str(tmp_path / "qb.sqlite"))
+    monkeypatch.setenv("SQLITE_GROUP_COMMIT", "on")
+    monkeypatch.setattr(group_commit, "result_timeout", lambda: 0.05)
+    models.init_db()
+    user = models.get_user_by_username("demo")
+    accounts = {a["account_type"]: a for a in models.get_accounts_by_user(user["id"])}
+    original = WriteDAO.transfer_internal
+
+    def slow_transfer(self, *args, **kwargs):
+        time.sleep(0.3)  # still running when the caller's timeout expires
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(WriteDAO, "transfer_internal", slow_transfer)
+    try:
+        result = models.transfer_money(
+            accounts["checking"]["id"], accounts["savings"]["id"], 100, "slow"
+        )
+    finally:
+        group_commit.close_all_writers()
+
+    assert result == (True, "Transfer successful")
+    after = models.get_account_by_id(accounts["checking"]["id"])
+    assert after["balance"] == accounts["checking"]["balance"] - 100
+
+
+@pytest.mark.models
+def test_writer_jobs_stay_on_sqlite_when_the_flag_flips(
+    monkeypatch, split_unavailable, rollout_env, tmp_path
+):
+    import models
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", str(tmp_path / "qb.sqlite"))
+    monkeypatch.setenv("SQLITE_GROUP_COMMIT", "on")
+    models.init_db()
+    user = models.get_user_by_username("demo")
+    accounts = {a["account_type"]: a for a in models.get_accounts_by_user(user["id"])}
+
+    # The flag flips to Postgres after the caller chose the SQLite writer.
+    monkeypatch.setattr(models, "cached_postgres_database_enabled", lambda: True)
+    try:
+        result = models._transfer_via_group_commit(
+            accounts["checking"]["id"], accounts["savings"]["id"], 100, "flip", None
+        )
+    finally:
+        group_commit.close_all_writers()
+
+    assert result == (True, "Transfer successful")
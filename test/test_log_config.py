@@ -0,0 +1,114 @@
+"""Queue-based structured logging: levels, sampling, drops, no stdout."""
+
+import io
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def log_pipeline(monkeypatch):
+    """Reconfigure logging into a buffer; restore the app's pipeline afterwards."""
+    import log_config
+
+    for env in (log_config.LEVELS_ENV, log_config.SAMPLE_ENV, log_config.FORMAT_ENV):
+        monkeypatch.delenv(env, raising=False)
+    log_config.shutdown_logging()
+    levels = {name: logging.getLogger(name).level for name in ("api.home", "chatty")}
+
+    def start(stream=None, **env):
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        stream = stream or io.StringIO()
+        log_config.configure_logging(stream=stream)
+        return stream
+
+    yield log_config, start
+    log_config.shutdown_logging()
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+    log_config.configure_logging()
+
+
+@pytest.mark.public
+def test_json_records_with_extras_levels_and_sampling(log_pipeline):
+    log_config, start = log_pipeline
+    out = start(LOG_LEVELS="chatty=DEBUG", LOG_SAMPLE="chatty=0")
+
+    logging.getLogger("chatty").debug("sampled out")
+    logging.getLogger("chatty").warning("kept %s", "always", extra={"user_key": "k"})
+    logging.getLogger("quiet").debug("below the root level")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("quiet").exception("failed")
+    log_config.shutdown_logging()  # flushes the queue
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["message"] for r in records] == ["kept always", "failed"]
+    assert records[0]["user_key"] == "k" and records[0]["level"] == "WARNING"
+    assert "ValueError: boom" in records[1]["exc_info"]
+
+
+@pytest.mark.public
+def test_invalid_level_and_sample_settings_are_ignored_with_a_warning(log_pipeline):
+    log_config, start = log_pipeline
+    out = start(
+        LOG_LEVEL="verbose",
+        LOG_LEVELS="chatty=loud,api.home=debug",
+        LOG_SAMPLE="chatty=often,api.home=0",
+    )
+
+    assert logging.getLogger().level == logging.INFO
+    assert logging.getLogger("api.home").level == logging.DEBUG
+    logging.getLogger("api.home").debug("sampled out")
+    logging.getLogger("chatty").info("not sampled")
+    log_config.shutdown_logging()
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    warnings = [r["message"] for r in records if r["logger"] == "log_config"]
+    assert warnings == [
+        "Ignoring invalid LOG_LEVEL entry 'verbose'",
+        "Ignoring invalid LOG_LEVELS entry 'chatty=loud'",
+        "Ignoring invalid LOG_SAMPLE entry 'chatty=often'",
+    ]
+    assert [r["message"] for r in records if r["logger"] != "log_config"] == [
+        "not sampled"
+    ]
+
+
+@pytest.mark.public
+def test_a_stalled_writer_never_blocks_the_caller(log_pipeline):
+    log_config, start = log_pipeline
+    release = threading.Event()
+
+    class StalledStream(io.StringIO):
+        def write(self, text):
+            release.wait(5)
+            return super().write(text)
+
+    start(StalledStream(), LOG_QUEUE_SIZE="2")
+    dropped = log_config.logging_stats()["dropped"]
+    try:
+        started = time.perf_counter()
+        for n in range(50):
+            logging.getLogger("chatty").warning("record %d", n)
+        assert time.perf_counter() - started < 1.0
+    finally:
+        release.set()
+    assert log_config.logging_stats()["dropped"] - dropped >= 40
+    assert "log_records_dropped_total" in log_config.format_logging_metrics()
+
+
+@pytest.mark.public
+def test_home_page_logs_decisions_instead_of_printing(client, caplog, capsys):
+    with caplog.at_level(logging.DEBUG, logger="api.home"):
+        assert client.get("/").status_code == 200
+
+    assert "[Demo Mode]" not in capsys.readouterr().out
+    resolved = next(r for r in caplog.records if r.getMessage() == "demo_mode resolved")
+    assert resolved.source in ("env", "split")
+    assert any(r.getMessage() == "rendering variant" for r in caplog.records)
@@ -0,0 +1,208 @@
+"""Versioned migrations: applied once, recorded, skipped on later boots."""
+
+import sqlite3
+
+import pytest
+
+from dao import migration_dao
+from dao.migration_dao import MigrationDAO, load_migrations
+
+
+@pytest.fixture
+def sqlite_env(monkeypatch, split_unavailable, rollout_env, tmp_path):
+    path = str(tmp_path / "qb.sqlite")
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", path)
+    return path
+
+
+def _recorded(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [
+            row[0]
+            for row in conn.execute(
+                "SELECT version FROM schema_migrations ORDER BY version"
+            )
+        ]
+    finally:
+        conn.close()
+
+
+@pytest.mark.models
+def test_postgres_index_migrations_build_concurrently_outside_a_transaction():
+    migrations = {
+        m.version: m for m in load_migrations(migration_dao.migrations_dir(True))
+    }
+
+    assert migrations[1].transactional
+    for version in (2, 3):
+        assert not migrations[version].transactional
+        assert all("CONCURRENTLY" in sql for sql in migrations[version].statements)
+
+
+@pytest.mark.models
+def test_backends_ship_the_same_versions():
+    postgres = load_migrations(migration_dao.migrations_dir(True))
+    sqlite = load_migrations(migration_dao.migrations_dir(False))
+
+    assert [(m.version, m.name) for m in postgres] == [
+        (m.version, m.name) for m in sqlite
+    ]
+
+
+@pytest.mark.models
+def test_init_db_records_versions_and_later_boots_apply_nothing(sqlite_env):
+    import models
+
+    models.init_db()
+    versions = [m.version for m in load_migrations(migration_dao.migrations_dir(False))]
+    assert _recorded(sqlite_env) == versions
+
+    conn = models.get_db()
+    try:
+        assert MigrationDAO().migrate(conn) == []
+    finally:
+        conn.close()
+    assert all(entry["applied"] for entry in MigrationDAO().status())
+
+
+@pytest.mark.models
+def test_new_version_applies_alone_and_edited_files_only_warn(
+    sqlite_env, tmp_path, caplog
+):
+    import models
+
+    directory = tmp_path / "migrations"
+    directory.mkdir()
+    (directory / "001_t.sql").write_text("CREATE TABLE t (id INTEGER);\n")
+    conn = models.get_db()
+    try:
+        assert MigrationDAO().migrate(conn, str(directory)) == [1]
+
+        (directory / "001_t.sql").write_text("CREATE TABLE t (id TEXT);\n")
+        (directory / "002_u.sql").write_text(
+            "-- migrate: no-transaction\nCREATE INDEX IF NOT EXISTS idx_t ON t(id);\n"
+        )
+        assert MigrationDAO().migrate(conn, str(directory)) == [2]
+    finally:
+        conn.close()
+
+    assert "001_t changed after it was applied" in caplog.text
+    assert _recorded(sqlite_env) == [1, 2]
+
+
+@pytest.mark.models
+def test_failed_migration_is_not_recorded(sqlite_env, tmp_path):
+    import models
+
+    directory = tmp_path / "migrations"
+    directory.mkdir()
+    (directory / "001_bad.sql").write_text(
+        "CREATE TABLE ok (id INTEGER);\nCREATE TABLE nope (;\n"
+    )
+    conn = models.get_db()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            MigrationDAO().migrate(conn, str(directory))
+    finally:
+        conn.close()
+
+    assert _recorded(sqlite_env) == []
+
+
+class _FakePgConn:
+    """Records SQL; reports ``invalid`` from the pg_index lookups in turn."""
+
+    def __init__(self, invalid):
+        self.invalid = list(invalid)
+        self.sql = []
+        self.autocommit = False
+        self._rows = []
+
+    def commit(self):
+        pass
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.sql.append(" ".join(sql.split()))
+        if "pg_index" in sql:
+            self._rows = [{"relname": name} for name in self.invalid.pop(0)]
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.mark.models
+def test_invalid_concurrent_index_is_dropped_and_rebuilt(monkeypatch):
+    import models
+
+    monkeypatch.setattr(models, "_row_to_dict", dict)
+    (migration,) = [
+        m for m in load_migrations(migration_dao.migrations_dir(True)) if m.version == 2
+    ]
+    conn = _FakePgConn(invalid=[["idx_transactions_account_created_id"], []])
+
+    MigrationDAO()._run_outside_transaction(conn, conn, migration, postgres=True)
+
+    drop, create = conn.sql[1], conn.sql[2]
+    assert (
+        drop == "DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_account_created_id"
+    )
+    assert create.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS")
+    assert conn.autocommit is False
+
+
+@pytest.mark.models
+def test_index_still_invalid_after_the_build_is_not_recorded(monkeypatch):
+    import models
+
+    monkeypatch.setattr(models, "_row_to_dict", dict)
+    (migration,) = [
+        m for m in load_migrations(migration_dao.migrations_dir(True)) if m.version == 3
+    ]
+    conn = _FakePgConn(invalid=[[], ["idx_accounts_user_created"]])
+
+    with pytest.raises(
+        RuntimeError, match="invalid indexes: idx_accounts_user_created"
+    ):
+        MigrationDAO()._run_outside_transaction(conn, conn, migration, postgres=True)
+
+
+@pytest.mark.models
+def test_pre_existing_rewards_ledger_gets_its_index_from_005(sqlite_env, monkeypatch):
+    import models
+
+    monkeypatch.setenv("DEMO_ROLLOUT_SCHEMA", "on")
+    models.init_db()
+    # A ledger as an older build left it: no index, and 005 not yet applied.
+    raw = sqlite3.connect(sqlite_env)
+    raw.execute("DROP INDEX idx_rewards_ledger_user_id")
+    raw.execute("DELETE FROM schema_migrations WHERE version = 5")
+    raw.commit()
+
+    models.init_db()
+
+    indexes = {
+        row[0]
+        for row in raw.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    raw.close()
+    assert "idx_rewards_ledger_user_id" in indexes
+    assert _recorded(sqlite_env)[-1] == 5
+
+
+@pytest.mark.models
+def test_ledger_index_migration_is_a_no_op_without_the_ledger(sqlite_env):
+    import models
+
+    models.init_db()  # DEMO_ROLLOUT_SCHEMA off: no ledger
+
+    raw = sqlite3.connect(sqlite_env)
+    tables = {row[0] for row in raw.execute("SELECT name FROM sqlite_master")}
+    raw.close()
+    assert "rewards_ledger" not in tables
+    assert 5 in _recorded(sqlite_env)
@@ -0,0 +1,255 @@
+"""Money as integer minor units: parsing, formatting, and the 004 migration."""
+
+import shutil
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+import money
+from dao import migration_dao
+from dao.migration_dao import MigrationDAO
+
+
+@pytest.mark.models
+@pytest.mark.parametrize(
+    "value, currency, minor",
+    [
+        ("10", None, 1000),
+        ("0.1", None, 10),
+        (" 12.345 ", None, 1235),
+        (0.29, None, 29),
+        ("1500", "JPY", 1500),
+        ("1.5", "KRW", 2),
+    ],
+)
+def test_parse_amount_scales_to_minor_units_without_float_drift(value, currency, minor):
+    assert money.parse_amount(value, currency) == minor
+
+
+@pytest.mark.models
+@pytest.mark.parametrize(
+    "value", ["nan", "-inf", "Infinity", "abc", "", "0", "0.004", "-1", "1e30"]
+)
+def test_parse_amount_rejects_non_amounts(value):
+    with pytest.raises(ValueError):
+        money.parse_amount(value)
+
+
+@pytest.mark.models
+def test_formatting_happens_only_at_the_edges():
+    assert money.format_minor(123456789) == "1,234,567.89"
+    assert money.format_minor(-50000) == "-500.00"
+    assert money.format_minor(1500, "JPY") == "1,500"
+    assert money.to_major(542050) == Decimal("5420.50")
+    assert money.json_money({"id": 1, "balance": 542050, "currency": "USD"}) == {
+        "id": 1,
+        "balance": 5420.5,
+        "currency": "USD",
+    }
+
+
+@pytest.mark.models
+def test_migration_converts_existing_decimal_rows_to_cents(
+    monkeypatch, split_unavailable, rollout_env, tmp_path
+):
+    import models
+
+    path = str(tmp_path / "qb.sqlite")
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", path)
+
+    # A database as it looked before 004: REAL balances and amounts.
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    for migration in migration_dao.load_migrations(migration_dao.migrations_dir(False)):
+        if migration.version < 4:
+            name = f"{migration.version:03d}_{migration.name}.sql"
+            shutil.copy(f"{migration_dao.migrations_dir(False)}/{name}", legacy / name)
+    conn = models.get_db()
+    try:
+        MigrationDAO().migrate(conn, str(legacy))
+    finally:
+        conn.close()
+    raw = sqlite3.connect(path)
+    raw.execute("INSERT INTO users (username, email, full_name) VALUES ('u', 'e', 'n')")
+    raw.executemany(
+        "INSERT INTO accounts (user_id, account_type, account_number, balance, currency)"
+        " VALUES (1, ?, ?, ?, ?)",
+        [("checking", "A-1", 0.29, "USD"), ("savings", "A-2", 1500.0, "JPY")],
+    )
+    raw.executemany(
+        "INSERT INTO transactions (account_id, transaction_type, amount)"
+        " VALUES (?, 'deposit', ?)",
+        [(1, 1.25), (2, 1500.0)],
+    )
+    raw.commit()
+    raw.close()
+
+    models.init_db()
+
+    raw = sqlite3.connect(path)
+    try:
+        balances = raw.execute(
+            "SELECT balance, typeof(balance) FROM accounts ORDER BY id"
+        ).fetchall()
+        amounts = raw.execute(
+            "SELECT amount, typeof(amount) FROM transactions ORDER BY id"
+        ).fetchall()
+    finally:
+        raw.close()
+    assert balances == [(29, "integer"), (1500, "integer")]
+    assert amounts == [(125, "integer"), (1500, "integer")]
+
+
+@pytest.mark.models
+def test_reward_points_follow_the_currency_exponent():
+    import models
+
+    assert models._compute_reward_points(1999) == 1
+    assert models._compute_reward_points(1500, "JPY") == 150
+
+
+@pytest.mark.api
+def test_zero_decimal_currency_round_trips_through_transfer_and_history(client):
+    import models
+
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+    user_id = models.get_user_by_username("demo")["id"]
+    raw = sqlite3.connect(models.db_path())
+    ids = []
+    try:
+        for number in ("JPY-TEST-1", "JPY-TEST-2"):
+            ids.append(
+                raw.execute(
+                    "INSERT INTO accounts"
+                    " (user_id, account_type, account_number, balance, currency)"
+                    " VALUES (?, 'savings', ?, 100000, 'JPY')",
+                    (user_id, number),
+                ).lastrowid
+            )
+        raw.commit()
+
+        response = client.post(
+            "/api/transfer",
+            json={"from_account_id": ids[0], "to_account_id": ids[1], "amount": "1500"},
+        )
+        balance = client.get(f"/api/account/{ids[0]}").get_json()["account"]["balance"]
+        history = client.get("/api/transactions?limit=50").get_json()["transactions"]
+        page = client.get(f"/account?id={ids[0]}").get_data(as_text=True)
+    finally:
+        raw.execute(
+            f"DELETE FROM transactions WHERE account_id IN ({ids[0]}, {ids[1]})"
+        )
+        raw.execute(f"DELETE FROM accounts WHERE id IN ({ids[0]}, {ids[1]})")
+        raw.commit()
+        raw.close()
+
+    assert response.get_json()["success"] is True
+    assert balance == 98500
+    leg = next(t for t in history if t["account_id"] == ids[0])
+    assert (leg["amount"], leg["currency"]) == (-1500, "JPY")
+    assert "1,500" in page and "15.00" not in page
+
+
+@pytest.mark.models
+def test_transfers_between_currencies_are_rejected_on_both_paths():
+    import models
+
+    models.init_db()
+    user_id = models.get_user_by_username("demo")["id"]
+    checking = next(
+        a
+        for a in models.get_accounts_by_user(user_id)
+        if a["account_type"] == "checking"
+    )
+    raw = sqlite3.connect(models.db_path())
+    try:
+        jpy_id = raw.execute(
+            "INSERT INTO accounts"
+            " (user_id, account_type, account_number, balance, currency)"
+            " VALUES (?, 'savings', 'JPY-FX-1', 100000, 'JPY')",
+            (user_id,),
+        ).lastrowid
+        raw.commit()
+
+        single = models.transfer_money(checking["id"], jpy_id, 1000, "fx")
+        batch = models.transfer_many(
+            [
+                {
+                    "from_account_id": jpy_id,
+                    "to_account_id": checking["id"],
+                    "amount": 5,
+                },
+                {
+                    "from_account_id": checking["id"],
+                    "to_account_id": jpy_id,
+                    "amount": 5,
+                },
+            ]
+        )
+        balances = [
+            models.get_account_by_id(account_id)["balance"]
+            for account_id in (checking["id"], jpy_id)
+        ]
+    finally:
+        raw.execute("DELETE FROM transactions WHERE account_id = ?", (jpy_id,))
+        raw.execute("DELETE FROM accounts WHERE id = ?", (jpy_id,))
+        raw.commit()
+        raw.close()
+
+    assert single == (False, "Currency mismatch")
+    assert batch == [(False, "Currency mismatch")] * 2
+    assert balances == [checking["balance"], 100000]
+
+
+@pytest.mark.api
+def test_api_transfers_convert_in_the_dao_without_an_account_lookup(
+    client, monkeypatch
+):
+    import api.transfer
+
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+    accounts = {
+        a["account_type"]: a for a in client.get("/api/accounts").get_json()["accounts"]
+    }
+    checking, savings = accounts["checking"], accounts["savings"]
+
+    def no_lookup(user_id):
+        raise AssertionError("the API transfer path should not list accounts")
+
+    monkeypatch.setattr(api.transfer, "get_accounts_by_user", no_lookup)
+    single = client.post(
+        "/api/transfer",
+        json={
+            "from_account_id": checking["id"],
+            "to_account_id": savings["id"],
+            "amount": "1.50",
+        },
+    )
+    batch = client.post(
+        "/api/transfers/batch",
+        json={
+            "transfers": [
+                {
+                    "from_account_id": savings["id"],
+                    "to_account_id": checking["id"],
+                    "amount": 0.25,
+                },
+                {
+                    "from_account_id": savings["id"],
+                    "to_account_id": checking["id"],
+                    "amount": "0.001",
+                },
+            ]
+        },
+    )
+    after = client.get(f"/api/account/{checking['id']}").get_json()["account"]
+
+    assert single.get_json()["success"] is True
+    assert [r["message"] for r in batch.get_json()["results"]] == [
+        "Transfer successful",
+        "Invalid amount",
+    ]
+    assert after["balance"] == pytest.approx(checking["balance"] - 1.25)
@@ -0,0 +1,112 @@
+"""rewards_balance: per-user totals kept in step with the ledger by transfers."""
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def rewards_db(monkeypatch, split_unavailable, rollout_env, rewards_ledger_clean):
+    import models
+
+    monkeypatch.setenv("DEMO_ROLLOUT_SCHEMA", "on")
+    monkeypatch.setenv("DEMO_ROLLOUT_FEATURE", "on")
+    models.init_db()
+    user = models.get_user_by_username("demo")
+    accounts = {a["account_type"]: a for a in models.get_accounts_by_user(user["id"])}
+    return models, user["id"], accounts
+
+
+def _tamper(sql):
+    import os
+
+    conn = sqlite3.connect(os.environ["QUANTUM_BANK_DATABASE"])
+    try:
+        conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.mark.models
+def test_transfers_keep_the_summary_row_equal_to_the_ledger(rewards_db):
+    models, user_id, accounts = rewards_db
+
+    for amount in (1000, 2500, 500):
+        ok, _ = models.transfer_money(
+            accounts["checking"]["id"], accounts["savings"]["id"], amount, "pts"
+        )
+        assert ok
+
+    assert models.get_rewards_points_for_user(user_id) == (3, None)
+    assert models.verify_rewards_balances() == []
+
+
+@pytest.mark.models
+def test_failed_summary_write_leaves_no_ledger_row(rewards_db, monkeypatch):
+    from dao import statements
+
+    models, user_id, accounts = rewards_db
+    monkeypatch.setitem(
+        statements.REGISTRY,
+        "rewards.balance_add",
+        statements.compile_statement(
+            "rewards.balance_add", "UPDATE rewards_balance SET nope = ? WHERE 0 = ?"
+        ),
+    )
+
+    ok, _ = models.transfer_money(
+        accounts["checking"]["id"], accounts["savings"]["id"], 1000, "pts"
+    )
+
+    assert ok
+    monkeypatch.undo()
+    assert models.verify_rewards_balances() == []
+
+
+@pytest.mark.models
+def test_rebuild_repairs_drift(rewards_db):
+    models, user_id, accounts = rewards_db
+    models.transfer_money(
+        accounts["checking"]["id"], accounts["savings"]["id"], 2000, "pts"
+    )
+    _tamper("UPDATE rewards_balance SET points = 99")
+
+    assert models.verify_rewards_balances() == [
+        {"user_id": user_id, "ledger_points": 2, "balance_points": 99}
+    ]
+    assert models.rebuild_rewards_balances() == 1
+    assert models.verify_rewards_balances() == []
+
+
+@pytest.mark.models
+def test_cli_reports_drift_and_rebuilds(rewards_db):
+    from app import app
+
+    _tamper("INSERT INTO rewards_balance (user_id, points) VALUES (424242, 7)")
+    runner = app.test_cli_runner()
+
+    failed = runner.invoke(args=["rewards-balance"])
+    fixed = runner.invoke(args=["rewards-balance", "--rebuild"])
+
+    assert failed.exit_code == 1
+    assert "user 424242: ledger=0 balance=7" in failed.output
+    assert fixed.exit_code == 0
+    assert "matches" in fixed.output
+
+
+@pytest.mark.models
+def test_batch_transfers_earn_points_per_transfer(rewards_db):
+    models, user_id, accounts = rewards_db
+    leg = {
+        "from_account_id": accounts["checking"]["id"],
+        "to_account_id": accounts["savings"]["id"],
+    }
+
+    results = models.transfer_many(
+        [{**leg, "amount": 1500}, {**leg, "amount": 900}, {**leg, "amount": 3000}]
+    )
+
+    assert all(ok for ok, _ in results)
+    assert models.get_rewards_points_for_user(user_id) == (4, None)
+    assert models.verify_rewards_balances() == []
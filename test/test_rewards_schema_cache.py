@@ -0,0 +1,72 @@
+"""Rewards schema state is cached per database instead of probed per call."""
+
+import pytest
+
+from dao.helper_dao import HelperDAO
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    calls = []
+    real = HelperDAO.table_exists
+
+    def counting(cursor, table):
+        calls.append(table)
+        return real(cursor, table)
+
+    monkeypatch.setattr(HelperDAO, "table_exists", staticmethod(counting))
+    return calls
+
+
+@pytest.fixture
+def rewards_on(monkeypatch, split_unavailable, rollout_env, rewards_ledger_clean):
+    import models
+
+    monkeypatch.setenv("DEMO_ROLLOUT_SCHEMA", "on")
+    monkeypatch.setenv("DEMO_ROLLOUT_FEATURE", "on")
+    models.init_db()
+    user = models.get_user_by_username("demo")
+    accounts = {a["account_type"]: a for a in models.get_accounts_by_user(user["id"])}
+    return models, user["id"], accounts
+
+
+@pytest.mark.models
+def test_hot_paths_do_no_catalog_queries_after_init(rewards_on, probes):
+    models, user_id, accounts = rewards_on
+
+    for _ in range(3):
+        models.transfer_money(
+            accounts["checking"]["id"], accounts["savings"]["id"], 1000, "pts"
+        )
+        models.get_rewards_points_for_user(user_id)
+        models.get_dashboard(user_id)
+
+    assert probes == []
+    assert models.get_rewards_points_for_user(user_id) == (3, None)
+
+
+@pytest.mark.models
+def test_failed_rewards_read_invalidates_and_refresh_reprobes(
+    rewards_on, probes, monkeypatch
+):
+    from dao import statements
+
+    models, user_id, _ = rewards_on
+    with monkeypatch.context() as patch:
+        patch.setitem(
+            statements.REGISTRY,
+            "rewards.points_total",
+            statements.compile_statement(
+                "rewards.points_total", "SELECT missing_column FROM rewards_balance"
+            ),
+        )
+        assert models.get_rewards_points_for_user(user_id) == (
+            None,
+            "rollback_runtime_error",
+        )
+
+    assert models.get_rewards_points_for_user(user_id) == (0, None)
+    assert probes == ["rewards_ledger"]
+
+    assert models.refresh_rewards_schema_state() == "ready"
+    assert probes == ["rewards_ledger", "rewards_ledger"]
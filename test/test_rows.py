@@ -0,0 +1,54 @@
+"""Slotted row models: built from positional rows, read like the old dicts."""
+
+import sqlite3
+
+import pytest
+
+from dao import rows
+
+
+@pytest.mark.models
+def test_read_paths_return_slotted_models_that_behave_like_dicts(client):
+    import models
+
+    user = models.get_user_by_username("demo")
+    accounts = models.get_accounts_by_user(user["id"])
+    history = models.get_all_transactions_by_user(user["id"], limit=5)
+
+    assert isinstance(user, rows.User) and isinstance(accounts[0], rows.Account)
+    assert not hasattr(accounts[0], "__dict__")
+    checking = next(a for a in accounts if a["account_type"] == "checking")
+    assert checking.balance == checking["balance"] == dict(checking)["balance"]
+    assert checking.get("missing", "x") == "x" and "currency" in checking
+    with pytest.raises(KeyError):
+        checking["missing"]
+    assert models.get_account_by_id(checking.id) == checking.to_dict()
+    assert all(isinstance(t, rows.UserTransaction) for t in history)
+
+
+@pytest.mark.api
+def test_models_serialize_to_the_same_json_as_before(client):
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+
+    account = client.get("/api/accounts").get_json()["accounts"][0]
+
+    assert set(account) == set(rows.Account._fields)
+    assert isinstance(account["balance"], float)
+
+
+@pytest.mark.models
+def test_columns_are_matched_by_name_not_position():
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    # Postgres moves a rebuilt column to the end of SELECT *.
+    cursor.execute(
+        "SELECT 7 AS id, 1 AS account_id, 'deposit' AS transaction_type,"
+        " NULL AS description, NULL AS recipient, 'completed' AS status,"
+        " '2026-01-01' AS created_at, 250 AS amount"
+    )
+
+    (row,) = rows.fetch_all(cursor, rows.Transaction)
+
+    assert (row.id, row.amount, row.created_at) == (7, 250, "2026-01-01")
+    assert rows.row_factory(rows.Transaction, cursor)({"id": 1}).amount is None
+    conn.close()
@@ -0,0 +1,176 @@
+"""Split initialization runs in the background; readiness shows on /health."""
+
+import threading
+import time
+
+import pytest
+from splitio.exceptions import TimeoutException
+
+
+class FakeFactory:
+    """Becomes ready when ``ready`` is set; times out like the SDK otherwise."""
+
+    def __init__(self):
+        self.ready = threading.Event()
+
+    def client(self):
+        return self
+
+    def block_until_ready(self, timeout=None):
+        if not self.ready.wait(timeout):
+            raise TimeoutException("not ready")
+
+    def get_treatment(self, key, flag, attributes=None):
+        return "on" if self.ready.is_set() else "control"
+
+    def destroy(self):
+        self.ready.set()
+
+
+@pytest.fixture
+def fake_split(monkeypatch):
+    import app  # noqa: F401  (boot with the real env, before the fake)
+    import split_config
+
+    factory = FakeFactory()
+    split_config.destroy_split()
+    monkeypatch.delenv("FLAG_FILE", raising=False)
+    monkeypatch.delenv(split_config.BLOCK_ENV, raising=False)
+    monkeypatch.setattr(split_config, "SPLIT_API_KEY", "sdk-key")
+    monkeypatch.setattr(split_config, "_get_factory", lambda key, config: factory)
+    yield split_config, factory
+    split_config.destroy_split()
+
+
+def _wait_for(split_config, state):
+    for _ in range(200):
+        if split_config.split_status()["state"] == state:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(split_config.split_status())
+
+
+@pytest.mark.public
+def test_app_serves_before_split_is_ready(fake_split, client):
+    split_config, factory = fake_split
+
+    assert split_config.init_split() is factory  # returned without waiting
+
+    health = client.get("/health").get_json()
+    assert health["status"] == "ok"
+    assert health["flags"] == {
+        "state": "initializing",
+        "ready": False,
+        "time_to_ready_seconds": None,
+    }
+    assert client.get("/").status_code == 200  # default treatments meanwhile
+
+    factory.ready.set()
+    _wait_for(split_config, "ready")
+
+    flags = client.get("/health").get_json()["flags"]
+    assert flags["ready"] and flags["time_to_ready_seconds"] >= 0
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'split_ready{state="ready"} 1' in metrics
+    assert "split_time_to_ready_seconds " in metrics
+
+
+@pytest.mark.public
+def test_a_slow_sdk_times_out_then_still_becomes_ready(fake_split, monkeypatch):
+    split_config, factory = fake_split
+    monkeypatch.setenv(split_config.READY_TIMEOUT_ENV, "0.1")
+
+    split_config.init_split(block=True)
+
+    assert split_config.split_status()["state"] == "timed_out"
+    factory.ready.set()
+    _wait_for(split_config, "ready")
+
+
+@pytest.mark.public
+def test_a_replaced_factory_cannot_overwrite_its_successors_state(
+    fake_split, monkeypatch
+):
+    split_config, _ = fake_split
+
+    class LingeringFactory(FakeFactory):
+        def destroy(self):
+            pass  # its waiter keeps blocking past destroy_split()
+
+    old, new = LingeringFactory(), FakeFactory()
+    factories = iter([old, new])
+    monkeypatch.setattr(split_config, "_get_factory", lambda *a: next(factories))
+
+    split_config.init_split()
+    split_config.init_split()  # destroys the old client, starts the new one
+    old.ready.set()  # the old waiter now returns "ready" for a dead factory
+    for thread in threading.enumerate():
+        if thread.name == "split-ready":
+            thread.join(0.2)  # the old waiter finishes; the new one keeps waiting
+
+    assert split_config.split_status()["state"] == "initializing"
+    new.ready.set()
+    _wait_for(split_config, "ready")
+
+
+@pytest.mark.public
+def test_missing_key_is_not_retried_on_every_lookup(fake_split, monkeypatch):
+    split_config, _ = fake_split
+    monkeypatch.setattr(split_config, "SPLIT_API_KEY", None)
+    calls = []
+    monkeypatch.setattr(split_config, "_get_factory", lambda *a: calls.append(a))
+
+    assert split_config.get_split_client() is None
+    assert split_config.get_split_client() is None
+
+    assert split_config.split_status()["state"] == "disabled"
+    assert calls == []
+
+
+@pytest.mark.models
+def test_backend_switched_on_after_boot_is_initialized_before_use(
+    fake_split, monkeypatch
+):
+    import sqlite3
+
+    import db_flags
+    import models
+    import treatment_cache
+
+    split_config, factory = fake_split
+    monkeypatch.setenv("DATABASE_URL", "postgresql://example/qb")
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("DB_POOL_SIZE", "0")
+    monkeypatch.setattr(db_flags, "_backend_cache", None)
+    monkeypatch.setattr(models, "_initialized_backends", {"sqlite"})  # booted
+    monkeypatch.setattr(
+        models, "_connect_postgres", lambda dsn: sqlite3.connect(":memory:")
+    )
+    initialized = []
+
+    def fake_init_db():
+        initialized.append(models.using_postgres())
+        models.get_db().close()  # init's own queries must not re-enter init
+        models._initialized_backends.add("postgres")
+
+    monkeypatch.setattr(models, "init_db", fake_init_db)
+    monkeypatch.setattr(db_flags, "STARTING_BACKEND_CACHE_TTL", 0.05)
+    split_config.init_split()
+
+    # Still starting: "control" -> env says SQLite, cached only briefly.
+    assert models.using_postgres() is False
+    assert db_flags._backend_cache[1] - time.monotonic() <= 0.05
+
+    factory.ready.set()
+    _wait_for(split_config, "ready")
+    treatment_cache.clear_treatment_cache()
+    time.sleep(0.06)
+    try:
+        assert models.using_postgres() is True
+        models.get_db().close()
+        models.get_db().close()
+    finally:
+        db_flags._backend_cache = None
+        treatment_cache.clear_treatment_cache()
+
+    assert initialized == [True]
@@ -0,0 +1,91 @@
+"""SQLite index parity: DAO lookups are index searches, not table scans."""
+
+import sqlite3
+
+import pytest
+
+import dao.account_dao  # noqa: F401  (registers statements)
+import dao.transaction_dao  # noqa: F401
+from dao import statements
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch, split_unavailable, rollout_env, tmp_path):
+    import models
+
+    path = str(tmp_path / "qb.sqlite")
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", path)
+    monkeypatch.setenv("DEMO_ROLLOUT_SCHEMA", "on")
+    models.init_db()
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def _plan(conn, name, params):
+    rows = conn.execute(
+        "EXPLAIN QUERY PLAN " + statements.REGISTRY[name].sqlite, params
+    ).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def _index_names(conn):
+    return {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+
+
+@pytest.mark.models
+def test_sqlite_schema_has_index_parity_with_postgres(sqlite_db):
+    assert {
+        "idx_accounts_user_created",
+        "idx_transactions_account_created_id",
+        "idx_transactions_created_at",
+        "idx_cards_account_id",
+        "idx_rewards_ledger_user_id",
+    } <= _index_names(sqlite_db)
+
+
+@pytest.mark.models
+@pytest.mark.parametrize(
+    "name, params",
+    [
+        ("accounts.by_user", (1,)),
+        ("cards.by_account", (1,)),
+        ("transactions.by_account", (1, 10)),
+        ("transactions.by_account_before", (1, "2026-01-01", 5, 10)),
+    ],
+)
+def test_dao_lookups_search_an_index_without_sorting(sqlite_db, name, params):
+    plan = _plan(sqlite_db, name, params)
+
+    assert "USING" in plan and "INDEX" in plan, plan
+    assert "SCAN" not in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.models
+def test_rewards_total_is_a_primary_key_lookup(sqlite_db):
+    plan = _plan(sqlite_db, "rewards.points_total", (1,))
+
+    assert "SEARCH rewards_balance USING INTEGER PRIMARY KEY" in plan, plan
+
+
+@pytest.mark.models
+def test_user_history_reads_only_the_users_transactions(sqlite_db):
+    plan = _plan(sqlite_db, "transactions.by_user", (1, 20))
+
+    assert "SEARCH t USING INDEX idx_transactions_account_created_id" in plan, plan
+
+
+@pytest.mark.models
+def test_index_creation_is_idempotent_across_boots(sqlite_db):
+    import models
+
+    before = _index_names(sqlite_db)
+    models.init_db()
+
+    assert _index_names(sqlite_db) == before
@@ -0,0 +1,79 @@
+"""SQLite performance profile: PRAGMAs on every connection, BEGIN IMMEDIATE writes."""
+
+import sqlite3
+
+import pytest
+
+
+def _pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+@pytest.mark.models
+def test_new_sqlite_connection_gets_wal_profile(tmp_path):
+    import models
+
+    conn = models._connect_sqlite(str(tmp_path / "profile.sqlite"))
+    try:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "busy_timeout") == 5000
+        assert _pragma(conn, "temp_store") == 2  # MEMORY
+        assert _pragma(conn, "cache_size") == -20000
+    finally:
+        conn.close()
+
+
+@pytest.mark.models
+def test_sqlite_profile_honors_env_overrides(tmp_path, monkeypatch):
+    import models
+
+    monkeypatch.setenv("SQLITE_JOURNAL_MODE", "delete")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "250")
+
+    conn = models._connect_sqlite(str(tmp_path / "profile.sqlite"))
+    try:
+        assert _pragma(conn, "journal_mode") == "delete"
+        assert _pragma(conn, "busy_timeout") == 250
+    finally:
+        conn.close()
+
+
+@pytest.mark.models
+def test_sqlite_profile_ignores_invalid_override(monkeypatch):
+    import models
+
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "NORMAL; DROP TABLE users")
+    monkeypatch.setenv("SQLITE_MMAP_SIZE", "lots")
+
+    pragmas = models.sqlite_pragmas()
+
+    assert pragmas["synchronous"] == "NORMAL"
+    assert pragmas["mmap_size"] == models.SQLITE_PRAGMA_DEFAULTS["mmap_size"][1]
+
+
+@pytest.mark.models
+def test_transfer_commits_while_another_connection_holds_a_read_snapshot(
+    monkeypatch, split_unavailable, tmp_path
+):
+    import models
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("POSTGRES_DATABASE", "off")
+    monkeypatch.setenv("QUANTUM_BANK_DATABASE", str(tmp_path / "qb.sqlite"))
+    models.init_db()
+    user = models.get_user_by_username("demo")
+    accounts = models.get_accounts_by_user(user["id"])
+    checking = next(a for a in accounts if a["account_type"] == "checking")
+    savings = next(a for a in accounts if a["account_type"] == "savings")
+
+    reader = sqlite3.connect(str(tmp_path / "qb.sqlite"))
+    try:
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM transactions").fetchone()
+
+        ok, message = models.transfer_money(checking["id"], savings["id"], 500)
+
+        assert (ok, message) == (True, "Transfer successful")
+    finally:
+        reader.close()
@@ -0,0 +1,63 @@
+"""Boot profiling and lazily imported route handlers."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.public
+def test_boot_report_phases_and_lazy_modules(tmp_path):
+    report_path = tmp_path / "boot.json"
+    env = {
+        **os.environ,
+        "STARTUP_PROFILE": str(report_path),
+        "QUANTUM_BANK_DATABASE": str(tmp_path / "boot.sqlite"),
+        "POSTGRES_DATABASE": "off",
+    }
+    env.pop("SPLIT_API_KEY", None)
+    env.pop("FLAG_FILE", None)
+    probe = (
+        "import sys, app; print(' '.join(m for m in sys.modules"
+        " if m.startswith(('api.', 'splitio'))))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    loaded = set(result.stdout.split("\n")[-2].split())
+    assert "api.home" in loaded and "api.api_endpoints" in loaded
+    assert not loaded & {"api.llms_full_txt", "api.sitemap_xml", "api.home_static"}
+    assert not any(m.startswith("splitio") for m in loaded)  # no key, no SDK
+    assert "Startup:" in result.stdout
+    report = json.loads(report_path.read_text())
+    assert [p["phase"] for p in report["phases"]] == [
+        "dotenv",
+        "imports",
+        "app_setup",
+        "flag_init",
+        "db_init",
+        "routes",
+        "templates",
+    ]
+    assert report["total_seconds"] >= report["phases"][1]["seconds"] > 0
+
+
+@pytest.mark.public
+def test_lazy_routes_still_serve_and_phases_are_exported(client):
+    for path in ("/llms.txt", "/llms-full.txt", "/sitemap.xml", "/hello", "/about"):
+        assert client.get(path).status_code == 200, path
+    assert client.get("/old-pricing-static").status_code == 200
+
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'app_startup_phase_seconds{phase="db_init"}' in metrics
@@ -0,0 +1,112 @@
+"""Statement registry: per-backend SQL compiled once, optional PG prepared plans."""
+
+import pytest
+
+from dao import statements
+
+
+class _FakeConnection:
+    pass
+
+
+class _FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+
+@pytest.fixture
+def postgres_backend(monkeypatch):
+    import models
+
+    monkeypatch.setattr(models, "using_postgres", lambda: True)
+
+
+@pytest.mark.models
+def test_compile_derives_postgres_placeholders_and_returning():
+    stmt = statements.compile_statement(
+        "t.insert", "INSERT INTO t (a, b) VALUES (?, ?);", returning_id=True
+    )
+
+    assert stmt.sqlite == "INSERT INTO t (a, b) VALUES (?, ?)"
+    assert stmt.postgres == "INSERT INTO t (a, b) VALUES (%s, %s) RETURNING id"
+    assert stmt.prepare_sql == (
+        "PREPARE qb_t_insert AS INSERT INTO t (a, b) VALUES ($1, $2) RETURNING id"
+    )
+    assert stmt.execute_sql == "EXECUTE qb_t_insert (%s, %s)"
+
+
+@pytest.mark.models
+def test_explicit_postgres_text_is_used_verbatim_and_never_prepared():
+    stmt = statements.compile_statement(
+        "t.exists", "SELECT 1 FROM sqlite_master", postgres="SELECT true"
+    )
+
+    assert stmt.postgres == "SELECT true"
+    assert stmt.execute_sql is None
+
+
+@pytest.mark.models
+def test_every_dao_query_is_registered():
+    import dao.account_dao  # noqa: F401
+    import dao.helper_dao  # noqa: F401
+    import dao.schema_dao  # noqa: F401
+    import dao.transaction_dao  # noqa: F401
+    import dao.user_dao  # noqa: F401
+    import dao.write_dao  # noqa: F401
+
+    assert {
+        "accounts.by_user",
+        "accounts.by_id",
+        "cards.by_account",
+        "transactions.by_account",
+        "transactions.by_user",
+        "rewards.points_total",
+        "rewards.insert",
+        "transactions.insert",
+        "users.by_username",
+        "users.profile",
+        "catalog.table_exists",
+    } <= set(statements.REGISTRY)
+
+
+@pytest.mark.models
+def test_execute_uses_precompiled_postgres_text(postgres_backend, monkeypatch):
+    monkeypatch.setitem(
+        statements.REGISTRY,
+        "t.by_id",
+        statements.compile_statement("t.by_id", "SELECT * FROM t WHERE id = ?"),
+    )
+    cursor = _FakeCursor(_FakeConnection())
+
+    statements.execute(cursor, "t.by_id", (7,))
+
+    assert cursor.executed == [("SELECT * FROM t WHERE id = %s", (7,))]
+
+
+@pytest.mark.models
+def test_prepared_mode_prepares_once_per_connection(postgres_backend, monkeypatch):
+    monkeypatch.setenv("PG_PREPARED_STATEMENTS", "on")
+    monkeypatch.setitem(
+        statements.REGISTRY,
+        "t.by_id",
+        statements.compile_statement("t.by_id", "SELECT * FROM t WHERE id = ?"),
+    )
+    conn = _FakeConnection()
+    first, second = _FakeCursor(conn), _FakeCursor(conn)
+
+    statements.execute(first, "t.by_id", (1,))
+    statements.execute(second, "t.by_id", (2,))
+
+    assert first.executed == [
+        ("PREPARE qb_t_by_id AS SELECT * FROM t WHERE id = $1", None),
+        ("EXECUTE qb_t_by_id (%s)", (1,)),
+    ]
+    assert second.executed == [("EXECUTE qb_t_by_id (%s)", (2,))]
+
+    other = _FakeCursor(_FakeConnection())
+    statements.execute(other, "t.by_id", (3,))
+    assert other.executed[0][0].startswith("PREPARE qb_t_by_id")
@@ -0,0 +1,50 @@
+"""Streaming export: GET /api/transactions/export?format=csv|ndjson."""
+
+import csv
+import io
+import json
+
+import pytest
+
+import models
+
+
+def _login_and_get_checking(client):
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+    accounts = client.get("/api/accounts").get_json()["accounts"]
+    return next(a for a in accounts if a["account_type"] == "checking")
+
+
+@pytest.mark.api
+def test_export_requires_login_and_a_known_format(client):
+    assert client.get("/api/transactions/export").status_code == 401
+
+    _login_and_get_checking(client)
+
+    assert client.get("/api/transactions/export?format=xml").status_code == 400
+
+
+@pytest.mark.api
+def test_csv_and_ndjson_stream_the_whole_history_in_chunks(client, monkeypatch):
+    from api import api_endpoints
+
+    checking = _login_and_get_checking(client)
+    for n in range(5):
+        models.create_transaction(checking["id"], "deposit", 125, f"exp-{n}", "pytest")
+    monkeypatch.setattr(api_endpoints, "EXPORT_CHUNK_ROWS", 2)
+    everything = client.get("/api/transactions?limit=200").get_json()["transactions"]
+
+    response = client.get("/api/transactions/export?format=csv")
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+    records = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+    lines = client.get("/api/transactions/export?format=ndjson").get_data(as_text=True)
+    ndjson = [json.loads(line) for line in lines.splitlines()]
+
+    assert [int(r["id"]) for r in records] == [t["id"] for t in ndjson]
+    assert len(records) >= len(everything) >= 5
+    newest = next(r for r in records if r["description"] == "exp-4")
+    assert (newest["amount"], newest["currency"]) == ("1.25", "USD")
+    assert next(t for t in ndjson if t["description"] == "exp-4")["amount"] == 1.25
@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination for /api/transactions, /transactions and account detail."""
+
+import pytest
+
+import models
+
+
+def _login_and_get_checking(client):
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+    accounts = client.get("/api/accounts").get_json()["accounts"]
+    return next(a for a in accounts if a["account_type"] == "checking")
+
+
+def _add_transactions(account_id, count):
+    # Same-second inserts: ordering must fall back to id to stay stable.
+    for n in range(count):
+        models.create_transaction(account_id, "deposit", 1, f"page-{n}", "pytest")
+
+
+@pytest.mark.models
+def test_cursor_round_trips_and_rejects_tampering():
+    token = models.encode_cursor({"created_at": "2026-01-02 03:04:05", "id": 42})
+
+    assert models.decode_cursor(token) == ("2026-01-02 03:04:05", 42)
+    for bad in ("not-a-cursor", token[:-3], "WzEsMl0"):
+        with pytest.raises(models.InvalidCursor):
+            models.decode_cursor(bad)
+
+
+@pytest.mark.api
+def test_api_transactions_pages_cover_history_without_gaps(client):
+    checking = _login_and_get_checking(client)
+    _add_transactions(checking["id"], 7)
+    everything = client.get("/api/transactions?limit=200").get_json()["transactions"]
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/transactions?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        assert len(body["transactions"]) <= 3
+        seen.extend(t["id"] for t in body["transactions"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [t["id"] for t in everything]
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.api
+@pytest.mark.parametrize(
+    "query", ["cursor=garbage", "limit=0", "limit=1000", "limit=ten"]
+)
+def test_api_transactions_rejects_bad_paging_params(client, query):
+    _login_and_get_checking(client)
+
+    response = client.get(f"/api/transactions?{query}")
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+@pytest.mark.banking
+def test_account_detail_links_to_older_transactions(client):
+    checking = _login_and_get_checking(client)
+    _add_transactions(checking["id"], 25)
+
+    first = client.get(f"/account?id={checking['id']}")
+    assert b'data-testid="older-transactions"' in first.data
+
+    _, next_cursor = models.get_transactions_page_by_account(checking["id"], 20)
+    older = client.get(f"/account?id={checking['id']}&cursor={next_cursor}")
+
+    assert older.status_code == 200
+    assert b"Back to Dashboard" in older.data
+
+
+@pytest.mark.banking
+def test_transactions_page_with_invalid_cursor_restarts_at_first_page(client):
+    _login_and_get_checking(client)
+
+    response = client.get("/transactions?cursor=garbage", follow_redirects=False)
+
+    assert response.status_code in (302, 303)
+    assert response.headers["Location"].endswith("/transactions")
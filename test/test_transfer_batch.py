@@ -0,0 +1,204 @@
+"""Batch transfers: POST /api/transfers/batch and models.transfer_many."""
+
+import pytest
+
+import models
+import money
+
+
+def _login_and_accounts(client):
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+    accounts = client.get("/api/accounts").get_json()["accounts"]
+    return {a["account_type"]: a for a in accounts}
+
+
+@pytest.mark.api
+def test_batch_requires_login(client):
+    client.get("/logout")
+
+    response = client.post("/api/transfers/batch", json={"transfers": []})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.api
+@pytest.mark.parametrize("body", [{}, {"transfers": []}, {"transfers": "x"}])
+def test_batch_rejects_malformed_body(client, body):
+    _login_and_accounts(client)
+
+    response = client.post("/api/transfers/batch", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+@pytest.mark.api
+def test_batch_reports_each_item_and_applies_only_accepted_ones(client):
+    accounts = _login_and_accounts(client)
+    checking, savings = accounts["checking"], accounts["savings"]
+    overdraw = checking["balance"] - 2.0
+
+    response = client.post(
+        "/api/transfers/batch",
+        json={
+            "transfers": [
+                {
+                    "from_account_id": checking["id"],
+                    "to_account_id": savings["id"],
+                    "amount": 1.0,
+                    "description": "batch-1",
+                },
+                {
+                    "from_account_id": checking["id"],
+                    "to_account_id": savings["id"],
+                    "amount": "nan",
+                },
+                {"from_account_id": checking["id"]},
+                {
+                    "from_account_id": checking["id"],
+                    "to_account_id": 999999,
+                    "amount": 1.0,
+                },
+                # Running balance: only 1.00 of the first item is already gone.
+                {
+                    "from_account_id": checking["id"],
+                    "to_account_id": savings["id"],
+                    "amount": overdraw,
+                },
+                {
+                    "from_account_id": checking["id"],
+                    "to_account_id": savings["id"],
+                    "amount": 5.0,
+                },
+                {
+                    "from_account_id": savings["id"],
+                    "to_account_id": savings["id"],
+                    "amount": 1.0,
+                },
+            ]
+        },
+    )
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert [(r["success"], r["message"]) for r in body["results"]] == [
+        (True, "Transfer successful"),
+        (False, "Invalid amount"),
+        (False, "Missing required fields"),
+        (False, "Account not found"),
+        (True, "Transfer successful"),
+        (False, "Insufficient funds"),
+        (False, "Cannot transfer to the same account"),
+    ]
+    assert (body["succeeded"], body["failed"], body["success"]) == (2, 5, False)
+
+    after = _login_and_accounts(client)
+    assert after["checking"]["balance"] == pytest.approx(1.0)
+    assert after["savings"]["balance"] == pytest.approx(
+        savings["balance"] + 1.0 + overdraw
+    )
+
+    # Reverse the movement so the shared demo balances stay stable for later tests.
+    # The API speaks dollars; models take cents.
+    models.transfer_money(
+        savings["id"], checking["id"], money.parse_amount(1.0 + overdraw), "undo"
+    )
+
+
+@pytest.mark.models
+def test_transfer_many_enforces_ownership_and_writes_both_legs(client):
+    accounts = _login_and_accounts(client)
+    checking, savings = accounts["checking"], accounts["savings"]
+    before = len(models.get_transactions_by_account(savings["id"], limit=500))
+
+    results = models.transfer_many(
+        [
+            {
+                "from_account_id": checking["id"],
+                "to_account_id": savings["id"],
+                "amount": 50,
+            },
+            {
+                "from_account_id": checking["id"],
+                "to_account_id": savings["id"],
+                "amount": 25,
+            },
+        ],
+        acting_user_id=checking["user_id"] + 1000,
+    )
+    assert results == [(False, "Forbidden"), (False, "Forbidden")]
+
+    results = models.transfer_many(
+        [
+            {
+                "from_account_id": checking["id"],
+                "to_account_id": savings["id"],
+                "amount": 50,
+            },
+            {
+                "from_account_id": savings["id"],
+                "to_account_id": checking["id"],
+                "amount": 50,
+            },
+        ],
+        acting_user_id=checking["user_id"],
+    )
+
+    assert results == [(True, "Transfer successful")] * 2
+    history = models.get_transactions_by_account(savings["id"], limit=500)
+    assert len(history) == before + 2
+    assert {t["amount"] for t in history[:2]} == {50, -50}
+
+
+@pytest.mark.api
+def test_single_transfer_rejects_the_same_account_like_the_batch(client):
+    accounts = _login_and_accounts(client)
+    savings = accounts["savings"]
+
+    response = client.post(
+        "/api/transfer",
+        json={
+            "from_account_id": savings["id"],
+            "to_account_id": savings["id"],
+            "amount": 1.0,
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Cannot transfer to the same account"
+
+
+@pytest.mark.models
+def test_batch_rewards_go_through_the_same_seam(client, monkeypatch):
+    accounts = _login_and_accounts(client)
+    checking, savings = accounts["checking"], accounts["savings"]
+    calls = []
+
+    def record(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("boom")  # like transfer_money: never fails the batch
+
+    monkeypatch.setattr(models, "try_insert_rewards_points", record)
+
+    results = models.transfer_many(
+        [
+            {
+                "from_account_id": checking["id"],
+                "to_account_id": savings["id"],
+                "amount": 2000,
+            },
+            {
+                "from_account_id": savings["id"],
+                "to_account_id": checking["id"],
+                "amount": 2000,
+            },
+        ],
+        acting_user_id=checking["user_id"],
+    )
+
+    assert results == [(True, "Transfer successful")] * 2
+    assert [(c["source_account_id"], c["transfer_amount"]) for c in calls] == [
+        (checking["id"], 2000),
+        (savings["id"], 2000),
+    ]
+    assert calls[0]["currency"] == checking["currency"]
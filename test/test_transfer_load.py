@@ -0,0 +1,66 @@
+"""Transfer load harness: concurrent in-process run and the conservation check."""
+
+import pytest
+
+
+@pytest.mark.api
+def test_concurrent_transfers_conserve_money_and_report_every_operation(client):
+    from app import app
+    from bench.transfer_load import InProcessClient, parse_mix, run_load
+
+    mix = parse_mix("transfer=5,accounts=1,transactions=1,account=1,dashboard=1")
+
+    report = run_load(
+        lambda: InProcessClient(app),
+        backend="sqlite",
+        usernames=["demo"],
+        concurrency=4,
+        duration=0.5,
+        mix=mix,
+    )
+
+    assert report["conservation"]["ok"], report["conservation"]
+    assert report["error_rate"] == 0
+    assert set(report["ops"]) == set(mix)
+    transfer = report["ops"]["transfer"]
+    assert transfer["ops"] == transfer["ok"] + transfer["rejected"] > 0
+    assert 0 < transfer["p50_ms"] <= transfer["p99_ms"]
+
+
+@pytest.mark.api
+def test_more_concurrent_writers_than_pooled_connections(client, monkeypatch):
+    """A request holds one pooled connection at a time, so writers outnumbering
+    DB_POOL_SIZE queue briefly instead of deadlocking on the pool."""
+    import db_pool
+    from app import app
+    from bench.transfer_load import InProcessClient, parse_mix, run_load
+
+    monkeypatch.setenv(db_pool.POOL_SIZE_ENV, "2")
+    monkeypatch.setenv(db_pool.POOL_TIMEOUT_ENV, "2")
+    db_pool.close_all_pools()
+    try:
+        report = run_load(
+            lambda: InProcessClient(app),
+            backend="sqlite",
+            usernames=["demo"],
+            concurrency=6,
+            duration=0.5,
+            mix=parse_mix("transfer=3,transactions=1"),
+        )
+    finally:
+        db_pool.close_all_pools()
+
+    assert report["error_rate"] == 0, report["ops"]
+    assert report["ops"]["transfer"]["ok"] > 0
+    assert report["conservation"]["ok"], report["conservation"]
+
+
+@pytest.mark.api
+def test_parse_mix_rejects_unknown_operations():
+    from bench.transfer_load import parse_mix
+
+    assert parse_mix("transfer=3, accounts") == {"transfer": 3.0, "accounts": 1.0}
+    with pytest.raises(ValueError, match="unknown operation"):
+        parse_mix("transfer=1,delete_everything=1")
+    with pytest.raises(ValueError):
+        parse_mix("transfer=0")
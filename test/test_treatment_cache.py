@@ -0,0 +1,132 @@
+"""Split treatment cache: per-request memo, shared LRU/TTL and batching."""
+
+import pytest
+
+
+class FakeSplit:
+    """Records SDK calls; every flag resolves to ``treatments.get(flag, "on")``."""
+
+    def __init__(self, **treatments):
+        self.treatments = treatments
+        self.calls = []
+
+    def get_treatment(self, key, flag, attributes=None):
+        self.calls.append(("get_treatment", key, (flag,), attributes))
+        return self.treatments.get(flag, "on")
+
+    def get_treatments(self, key, flags, attributes=None):
+        self.calls.append(("get_treatments", key, tuple(flags), attributes))
+        return {flag: self.treatments.get(flag, "on") for flag in flags}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    import treatment_cache
+
+    monkeypatch.delenv(treatment_cache.TTL_ENV, raising=False)
+    monkeypatch.delenv(treatment_cache.SIZE_ENV, raising=False)
+    treatment_cache.clear_treatment_cache()
+    yield treatment_cache
+    treatment_cache.clear_treatment_cache()
+
+
+@pytest.mark.public
+def test_request_memo_and_shared_cache_skip_the_sdk(cache, monkeypatch):
+    from app import app
+
+    split = FakeSplit()
+    monkeypatch.setenv(cache.TTL_ENV, "0")  # memo only
+    with app.test_request_context("/"):
+        for _ in range(3):
+            assert cache.get_treatment(split, "1.2.3.4", "demo_mode") == "on"
+    with app.test_request_context("/"):
+        cache.get_treatment(split, "1.2.3.4", "demo_mode")
+    assert len(split.calls) == 2  # once per request
+
+    monkeypatch.setenv(cache.TTL_ENV, "30")
+    before = cache.treatment_cache_stats()
+    for _ in range(3):
+        with app.test_request_context("/"):
+            cache.get_treatment(split, "1.2.3.4", "demo_mode", {"url-entry": "/"})
+    assert len(split.calls) == 3  # shared across requests
+    stats = cache.treatment_cache_stats()
+    assert stats["shared_hits"] - before["shared_hits"] == 2
+    assert stats["misses"] - before["misses"] == 1
+
+
+@pytest.mark.public
+def test_shared_entries_expire_and_control_is_never_shared(cache, monkeypatch):
+    split = FakeSplit(home_page_variant="control")
+    clock = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: clock[0])
+    monkeypatch.setenv(cache.TTL_ENV, "10")
+
+    cache.get_treatment(split, "k", "demo_mode")
+    clock[0] += 9
+    cache.get_treatment(split, "k", "demo_mode")
+    assert len(split.calls) == 1
+    clock[0] += 2
+    cache.get_treatment(split, "k", "demo_mode")
+    assert len(split.calls) == 2
+
+    cache.get_treatment(split, "k", "home_page_variant")
+    cache.get_treatment(split, "k", "home_page_variant")
+    assert len(split.calls) == 4
+
+
+@pytest.mark.public
+def test_misses_are_batched_and_the_lru_stays_bounded(cache, monkeypatch):
+    split = FakeSplit(home_page_variant="old_home")
+    monkeypatch.setenv(cache.SIZE_ENV, "2")
+
+    cache.get_treatment(split, "k", "demo_mode")
+    treatments = cache.get_treatments(split, "k", ("demo_mode", "home_page_variant"))
+
+    assert treatments == {"demo_mode": "on", "home_page_variant": "old_home"}
+    # Only the miss goes to the SDK; two misses share one call.
+    assert split.calls[-1] == ("get_treatment", "k", ("home_page_variant",), None)
+    cache.get_treatments(split, "new", ("demo_mode", "home_page_variant"))
+    assert split.calls[-1][:3] == (
+        "get_treatments",
+        "new",
+        ("demo_mode", "home_page_variant"),
+    )
+    evictions = cache.treatment_cache_stats()["evictions"]
+    cache.get_treatment(split, "other", "demo_mode")
+    assert cache.treatment_cache_stats()["evictions"] == evictions + 1
+    assert cache.treatment_cache_stats()["entries"] == 2
+
+
+@pytest.mark.public
+def test_home_page_repeat_renders_skip_the_sdk_and_metrics_report_hits(
+    cache, client, monkeypatch
+):
+    split = FakeSplit(demo_mode="off", home_page_variant="old_home")
+    monkeypatch.setattr("api.home.get_split_client", lambda: split)
+
+    assert client.get("/").status_code == 200
+    assert client.get("/").status_code == 200
+
+    assert [call[2] for call in split.calls] == [
+        ("demo_mode",),
+        ("home_page_variant",),
+    ]
+    metrics = client.get("/metrics").get_data(as_text=True)
+    assert 'split_treatment_cache_hits_total{layer="request"}' in metrics
+    assert "split_treatment_sdk_calls_total" in metrics
+
+
+@pytest.mark.public
+@pytest.mark.parametrize("path, flags", [("/demo", []), ("/", [("demo_mode",)])])
+def test_demo_renders_never_evaluate_the_page_variant(
+    cache, client, monkeypatch, path, flags
+):
+    # Forced by the /demo path or turned on by the flag: the wrapper shows no
+    # single variant, so home_page_variant must not record an impression.
+    split = FakeSplit(demo_mode="on", home_page_variant="old_home")
+    monkeypatch.setattr("api.home.get_split_client", lambda: split)
+
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert [call[2] for call in split.calls] == flags
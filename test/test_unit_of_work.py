@@ -0,0 +1,93 @@
+"""Request-scoped unit of work: one pooled connection per page, not one per DAO."""
+
+import pytest
+
+
+@pytest.fixture
+def count_get_db(monkeypatch):
+    import models
+
+    calls = []
+    original = models.get_db
+
+    def counting_get_db():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(models, "get_db", counting_get_db)
+    return calls
+
+
+def _login_demo(client):
+    client.post("/login", data={"username": "demo"}, follow_redirects=True)
+
+
+@pytest.mark.banking
+def test_dashboard_uses_one_connection_for_all_wrappers(
+    client, monkeypatch, rollout_env, count_get_db
+):
+    monkeypatch.setenv("DEMO_ROLLOUT_FEATURE", "on")
+    _login_demo(client)
+    count_get_db.clear()
+
+    response = client.get("/dashboard")
+
+    assert response.status_code == 200
+    assert len(count_get_db) == 1
+
+
+@pytest.mark.banking
+def test_account_detail_uses_one_connection(client, count_get_db):
+    _login_demo(client)
+    account_id = client.get("/api/accounts").get_json()["accounts"][0]["id"]
+    count_get_db.clear()
+
+    response = client.get(f"/account?id={account_id}")
+
+    assert response.status_code == 200
+    assert len(count_get_db) == 1
+
+
+@pytest.mark.banking
+def test_request_connection_is_returned_to_pool_at_teardown(client):
+    import models
+
+    _login_demo(client)
+    client.get("/dashboard")
+
+    assert all(stats["in_use"] == 0 for stats in models.pool_stats())
+
+
+@pytest.mark.banking
+def test_transfer_in_same_request_is_visible_to_later_reads(client):
+    """The write wrapper ends the request snapshot, so reads see the write."""
+    from app import app
+    from models import get_account_by_id, get_accounts_by_user, transfer_money
+
+    _login_demo(client)
+    with app.test_request_context("/"):
+        accounts = get_accounts_by_user(1)
+        checking = next(a for a in accounts if a["account_type"] == "checking")
+        savings = next(a for a in accounts if a["account_type"] == "savings")
+
+        ok, _ = transfer_money(checking["id"], savings["id"], 100, "uow")
+
+        assert ok is True
+        after = get_account_by_id(checking["id"])
+        assert after["balance"] == checking["balance"] - 100
+
+
+@pytest.mark.models
+def test_dao_outside_app_context_opens_its_own_connection():
+    import models
+
+    models.init_db()
+
+    def checkouts():
+        return sum(stats["checkouts"] for stats in models.pool_stats())
+
+    before = checkouts()
+    models.get_user_by_username("demo")
+    models.get_user_by_username("demo")
+
+    assert checkouts() - before == 2
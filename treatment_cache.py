@@ -0,0 +1,199 @@
+"""Memoized Split treatment lookups shared by the page handlers and db_flags.
+
+A page render used to ask the SDK for the same ``(key, flag)`` several times
+(``demo_mode`` then ``home_page_variant``, again in db_flags, again from
+/api/home-content). Lookups here go through two layers:
+
+* a per-request memo on ``flask.g``, so one request evaluates each
+  ``(key, flag, attributes)`` at most once, and
+* a bounded LRU shared across requests whose entries expire after
+  ``SPLIT_TREATMENT_CACHE_TTL`` seconds (default 30; ``0`` disables it), with
+  at most ``SPLIT_TREATMENT_CACHE_SIZE`` entries.
+
+Misses for several flags are fetched with one ``get_treatments`` call.
+``"control"`` (SDK not ready, or an unknown flag) is memoized for the request
+but never shared, so real treatments show up as soon as the SDK has them.
+A :class:`~flag_provider.FlagProvider` (``FLAG_FILE``) evaluates locally and
+reloads its own file, so only the request memo applies to it; sharing its
+answers would hide an edit for up to the TTL. Hit/miss counters are exported
+on /metrics.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from flask import g, has_request_context
+
+from db_pool import _env_number
+from flag_provider import FlagProvider
+from prometheus_minimal import _fmt_labels
+
+TTL_ENV = "SPLIT_TREATMENT_CACHE_TTL"
+SIZE_ENV = "SPLIT_TREATMENT_CACHE_SIZE"
+
+DEFAULT_TTL = 30.0
+DEFAULT_SIZE = 10_000
+
+CONTROL = "control"
+
+_lock = threading.Lock()
+_shared: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+_stats = {
+    "request_hits": 0,
+    "shared_hits": 0,
+    "misses": 0,
+    "evictions": 0,
+    "sdk_calls": 0,
+}
+
+
+def cache_ttl() -> float:
+    return max(0.0, _env_number(TTL_ENV, DEFAULT_TTL))
+
+
+def cache_size() -> int:
+    return max(0, int(_env_number(SIZE_ENV, DEFAULT_SIZE)))
+
+
+def _cache_key(key: str, flag: str, attributes: dict | None) -> tuple:
+    attrs = tuple(sorted(attributes.items())) if attributes else ()
+    return key, flag, attrs
+
+
+def _request_memo() -> dict | None:
+    if not has_request_context():
+        return None
+    memo = getattr(g, "_split_treatments", None)
+    if memo is None:
+        memo = g._split_treatments = {}
+    return memo
+
+
+def _lookup(
+    cache_key: tuple, memo: dict | None, now: float, shared: bool
+) -> str | None:
+    if memo is not None and cache_key in memo:
+        with _lock:
+            _stats["request_hits"] += 1
+        return memo[cache_key]
+    with _lock:
+        entry = _shared.get(cache_key) if shared else None
+        if entry is not None:
+            if now < entry[1]:
+                _shared.move_to_end(cache_key)
+                _stats["shared_hits"] += 1
+                if memo is not None:
+                    memo[cache_key] = entry[0]
+                return entry[0]
+            del _shared[cache_key]
+        _stats["misses"] += 1
+    return None
+
+
+def _store(
+    cache_key: tuple, treatment: str, memo: dict | None, now: float, shared: bool
+) -> None:
+    if memo is not None:
+        memo[cache_key] = treatment
+    ttl, size = cache_ttl(), cache_size()
+    if not shared or treatment == CONTROL or ttl <= 0 or size <= 0:
+        return
+    with _lock:
+        _shared[cache_key] = (treatment, now + ttl)
+        _shared.move_to_end(cache_key)
+        while len(_shared) > size:
+            _shared.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def get_treatment(client, key: str, flag: str, attributes: dict | None = None) -> str:
+    """``client.get_treatment(key, flag, attributes)``, memoized. SDK errors
+    propagate to the caller, which already has its own fallback."""
+    return get_treatments(client, key, (flag,), attributes)[flag]
+
+
+def get_treatments(
+    client, key: str, flags: Iterable[str], attributes: dict | None = None
+) -> dict[str, str]:
+    """Treatments for several flags; cache misses cost one SDK call in total."""
+    memo = _request_memo()
+    now = time.monotonic()
+    shared = not isinstance(client, FlagProvider)
+    found: dict[str, str] = {}
+    missing: list[str] = []
+    for flag in flags:
+        treatment = _lookup(_cache_key(key, flag, attributes), memo, now, shared)
+        if treatment is None:
+            missing.append(flag)
+        else:
+            found[flag] = treatment
+    if not missing:
+        return found
+
+    with _lock:
+        _stats["sdk_calls"] += 1
+    if len(missing) == 1:
+        if attributes:
+            fetched = {
+                missing[0]: client.get_treatment(key, missing[0], attributes=attributes)
+            }
+        else:
+            fetched = {missing[0]: client.get_treatment(key, missing[0])}
+    elif attributes:
+        fetched = client.get_treatments(key, missing, attributes=attributes)
+    else:
+        fetched = client.get_treatments(key, missing)
+    for flag in missing:
+        treatment = fetched.get(flag, CONTROL)
+        _store(_cache_key(key, flag, attributes), treatment, memo, now, shared)
+        found[flag] = treatment
+    return found
+
+
+def clear_treatment_cache() -> None:
+    """Forget every shared entry (e.g. after flags changed upstream)."""
+    with _lock:
+        _shared.clear()
+
+
+def treatment_cache_stats() -> dict[str, int]:
+    with _lock:
+        return {**_stats, "entries": len(_shared)}
+
+
+_METRICS = (
+    ("split_treatment_cache_hits_total", "Treatment lookups served from cache"),
+    ("split_treatment_cache_misses_total", "Treatment lookups that reached the SDK"),
+    (
+        "split_treatment_cache_evictions_total",
+        "Shared entries evicted to stay under the size bound",
+    ),
+    ("split_treatment_sdk_calls_total", "get_treatment(s) calls made to the SDK"),
+)
+
+
+def format_treatment_cache_metrics() -> str:
+    """Prometheus text for the treatment cache (appended to /metrics)."""
+    stats = treatment_cache_stats()
+    if not (stats["request_hits"] or stats["shared_hits"] or stats["misses"]):
+        return ""
+    lines: list[str] = []
+    hits, misses, evictions, sdk_calls = _METRICS
+    lines.append(f"# HELP {hits[0]} {hits[1]}")
+    lines.append(f"# TYPE {hits[0]} counter")
+    for layer in ("request", "shared"):
+        lab = _fmt_labels((("layer", layer),))
+        lines.append(f"{hits[0]}{{{lab}}} {stats[layer + '_hits']}")
+    for (metric, doc), field in (
+        (misses, "misses"),
+        (evictions, "evictions"),
+        (sdk_calls, "sdk_calls"),
+    ):
+        lines.append(f"# HELP {metric} {doc}")
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {stats[field]}")
+    return "\n".join(lines) + "\n"